@@ -0,0 +1,59 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    同一个key同时只有一个线程去加载, 其他线程等待这次加载的结果, 防止缓存失效时大量请求同时打到数据库
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do_many(self, keys, load_many):
+        """
+        load_many(keys) 返回 {key: value}, 查不到的key不在结果中
+        没有其他线程在加载的key由当前线程一次性加载, 其余的等待其他线程的结果
+        """
+        own, waiting = {}, {}
+        with self._lock:
+            for key in keys:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    own[key] = call
+                else:
+                    waiting[key] = call
+
+        result = {}
+        if own:
+            try:
+                values = load_many(list(own))
+                result.update(values)
+                for key, call in own.items():
+                    call.value = values.get(key)
+            except Exception as e:
+                for call in own.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key in own:
+                        self._calls.pop(key, None)
+                for call in own.values():
+                    call.event.set()
+
+        for key, call in waiting.items():
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            if call.value is not None:
+                result[key] = call.value
+        return result
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+
+from loguru import logger
+
+from common.cache.single_flight import SingleFlight
+
+
+class TieredCache:
+    """
+    读穿透的两级缓存: 进程内 LRU -> redis(可选) -> load_many(数据库)
+        name: redis key 的前缀
+        local: 进程内的 LRUCache, 过期时间决定了其他副本修改后本地最多读到多久的旧数据
+        redis_client 为空时只使用进程内缓存; dumps / loads 负责 redis 中值的序列化
+    同一个key同时只会有一个线程去数据库加载
+    失效: invalidate 删除进程内和 redis 中的key, 并递增 redis 中的版本号 {name}:version
+        加载的结果只有在加载期间没有发生过失效时才写入缓存: 本进程的失效由 _epoch 判断,
+        其他副本的失效由版本号判断(WATCH 版本号后写入 redis), 避免把加载到的旧数据写回缓存
+    """
+
+    def __init__(self, name, local, redis_client=None, redis_ttl=300, dumps=None, loads=None):
+        self.name = name
+        self.local = local
+        self.redis = redis_client
+        self.redis_ttl = redis_ttl
+        self.dumps = dumps
+        self.loads = loads
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.loads_from_db = 0
+        self._single_flight = SingleFlight()
+        self._loading = {}      # asyncio 模式下正在加载的 key -> Future
+        self._epoch = 0     # 每次失效时递增, 加载期间发生过失效的结果不放入缓存
+        self._lock = threading.Lock()
+
+    def _redis_key(self, key):
+        return f"{self.name}:{key}"
+
+    def _version_key(self):
+        return f"{self.name}:version"
+
+    def _get_from_redis(self, keys):
+        # 返回 ({key: value}, 读取时 redis 中的版本号), 版本号和值在同一次 mget 中读取
+        if self.redis is None or not keys:
+            return {}, None
+        try:
+            version, *values = self.redis.mget([self._version_key()] + [self._redis_key(key) for key in keys])
+        except Exception as e:
+            logger.warning(f"读取redis缓存失败: {e}")
+            return {}, None
+        found = {key: self.loads(value) for key, value in zip(keys, values) if value is not None}
+        self.redis_hits += len(found)
+        self.redis_misses += len(keys) - len(found)
+        return found, version
+
+    def _set_to_redis(self, values, version):
+        """
+        写入加载的结果, 返回加载期间是否没有副本失效过缓存(redis 中的版本号没有变化)
+        WATCH 版本号之后再写入, 检查和写入之间有其他副本 invalidate 时 redis 会放弃这次写入
+        """
+        if self.redis is None:
+            return True
+        from redis.exceptions import WatchError
+
+        try:
+            with self.redis.pipeline() as pipe:
+                pipe.watch(self._version_key())
+                if pipe.get(self._version_key()) != version:
+                    return False
+                if values:
+                    pipe.multi()
+                    for key, value in values.items():
+                        pipe.setex(self._redis_key(key), self.redis_ttl, self.dumps(value))
+                    pipe.execute()
+            return True
+        except WatchError:
+            return False
+        except Exception as e:
+            logger.warning(f"写入redis缓存失败: {e}")
+            return True     # redis 不可用时只有进程内缓存, 由 _epoch 保证本进程的失效
+
+    def _store(self, epoch, version, values, loaded):
+        """
+        检查和写入在同一个锁中: 本进程的 invalidate 要么在检查之前(不写入), 要么在写入之后(删除写入的值)
+        """
+        with self._lock:
+            if epoch != self._epoch or not self._set_to_redis(loaded, version):
+                return
+            for key, value in values.items():
+                self.local.set(key, value)
+
+    def _load(self, keys, load_many):
+        epoch = self._epoch
+        found, version = self._get_from_redis(keys)
+        missing = [key for key in keys if key not in found]
+        loaded = {}
+        if missing:
+            loaded = load_many(missing)
+            self.loads_from_db += 1
+        self._store(epoch, version, {**found, **loaded}, loaded)
+        return {**found, **loaded}
+
+    def get_many(self, keys, load_many):
+        """
+        返回 {key: value}, 数据库中也查不到的key不在结果中
+        返回的对象和缓存共享, 调用方不能修改
+        """
+        result = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                result[key] = value
+        if missing:
+            result.update(self._single_flight.do_many(missing, lambda keys: self._load(keys, load_many)))
+        return result
+
+    def get(self, key, load_many):
+        return self.get_many([key], load_many).get(key)
+
+    async def _load_async(self, keys, load_many):
+        loop = asyncio.get_running_loop()
+        epoch = self._epoch
+        found, version = {}, None
+        if self.redis is not None:
+            found, version = await loop.run_in_executor(None, self._get_from_redis, keys)
+        missing = [key for key in keys if key not in found]
+        loaded = {}
+        if missing:
+            loaded = await load_many(missing)
+            self.loads_from_db += 1
+        values = {**found, **loaded}
+        if self.redis is None:
+            self._store(epoch, version, values, loaded)
+        else:
+            loop.run_in_executor(None, self._store, epoch, version, values, loaded)     # 不等待写入完成
+        return values
+
+    async def get_many_async(self, keys, load_many):
+        """
+        get_many 的 asyncio 版本, load_many 为协程函数, redis 的读写放到线程池中 不阻塞事件循环
+        同一个key同时只会有一个协程去数据库加载, 其他协程等待它的结果
+        """
+        result = {}
+        waiting = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key)
+            if value is not None:
+                result[key] = value
+            elif key in self._loading:
+                waiting[key] = self._loading[key]
+            else:
+                missing.append(key)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._loading.update(futures)
+            try:
+                loaded = await self._load_async(missing, load_many)
+                for key, future in futures.items():
+                    future.set_result(loaded.get(key))
+            except Exception as e:
+                for future in futures.values():
+                    future.set_exception(e)
+                    future.exception()      # 没有其他协程等待时 避免 asyncio 报 "exception was never retrieved"
+                raise
+            finally:
+                for key, future in futures.items():
+                    self._loading.pop(key, None)
+                    if not future.done():
+                        future.cancel()     # 加载的协程被取消时, 等待它的协程也一起取消
+            result.update(loaded)
+
+        for key, future in waiting.items():
+            value = await future
+            if value is not None:
+                result[key] = value
+        return result
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._epoch += 1
+        for key in keys:
+            self.local.delete(key)
+        if self.redis is not None:
+            try:
+                # 删除和递增版本号在同一个事务中, 其他副本正在进行的加载不会再写入
+                pipe = self.redis.pipeline()
+                if keys:
+                    pipe.delete(*[self._redis_key(key) for key in keys])
+                pipe.incr(self._version_key())
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"删除redis缓存失败: {e}")
+
+    def stats(self):
+        return {
+            **self.local.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "db_loads": self.loads_from_db,
+        }
@@ -0,0 +1,75 @@
+import aiomysql
+from peewee import SQL, Select, fn
+
+"""
+    在 asyncio 中执行 peewee 构建的查询: 查询仍然用 peewee 构建, 生成的 sql 交给 aiomysql 的连接池执行
+    结果再交给 peewee 的 cursor wrapper 转换, 所以 .namedtuples() / .dicts() / join 出来的关联对象 和同步执行时完全一样
+    只用于只读查询, 写操作仍然走同步的 peewee
+"""
+
+
+class _BufferedCursor:
+    # 已经取回全部结果的游标, 给 peewee 的 cursor wrapper 使用
+    def __init__(self, description, rows):
+        self.description = description
+        self._rows = iter(rows)
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def close(self):
+        pass
+
+
+class AsyncDatabase:
+    """
+    database: 同步使用的 peewee MySQLDatabase, 连接参数和 sql 方言都从这里取
+    minsize / maxsize: aiomysql 连接池的大小, 同时执行的查询数不超过 maxsize
+    需要在事件循环中先 await connect()
+    """
+
+    def __init__(self, database, minsize=1, maxsize=50):
+        self.database = database
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.pool = None
+
+    async def connect(self):
+        if self.pool is None:
+            self.pool = await aiomysql.create_pool(db=self.database.database, minsize=self.minsize,
+                                                   maxsize=self.maxsize, autocommit=True,
+                                                   **self.database.connect_params)
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def execute_sql(self, sql, params=None):
+        # 返回 (cursor.description, 全部的行)
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return cursor.description, await cursor.fetchall()
+
+    async def execute(self, query):
+        # 和 list(query) 的结果相同
+        sql, params = self.database.get_sql_context().sql(query).query()
+        description, rows = await self.execute_sql(sql, params)
+        return list(query._get_cursor_wrapper(_BufferedCursor(description, rows)).iterator())
+
+    async def first(self, query):
+        rows = await self.execute(query.limit(1))
+        return rows[0] if rows else None
+
+    async def scalar(self, query):
+        row = await self.first(query.tuples())
+        return row[0] if row else None
+
+    async def count(self, query):
+        # 和 query.count() 生成的 sql 相同
+        clone = query.order_by().alias("_wrapped")
+        if clone._count_can_project_one():
+            clone = clone.select(SQL("1"))
+        return await self.scalar(Select([clone], [fn.COUNT(SQL("1"))]))
@@ -0,0 +1,81 @@
+from peewee import MySQLDatabase
+
+from common.cache.lru import LRUCache
+
+
+class CountCache:
+    """
+    列表接口的总数统计, 避免每次分页都执行一次完整的 count
+        1. 相同的过滤条件(以生成的sql和参数作为key)在 ttl 秒内直接使用缓存的总数
+        2. estimate_threshold 不为空时(仅mysql), 先用 EXPLAIN 估算行数, 估算值超过阈值就不再精确统计
+    总数只是给前端显示分页用的, 允许有短暂的误差
+    """
+
+    def __init__(self, ttl=10, estimate_threshold=None, maxsize=1024):
+        self.estimate_threshold = estimate_threshold
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @classmethod
+    def from_config(cls, data):
+        """
+        根据服务在 nacos 中的配置创建, 各个服务共用同一组配置项:
+            cache.count_ttl: 总数的缓存时间(秒), 默认 10
+            cache.count_estimate_threshold: 超过多少行时使用 EXPLAIN 估算的总数, 为空表示总是精确统计
+        """
+        cache = data.get("cache", {})
+        return cls(ttl=cache.get("count_ttl", 10), estimate_threshold=cache.get("count_estimate_threshold"))
+
+    def _plan_rows(self, description, row):
+        # EXPLAIN 第一行的 rows * filtered 就是估算的行数
+        if row is None:
+            return None
+        plan = dict(zip([column[0] for column in description], row))
+        return int((plan.get("rows") or 0) * (plan.get("filtered") or 100) / 100)
+
+    def estimate(self, query):
+        database = query.model._meta.database
+        if not isinstance(database, MySQLDatabase):
+            return None
+
+        sql, params = query.sql()
+        cursor = database.execute_sql(f"EXPLAIN {sql}", params)
+        return self._plan_rows(cursor.description, cursor.fetchone())
+
+    def _estimated(self, total):
+        if total is not None and total < self.estimate_threshold:
+            return None     # 数据量不大, 精确统计的代价可以接受
+        return total
+
+    def count(self, query):
+        sql, params = query.sql()
+        key = (sql, tuple(params))
+        total = self.cache.get(key)
+        if total is not None:
+            return total
+
+        if self.estimate_threshold is not None:
+            total = self._estimated(self.estimate(query))
+        if total is None:
+            total = query.count()
+
+        self.cache.set(key, total)
+        return total
+
+    async def count_async(self, query, database):
+        """
+        count 的 asyncio 版本, database 为 common.db.aio.AsyncDatabase, 和 count 共用同一份缓存
+        """
+        sql, params = query.sql()
+        key = (sql, tuple(params))
+        total = self.cache.get(key)
+        if total is not None:
+            return total
+
+        if self.estimate_threshold is not None:
+            description, rows = await database.execute_sql(f"EXPLAIN {sql}", params)
+            total = self._estimated(self._plan_rows(description, rows[0] if rows else None))
+        if total is None:
+            total = await database.count(query)
+
+        self.cache.set(key, total)
+        return total
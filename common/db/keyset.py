@@ -0,0 +1,88 @@
+import base64
+import json
+import struct
+
+from peewee import FloatField, MySQLDatabase
+
+"""
+    游标分页(keyset/seek): 用上一页最后一条记录的 (排序字段, id) 作为条件直接定位到下一页
+        where (sort_key, id) > (上一页最后的sort_key, 上一页最后的id) order by sort_key, id limit n
+    和 limit offset 不同, 无论翻到第几页都只需要扫描 n 条记录, 前提是 (sort_key, id) 上有索引
+"""
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise InvalidCursor(f"无效的分页游标: {cursor}")
+    if not isinstance(values, list):
+        raise InvalidCursor(f"无效的分页游标: {cursor}")
+    return values
+
+
+def _cursor_value(field, value, database):
+    # mysql 的 FLOAT 是单精度, 和 sql 中的双精度常量比较时会先转成双精度
+    # 这里把游标中的值也转成同样的双精度值, 否则等值比较永远不成立, 价格相同的商品会被跳过
+    if isinstance(field, FloatField) and isinstance(database, MySQLDatabase) and value is not None:
+        return struct.unpack("f", struct.pack("f", value))[0]
+    return value
+
+
+def _seek_expression(keys, values, desc):
+    # (a, b) > (x, y) 展开成 a > x or (a = x and b > y), 这样mysql才能用上 (a, b) 上的索引
+    expression = None
+    for i in range(len(keys)):
+        term = (keys[i] < values[i]) if desc else (keys[i] > values[i])
+        for key, value in zip(keys[:i], values[:i]):
+            term = (key == value) & term
+        expression = term if expression is None else (expression | term)
+    return expression
+
+
+def keyset_query(query, id_field, cursor, per_page_nums, sort_field=None, desc=False):
+    """
+    返回 (取一页数据的查询, 排序用的字段列表), 查询多取一条用来判断是否还有下一页, 结果交给 keyset_page 处理
+    游标无效时抛出 InvalidCursor
+    """
+    keys = [id_field] if sort_field is None else [sort_field, id_field]
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise InvalidCursor(f"无效的分页游标: {cursor}")
+        query = query.where(_seek_expression(keys, values, desc))
+
+    query = query.order_by(*[key.desc() if desc else key.asc() for key in keys])
+    return query.limit(per_page_nums + 1), keys
+
+
+def keyset_page(query, keys, rows, per_page_nums):
+    # rows 为 keyset_query 返回的查询的结果, 返回 (当前页的记录列表, 下一页的游标)
+    next_cursor = ""
+    if len(rows) > per_page_nums:
+        rows = rows[:per_page_nums]
+        database = query.model._meta.database
+        next_cursor = encode_cursor([_cursor_value(key, getattr(rows[-1], key.name), database) for key in keys])
+    return rows, next_cursor
+
+
+def keyset_paginate(query, id_field, cursor, per_page_nums, sort_field=None, desc=False):
+    """
+    返回 (当前页的记录列表, 下一页的游标), 没有下一页时游标为空字符串
+        cursor: 上一页返回的游标, 为空表示第一页
+        sort_field: 排序字段, 为空时只按 id 排序
+    游标无效时抛出 InvalidCursor
+    """
+    query, keys = keyset_query(query, id_field, cursor, per_page_nums, sort_field, desc)
+    return keyset_page(query, keys, list(query), per_page_nums)
@@ -0,0 +1,38 @@
+class QueryCounter:
+    """
+    统计一段代码执行了多少条sql, 用来发现 N+1 查询
+        with QueryCounter(settings.DB, max_queries=2) as counter:
+            servicer.GoodsList(request, context)
+        print(counter.count, counter.sqls)
+    max_queries 不为空时, 超出数量会抛出 AssertionError
+    """
+
+    def __init__(self, database, max_queries=None):
+        self.database = database
+        self.max_queries = max_queries
+        self.sqls = []
+
+    @property
+    def count(self):
+        return len(self.sqls)
+
+    def __enter__(self):
+        self._patched = self.database.__dict__.get("execute_sql")     # 可能已经被其他的 QueryCounter 替换过
+        execute_sql = self.database.execute_sql
+
+        def counted_execute_sql(sql, params=None, *args, **kwargs):
+            self.sqls.append(sql)
+            return execute_sql(sql, params, *args, **kwargs)
+
+        self.database.execute_sql = counted_execute_sql    # 只替换这个实例上的方法
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._patched is None:
+            del self.database.execute_sql
+        else:
+            self.database.execute_sql = self._patched
+        if exc_type is None and self.max_queries is not None and self.count > self.max_queries:
+            sqls = "\n".join(self.sqls)
+            raise AssertionError(f"期望最多执行 {self.max_queries} 条sql, 实际执行了 {self.count} 条:\n{sqls}")
+        return False
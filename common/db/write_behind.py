@@ -0,0 +1,70 @@
+import threading
+from collections import defaultdict
+
+from loguru import logger
+
+
+class WriteBehindCounter:
+    """
+    在内存中累加计数, 由后台线程定期批量写入数据库, 把热点路径上的同步写变成异步的批量写
+        flush_func(deltas): deltas 为 {key: 累加的值}, 由调用方决定怎么写入
+        interval: 多久(秒)写入一次
+        max_size: 缓冲的key超过这个数量时提前写入
+    写入失败时这批数据会合并回缓冲区, 下次再写; 进程退出前调用 stop 写入剩余的数据
+    """
+
+    def __init__(self, flush_func, interval=5, max_size=10000):
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_size = max_size
+        self._pending = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()     # 保证同一时间只有一个线程在写入
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def incr(self, key, n=1):
+        with self._lock:
+            self._pending[key] += n
+            full = len(self._pending) >= self.max_size
+        if full:
+            self._wakeup.set()
+
+    def pending(self, key):
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._pending = self._pending, defaultdict(int)
+            deltas = {key: n for key, n in deltas.items() if n}
+            if not deltas:
+                return
+            try:
+                self.flush_func(deltas)
+            except Exception as e:
+                logger.exception(f"批量写入计数失败, 稍后重试: {e}")
+                with self._lock:
+                    for key, n in deltas.items():
+                        self._pending[key] += n
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.flush()
@@ -0,0 +1,92 @@
+import threading
+
+from loguru import logger
+from rocketmq.client import Producer, TransactionMQProducer, SendStatus
+
+
+class ProducerManager:
+    """
+    进程内共享的 rocketmq 生产者: 服务启动时创建, 所有请求复用, 服务退出时统一关闭
+        name_server: rocketmq 的地址 host:port
+        register_transactional(group, check_callback): 声明 group 使用事务生产者 以及它的回查函数
+        max_failures: 同一个生产者连续发送失败这么多次后关闭, 下次发送时重新创建并启动
+    每个 group 只有一个生产者: rocketmq 的生产者是线程安全的, 同一个进程中也不能重复启动同一个 group
+    """
+
+    def __init__(self, name_server, max_failures=3):
+        self.name_server = name_server
+        self.max_failures = max_failures
+        self._producers = {}        # group -> 已启动的生产者
+        self._failures = {}         # group -> 连续失败的次数
+        self._check_callbacks = {}  # 事务生产者的 group -> 回查函数
+        self._lock = threading.Lock()
+
+    def register_transactional(self, group, check_callback):
+        self._check_callbacks[group] = check_callback
+
+    def _create(self, group):
+        if group in self._check_callbacks:
+            producer = TransactionMQProducer(group, self._check_callbacks[group])
+        else:
+            producer = Producer(group)
+        producer.set_name_server_address(self.name_server)
+        producer.start()
+        logger.info(f"rocketmq生产者已启动: {group}")
+        return producer
+
+    def get(self, group):
+        producer = self._producers.get(group)
+        if producer is None:
+            with self._lock:
+                producer = self._producers.get(group)
+                if producer is None:
+                    producer = self._producers[group] = self._create(group)
+        return producer
+
+    def start(self, *groups):
+        # 服务启动时预先创建, 避免第一个请求等待生产者启动
+        for group in groups:
+            self.get(group)
+
+    def _record(self, group, producer, ok):
+        with self._lock:
+            if ok:
+                self._failures[group] = 0
+                return
+            failures = self._failures.get(group, 0) + 1
+            self._failures[group] = failures
+            if failures < self.max_failures or self._producers.get(group) is not producer:
+                return
+            del self._producers[group]
+            self._failures[group] = 0
+        logger.warning(f"rocketmq生产者 {group} 连续发送失败 {failures} 次, 下次发送时重新创建")
+        self._shutdown(group, producer)
+
+    def _send(self, group, send):
+        producer = self.get(group)
+        try:
+            ret = send(producer)
+        except Exception:
+            self._record(group, producer, False)
+            raise
+        self._record(group, producer, ret.status == SendStatus.OK)
+        return ret
+
+    def send_sync(self, group, msg):
+        return self._send(group, lambda producer: producer.send_sync(msg))
+
+    def send_message_in_transaction(self, group, msg, local_execute, user_args=None):
+        return self._send(group, lambda producer: producer.send_message_in_transaction(msg, local_execute, user_args))
+
+    def _shutdown(self, group, producer):
+        try:
+            producer.shutdown()
+        except Exception as e:
+            logger.warning(f"关闭rocketmq生产者 {group} 失败: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            producers, self._producers = self._producers, {}
+        for group, producer in producers.items():
+            self._shutdown(group, producer)
+            logger.info(f"rocketmq生产者已关闭: {group}")
@@ -0,0 +1,116 @@
+import itertools
+import threading
+from contextlib import contextmanager
+
+import grpc
+from loguru import logger
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class _Instance:
+    def __init__(self, address):
+        self.address = address
+        self.channel = grpc.insecure_channel(address)
+        self.inflight = 0       # 正在进行的调用数, least_loaded 据此选择实例
+        self.removed = False    # 已经从注册中心下线, 没有正在进行的调用后关闭连接
+
+
+class ServiceChannels:
+    """
+    调用其他服务时使用的长连接: 每个服务实例一个 grpc channel, 所有请求复用
+        register: 注册中心, 通过 filter_service 查询服务的实例
+        refresh_interval: 后台多久(秒)从注册中心刷新一次实例列表, 调用时不再访问注册中心
+        balance: round_robin 轮询 / least_loaded 选择正在进行的调用最少的实例
+    用法:
+        with goods_channels.channel() as channel:
+            goods_pb2_grpc.GoodsStub(channel).BatchGetGoods(...)
+    没有可用的实例时抛出 ServiceUnavailable
+    """
+
+    def __init__(self, register, service_name, refresh_interval=10, balance="round_robin"):
+        if balance not in ("round_robin", "least_loaded"):
+            raise ValueError(f"不支持的负载均衡方式: {balance}")
+        self.register = register
+        self.service_name = service_name
+        self.refresh_interval = refresh_interval
+        self.balance = balance
+        self._instances = {}        # 地址 -> _Instance
+        self._loaded = False
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        services = self.register.filter_service(f'Service=="{self.service_name}"')
+        addresses = {f"{service['Address']}:{service['Port']}" for service in services.values()}
+        with self._lock:
+            for address in addresses - self._instances.keys():
+                self._instances[address] = _Instance(address)
+                logger.info(f"{self.service_name} 新增实例: {address}")
+            for address in self._instances.keys() - addresses:
+                instance = self._instances.pop(address)
+                instance.removed = True
+                logger.info(f"{self.service_name} 实例下线: {address}")
+                if instance.inflight == 0:
+                    instance.channel.close()
+            self._loaded = True
+
+    def _run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # 注册中心暂时不可用时继续使用已有的实例
+                logger.warning(f"刷新 {self.service_name} 的实例失败: {e}")
+
+    def start(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"获取 {self.service_name} 的实例失败: {e}")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        for instance in instances.values():
+            instance.channel.close()
+
+    def _pick(self):
+        instances = list(self._instances.values())
+        if not instances:
+            return None
+        start = next(self._counter) % len(instances)
+        instances = instances[start:] + instances[:start]
+        if self.balance == "least_loaded":
+            return min(instances, key=lambda instance: instance.inflight)
+        return instances[0]
+
+    @contextmanager
+    def channel(self):
+        if not self._loaded:
+            # 还没有启动后台刷新(比如在脚本中直接使用)时 第一次调用同步查询
+            try:
+                self.refresh()
+            except Exception as e:
+                # 注册中心不可用(连接失败, 超时等) 和没有实例一样, 调用方按服务不可用处理
+                raise ServiceUnavailable(f"获取 {self.service_name} 的实例失败: {e}") from e
+        with self._lock:
+            instance = self._pick()
+            if instance is None:
+                raise ServiceUnavailable(f"{self.service_name} 没有可用的实例")
+            instance.inflight += 1
+        try:
+            yield instance.channel
+        finally:
+            with self._lock:
+                instance.inflight -= 1
+                if instance.removed and instance.inflight == 0:
+                    instance.channel.close()
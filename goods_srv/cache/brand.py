@@ -0,0 +1,18 @@
+from goods_srv.proto import goods_pb2
+from goods_srv.settings import settings
+from common.cache.lru import LRUCache
+from common.cache.tiered import TieredCache
+
+"""
+    分类下的品牌列表(GetCategoryBrandList 的响应)的缓存, key 为分类id
+        品牌分类关系 新建/修改/删除 时失效对应的分类; 品牌 修改/删除 时失效这个品牌所在的所有分类
+        其他副本的进程内缓存最多在 CATEGORY_BRANDS_CACHE_TTL 秒后过期
+"""
+
+category_brands_cache = TieredCache("goods_srv:category_brands",
+                                    LRUCache(maxsize=settings.CATEGORY_BRANDS_CACHE_SIZE,
+                                             ttl=settings.CATEGORY_BRANDS_CACHE_TTL),
+                                    redis_client=settings.REDIS_CLIENT,
+                                    redis_ttl=settings.CATEGORY_BRANDS_CACHE_REDIS_TTL,
+                                    dumps=lambda rsp: rsp.SerializeToString(),
+                                    loads=goods_pb2.BrandListResponse.FromString)
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+
+from loguru import logger
+
+from goods_srv.model.models import Category, CatalogVersion
+from goods_srv.settings import settings
+
+CATEGORY_VERSION_NAME = "category"
+
+
+class CategoryTree:
+    """
+    分类树的只读快照, 遍历一次分类表构建:
+        nodes:    id -> 分类字典
+        children: 父分类id -> 子分类id列表(保持数据库的查询顺序)
+    节点数据构建完成后不再修改, 多个线程可以同时读取
+    """
+
+    def __init__(self, version, categorys):
+        self.version = version
+        self.nodes = {}
+        self.children = defaultdict(list)
+        self.ordered_ids = []
+        self._memo = {}
+
+        for category in categorys:
+            node = {
+                "id": category.id,
+                "name": category.name,
+                "parent": category.parent_category_id,
+                "level": category.level,
+                "is_tab": category.is_tab
+            }
+            self.nodes[node["id"]] = node
+            self.ordered_ids.append(node["id"])
+            if node["parent"]:
+                self.children[node["parent"]].append(node["id"])
+
+    def memoize(self, key, build):
+        """
+        缓存基于这个快照计算出来的结果(比如已经构建好的响应), 快照被替换时一起失效
+        并发时可能会重复计算一次, 但结果相同, 直接覆盖即可
+        """
+        value = self._memo.get(key)
+        if value is None:
+            value = build()
+            self._memo[key] = value
+        return value
+
+    def get(self, category_id):
+        return self.nodes.get(category_id)
+
+    def all(self):
+        return [self.nodes[category_id] for category_id in self.ordered_ids]
+
+    def by_level(self, level):
+        return [node for node in self.all() if node["level"] == level]
+
+    def sub_categorys(self, category_id):
+        return [self.nodes[child_id] for child_id in self.children.get(category_id, [])]
+
+    def json_tree(self):
+        """
+        一级分类列表, 子分类放在 sub_category 中 (没有子分类则不带这个key)
+        """
+        def build(node):
+            data = dict(node)
+            sub_category = [build(child) for child in self.sub_categorys(node["id"])
+                            if child["level"] == node["level"] + 1]
+            if sub_category:
+                data["sub_category"] = sub_category
+            return data
+
+        return [build(node) for node in self.by_level(1)]
+
+
+class CategoryCache:
+    """
+    进程内的分类树缓存
+        1. 本进程修改分类后调用 invalidate: 递增数据库中的版本号 并丢弃本地的分类树
+        2. 每隔 check_interval 秒检查一次数据库中的版本号, 其他副本修改了分类时重新构建
+    两次检查之间的读取不会访问数据库
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._tree = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    def _fresh(self, tree):
+        return tree is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    def tree(self) -> CategoryTree:
+        tree = self._tree
+        if self._fresh(tree):
+            return tree
+
+        with self._lock:
+            if self._fresh(self._tree):     # 等锁期间 其他线程可能已经构建好了
+                return self._tree
+
+            version = CatalogVersion.current(CATEGORY_VERSION_NAME)
+            if self._tree is None or self._tree.version != version:
+                self._tree = CategoryTree(version, Category.select())
+                logger.info(f"分类缓存已重建, 版本: {version}, 分类数: {len(self._tree.nodes)}")
+            self._checked_at = time.monotonic()
+            return self._tree
+
+    async def tree_async(self, database) -> CategoryTree:
+        """
+        tree 的 asyncio 版本, database 为 common.db.aio.AsyncDatabase, 和 tree 共用同一个分类树
+        """
+        tree = self._tree
+        if self._fresh(tree):
+            return tree
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self._fresh(self._tree):
+                return self._tree
+
+            try:
+                version = await database.scalar(CatalogVersion.select(CatalogVersion.version)
+                                                .where(CatalogVersion.name == CATEGORY_VERSION_NAME)) or 0
+            except Exception:
+                if CatalogVersion.table_exists():
+                    raise
+                version = 0     # 和 CatalogVersion.current 一样, 没有表时当作版本 0
+            tree = self._tree
+            if tree is None or tree.version != version:
+                tree = CategoryTree(version, await database.execute(Category.select()))
+                logger.info(f"分类缓存已重建, 版本: {version}, 分类数: {len(tree.nodes)}")
+            with self._lock:
+                self._tree = tree
+                self._checked_at = time.monotonic()
+            return tree
+
+    def invalidate(self):
+        CatalogVersion.bump(CATEGORY_VERSION_NAME)
+        with self._lock:
+            self._tree = None
+
+
+category_cache = CategoryCache(settings.CATEGORY_VERSION_CHECK_INTERVAL)
@@ -0,0 +1,18 @@
+from goods_srv.proto import goods_pb2
+from goods_srv.settings import settings
+from common.cache.lru import LRUCache
+from common.cache.tiered import TieredCache
+
+"""
+    热点商品详情的缓存, key 为商品id, value 为转换好的 GoodsInfoResponse
+        1. 本进程修改/删除商品后调用 goods_cache.invalidate(商品id), 同时删除 redis 中的缓存
+        2. 其他副本的进程内缓存最多在 GOODS_CACHE_TTL 秒后过期
+    缓存中的点击数是加载时的值, GetGoodsDetail 返回时会加上还没写入数据库的点击数
+"""
+
+goods_cache = TieredCache("goods_srv:goods",
+                          LRUCache(maxsize=settings.GOODS_CACHE_SIZE, ttl=settings.GOODS_CACHE_TTL),
+                          redis_client=settings.REDIS_CLIENT,
+                          redis_ttl=settings.GOODS_CACHE_REDIS_TTL,
+                          dumps=lambda rsp: rsp.SerializeToString(),
+                          loads=goods_pb2.GoodsInfoResponse.FromString)
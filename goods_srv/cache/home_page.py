@@ -0,0 +1,69 @@
+import threading
+import time
+
+from loguru import logger
+
+from goods_srv.model.models import CatalogVersion
+from goods_srv.settings import settings
+
+HOME_PAGE_VERSION_NAME = "home_page"
+
+
+class HomePageSnapshot:
+    """
+    首页快照  由后台线程构建好整个 HomePageResponse, 请求直接返回, 不访问数据库
+        1. 本进程修改了商品/分类/品牌/轮播图后调用 invalidate: 递增数据库中的版本号 并唤醒后台线程立即重建
+        2. 后台线程每隔 check_interval 秒检查一次版本号, 其他副本修改后也会重建
+        3. 快照超过 max_age 秒也会重建 (销量等不会递增版本号的数据)
+    """
+
+    def __init__(self, check_interval, max_age):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._rsp = None
+        self._version = None
+        self._built_at = 0
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _rebuild(self, build):
+        # 先读版本号再构建, 构建期间发生的修改会在下一次检查时重建
+        with self._lock:
+            version = CatalogVersion.current(HOME_PAGE_VERSION_NAME)
+            self._rsp = build()
+            self._version, self._built_at = version, time.monotonic()
+            return self._rsp
+
+    def get(self, build):
+        # 后台线程还没有构建好时, 由第一个请求同步构建, 其他请求等待这次构建的结果
+        rsp = self._rsp
+        if rsp is not None:
+            return rsp
+        with self._lock:
+            if self._rsp is not None:
+                return self._rsp
+            return self._rebuild(build)
+
+    def _run(self, build):
+        while True:
+            self._wakeup.wait(self.check_interval)
+            self._wakeup.clear()
+            try:
+                version = CatalogVersion.current(HOME_PAGE_VERSION_NAME)
+                if version != self._version or time.monotonic() - self._built_at >= self.max_age:
+                    self._rebuild(build)
+            except Exception as e:
+                logger.exception(f"构建首页快照失败: {e}")
+
+    def start(self, build):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(build,), daemon=True)
+            self._thread.start()
+
+    def invalidate(self):
+        CatalogVersion.bump(HOME_PAGE_VERSION_NAME)
+        self._wakeup.set()
+
+
+home_page_snapshot = HomePageSnapshot(settings.HOME_PAGE_CHECK_INTERVAL, settings.HOME_PAGE_MAX_AGE)
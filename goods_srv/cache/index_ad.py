@@ -0,0 +1,17 @@
+from goods_srv.proto import goods_pb2
+from goods_srv.settings import settings
+from common.cache.lru import LRUCache
+from common.cache.tiered import TieredCache
+
+"""
+    首页分类广告(IndexAdList 的响应)的缓存, key 为分类id
+        广告中的商品或者品牌 修改/删除 时失效引用了它们的分类
+        广告本身直接在数据库中维护, 修改后最多在 INDEX_AD_CACHE_REDIS_TTL 秒后生效
+"""
+
+index_ad_cache = TieredCache("goods_srv:index_ad",
+                             LRUCache(maxsize=settings.INDEX_AD_CACHE_SIZE, ttl=settings.INDEX_AD_CACHE_TTL),
+                             redis_client=settings.REDIS_CLIENT,
+                             redis_ttl=settings.INDEX_AD_CACHE_REDIS_TTL,
+                             dumps=lambda rsp: rsp.SerializeToString(),
+                             loads=goods_pb2.IndexAdResponse.FromString)
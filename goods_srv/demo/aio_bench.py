@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import random
+import time
+
+import grpc
+from google.protobuf import empty_pb2
+
+from goods_srv.proto import goods_pb2, goods_pb2_grpc
+
+"""
+    线程池模式 和 asyncio 模式 的压测对比, 用法:
+        1. python goods_srv_server.py --ip=127.0.0.1 --port=50051 --mode thread
+        2. python demo/aio_bench.py --target 127.0.0.1:50051 --concurrency 500
+        3. 停掉服务, 换成 --mode aio 重新启动, 再执行一次第 2 步
+    每个并发的客户端不停地发送请求(按 --rpc 选择接口, 默认混合只读接口), 输出 QPS 以及延迟的分位数
+    线程池模式下同时只有 10 个请求在处理, 其余的请求排队, 并发越高 p99 延迟越高
+"""
+
+
+def make_request(stub, rpc, max_goods_id):
+    goods_id = random.randint(1, max_goods_id)
+    if rpc == "mixed":
+        rpc = random.choice(["GoodsList", "GetGoodsDetail", "BatchGetGoods", "GetAllCategorysList"])
+    if rpc == "GoodsList":
+        return stub.GoodsList(goods_pb2.GoodsFilterRequest(pages=random.randint(1, 20), pagePerNums=10))
+    if rpc == "GetGoodsDetail":
+        return stub.GetGoodsDetail(goods_pb2.GoodInfoRequest(id=goods_id))
+    if rpc == "BatchGetGoods":
+        return stub.BatchGetGoods(goods_pb2.BatchGoodsIdInfo(id=[goods_id + i for i in range(10)]))
+    return stub.GetAllCategorysList(empty_pb2.Empty())
+
+
+async def worker(stub, args, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await make_request(stub, args.rpc, args.max_goods_id)
+        except grpc.aio.AioRpcError as e:
+            if e.code() != grpc.StatusCode.NOT_FOUND:   # 随机的商品id可能不存在
+                errors.append(e.code())
+                continue
+        latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+async def main(args):
+    channels = [grpc.aio.insecure_channel(args.target) for _ in range(args.channels)]
+    stubs = [goods_pb2_grpc.GoodsStub(channel) for channel in channels]
+    latencies, errors = [], []
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*[worker(stubs[i % len(stubs)], args, deadline, latencies, errors)
+                           for i in range(args.concurrency)])
+    cost = time.perf_counter() - start
+    for channel in channels:
+        await channel.close()
+
+    latencies.sort()
+    print(f"目标: {args.target}, 接口: {args.rpc}, 并发: {args.concurrency}, 持续: {cost:.1f}s")
+    print(f"请求数: {len(latencies)}, 失败: {len(errors)}, QPS: {len(latencies) / cost:.0f}")
+    if latencies:
+        print(f"延迟 p50: {percentile(latencies, 0.5):.1f}ms, p95: {percentile(latencies, 0.95):.1f}ms, "
+              f"p99: {percentile(latencies, 0.99):.1f}ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", default="127.0.0.1:50051", help="商品服务的地址")
+    parser.add_argument("--rpc", default="mixed",
+                        choices=["mixed", "GoodsList", "GetGoodsDetail", "BatchGetGoods", "GetAllCategorysList"])
+    parser.add_argument("--concurrency", type=int, default=500, help="并发的客户端数")
+    parser.add_argument("--duration", type=float, default=30, help="压测时长(秒)")
+    parser.add_argument("--channels", type=int, default=4, help="客户端使用的连接数")
+    parser.add_argument("--max-goods-id", type=int, default=1000, help="随机请求的商品id范围")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+import time
+from types import SimpleNamespace
+
+from goods_srv.cache.category import CategoryTree, category_cache
+from goods_srv.handler.goods import GoodsServicer
+from google.protobuf import empty_pb2
+
+"""
+    GetAllCategorysList 单次调用耗时对比 (不访问数据库, 直接用内存中的 5k 分类树):
+        before: 每次调用都重新构建 CategoryListResponse 和 jsonData
+        after:  同一个版本的分类树只构建一次响应
+    两边都包含 grpc 返回时的序列化耗时
+"""
+
+
+def fake_categorys(level1=50, level2=10, level3=9):
+    categorys = []
+    category_id = 0
+    for _ in range(level1):
+        category_id += 1
+        c1 = category_id
+        categorys.append(SimpleNamespace(id=c1, name=f"一级分类{c1}", parent_category_id=None, level=1, is_tab=True))
+        for _ in range(level2):
+            category_id += 1
+            c2 = category_id
+            categorys.append(SimpleNamespace(id=c2, name=f"二级分类{c2}", parent_category_id=c1, level=2, is_tab=False))
+            for _ in range(level3):
+                category_id += 1
+                categorys.append(SimpleNamespace(id=category_id, name=f"三级分类{category_id}", parent_category_id=c2, level=3, is_tab=False))
+    return categorys
+
+
+def bench(name, func, times):
+    func()  # 预热
+    start = time.perf_counter()
+    for _ in range(times):
+        func()
+    cost = (time.perf_counter() - start) / times
+    print(f"{name}: {cost * 1000:.3f} ms/次")
+    return cost
+
+
+if __name__ == '__main__':
+    tree = CategoryTree(1, fake_categorys())
+    print(f"分类数: {len(tree.nodes)}")
+
+    # 固定使用上面构建的分类树, 不去数据库检查版本号
+    category_cache.tree = lambda: tree
+    servicer = GoodsServicer()
+
+    before = bench("before (每次构建响应)", lambda: servicer.build_category_list_rsp(tree).SerializeToString(), 20)
+    after = bench("after  (按版本缓存响应)", lambda: servicer.GetAllCategorysList(empty_pb2.Empty(), None).SerializeToString(), 200)
+    print(f"提升: {before / after:.1f}x")
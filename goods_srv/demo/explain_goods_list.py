@@ -0,0 +1,52 @@
+from goods_srv.model.models import *
+from goods_srv.proto import goods_pb2
+from goods_srv.handler.goods import GoodsServicer
+from goods_srv.settings import settings
+
+"""
+    用 EXPLAIN 检查 GoodsList 支持的每一种过滤条件组合 在 goods 表上是否用到了索引
+    需要连接 mysql, 先执行 model/migrate.py 建好索引, 数据量太小时 mysql 可能会直接选择全表扫描
+    有组合没有用到索引时抛出 AssertionError
+"""
+
+
+def cases():
+    brand_id = Brands.select(Brands.id).first().id
+    category_id = Category.select(Category.id).where(Category.level == 1).first().id
+    return {
+        "热销": dict(isHot=True),
+        "新品": dict(isNew=True),
+        "价格区间": dict(priceMin=100, priceMax=200),
+        "按价格排序": dict(ordering="shop_price"),
+        "按价格倒序": dict(ordering="-shop_price"),
+        "品牌": dict(brand=brand_id),
+        "品牌 + 价格区间": dict(brand=brand_id, priceMin=100, priceMax=200),
+        "品牌 + 按价格排序": dict(brand=brand_id, ordering="shop_price"),
+        "分类": dict(topCategory=category_id),
+        "分类 + 价格区间": dict(topCategory=category_id, priceMin=100, priceMax=200),
+        "分类 + 按价格排序": dict(topCategory=category_id, ordering="-shop_price"),
+        "热销 + 按价格排序": dict(isHot=True, ordering="shop_price"),
+        "新品 + 价格区间": dict(isNew=True, priceMin=100, priceMax=200),
+    }
+
+
+def explain(query):
+    sql, params = query.sql()
+    cursor = settings.DB.execute_sql("EXPLAIN " + sql, params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+if __name__ == '__main__':
+    servicer = GoodsServicer()
+    failed = []
+    for name, filters in cases().items():
+        goods, _, _ = servicer.filter_goods(goods_pb2.GoodsFilterRequest(**filters))
+        plans = explain(servicer.goods_rows(goods).limit(10))
+        # goods 表在查询中的别名是 t1
+        goods_plan = [plan for plan in plans if plan["table"] == "t1"][0]
+        print(f"{name}: type={goods_plan['type']} key={goods_plan['key']} rows={goods_plan['rows']}")
+        if goods_plan["key"] is None:
+            failed.append(name)
+
+    assert not failed, f"没有用到索引: {failed}"
@@ -0,0 +1,140 @@
+from peewee import SqliteDatabase
+from google.protobuf import empty_pb2
+
+from common.db.query_counter import QueryCounter
+from goods_srv.model.models import *
+from goods_srv.proto import goods_pb2
+from goods_srv.handler.goods import GoodsServicer
+from goods_srv.cache.goods import goods_cache
+from goods_srv.cache.category import category_cache
+from goods_srv.cache.brand import category_brands_cache
+from goods_srv.settings import settings
+
+"""
+    用 sqlite 内存数据库代替 mysql, 检查各个接口执行的sql条数, 防止出现 N+1 查询
+    直接运行即可, 有接口超出预期的sql条数时会抛出 AssertionError
+    不需要连接 mysql: 所有的sql都必须发到 bind_ctx 绑定的 sqlite, 有sql发到 settings.DB 时同样抛出 AssertionError
+"""
+
+MODELS = [Category, CategoryClosure, Brands, Goods, GoodsCategoryBrand, Banner, IndexAd, CatalogVersion]
+
+
+class Context:
+    def __init__(self):
+        self.code = None
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+
+def init_data(goods_nums=50):
+    brands = [Brands.create(name=f"品牌{i}", logo=f"logo{i}") for i in range(5)]
+    c1 = Category.create(name="一级分类", level=1)
+    c2 = Category.create(name="二级分类", level=2, parent_category=c1)
+    categorys = [Category.create(name=f"三级分类{i}", level=3, parent_category=c2) for i in range(5)]
+    for i in range(goods_nums):
+        Goods.create(category=categorys[i % len(categorys)], brand=brands[i % len(brands)],
+                     name=f"商品{i}", goods_brief="", goods_front_image="",
+                     images=[], desc_images=[], shop_price=i)
+    CategoryClosure.rebuild()
+    for category in categorys:
+        for brand in brands:
+            GoodsCategoryBrand.create(category=category, brand=brand)
+
+
+class QueryCountTest:
+    def __init__(self, db):
+        self.db = db
+        self.servicer = GoodsServicer()
+
+    def goods_list(self):
+        # count + 分页查询
+        with QueryCounter(self.db, max_queries=2) as counter:
+            rsp = self.servicer.GoodsList(goods_pb2.GoodsFilterRequest(pagePerNums=50), Context())
+        assert len(rsp.data) == 50 and rsp.data[0].brand.name
+        print(f"GoodsList(50条): {counter.count} 条sql")
+
+    def batch_get_goods(self):
+        ids = [goods.id for goods in Goods.select(Goods.id)]
+        goods_cache.invalidate(*ids)
+        with QueryCounter(self.db, max_queries=1) as counter:     # 缓存没有命中时 一次join查询
+            rsp = self.servicer.BatchGetGoods(goods_pb2.BatchGoodsIdInfo(id=ids), Context())
+        assert len(rsp.data) == len(ids) and rsp.data[0].category.name
+        print(f"BatchGetGoods({len(ids)}条): {counter.count} 条sql")
+
+        with QueryCounter(self.db, max_queries=0) as counter:     # 全部命中缓存
+            self.servicer.BatchGetGoods(goods_pb2.BatchGoodsIdInfo(id=ids), Context())
+        print(f"BatchGetGoods({len(ids)}条, 命中缓存): {counter.count} 条sql")
+
+    def goods_detail(self):
+        goods_id = Goods.select(Goods.id).first().id
+        goods_cache.invalidate(goods_id)
+        with QueryCounter(self.db, max_queries=1) as counter:     # 点击数由后台批量写入, 这里只有查询
+            rsp = self.servicer.GetGoodsDetail(goods_pb2.GoodInfoRequest(id=goods_id), Context())
+        assert rsp.brand.name
+        print(f"GetGoodsDetail: {counter.count} 条sql")
+
+        with QueryCounter(self.db, max_queries=0) as counter:
+            self.servicer.GetGoodsDetail(goods_pb2.GoodInfoRequest(id=goods_id), Context())
+        print(f"GetGoodsDetail(命中缓存): {counter.count} 条sql")
+
+    def category_brand_list(self):
+        # count + 一次join查询
+        with QueryCounter(self.db, max_queries=2) as counter:
+            rsp = self.servicer.CategoryBrandList(goods_pb2.CategoryBrandFilterRequest(pagePerNums=20), Context())
+        assert len(rsp.data) == 20 and rsp.data[0].brand.name and rsp.data[0].category.name
+        print(f"CategoryBrandList(20条): {counter.count} 条sql")
+
+    def get_category_brand_list(self):
+        category_id = Category.select(Category.id).where(Category.level == 3).first().id
+        category_brands_cache.invalidate(category_id)
+        category_cache.tree()
+        with QueryCounter(self.db, max_queries=1) as counter:
+            rsp = self.servicer.GetCategoryBrandList(goods_pb2.CategoryInfoRequest(id=category_id), Context())
+        assert rsp.total == 5 and rsp.data[0].name
+        print(f"GetCategoryBrandList({rsp.total}条): {counter.count} 条sql")
+
+        with QueryCounter(self.db, max_queries=0) as counter:
+            self.servicer.GetCategoryBrandList(goods_pb2.CategoryInfoRequest(id=category_id), Context())
+        print(f"GetCategoryBrandList(命中缓存): {counter.count} 条sql")
+
+    def categorys_list_count(self):
+        category_cache.invalidate()
+        with QueryCounter(self.db) as counter:
+            rsp = self.servicer.GetCategorysList(goods_pb2.CategoryListRequest(level=1), Context())
+        return rsp.total, counter.count
+
+    def categorys_list(self):
+        # 重建分类树: 查版本号 + 查全部分类, sql条数不能随着分类的数量增长
+        total, count = self.categorys_list_count()
+        c1 = Category.create(name="新增一级分类", level=1)
+        for i in range(100):
+            c2 = Category.create(name=f"新增二级分类{i}", level=2, parent_category=c1)
+            Category.create(name=f"新增三级分类{i}", level=3, parent_category=c2)
+        more_total, more_count = self.categorys_list_count()
+        assert more_total == total + 1
+        assert count == more_count <= 2, f"GetCategorysList 的sql条数从 {count} 增长到了 {more_count}"
+        print(f"GetCategorysList(分类数 +201): {count} -> {more_count} 条sql")
+
+        with QueryCounter(self.db, max_queries=0) as counter:      # 分类树没有过期时不访问数据库
+            self.servicer.GetCategorysList(goods_pb2.CategoryListRequest(level=1), Context())
+        print(f"GetCategorysList(命中缓存): {counter.count} 条sql")
+
+if __name__ == '__main__':
+    db = SqliteDatabase(":memory:")
+    # 不需要连接 mysql: sql 都要发到 bind_ctx 绑定的 sqlite, settings.DB (比如 settings.DB.atomic()) 不会被 bind_ctx 替换
+    with QueryCounter(settings.DB, max_queries=0), db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        init_data()
+
+        test = QueryCountTest(db)
+        test.goods_list()
+        test.batch_get_goods()
+        test.goods_detail()
+        test.category_brand_list()
+        test.get_category_brand_list()
+        test.categorys_list()
@@ -0,0 +1,47 @@
+import time
+
+from goods_srv.search.inverted_index import InvertedIndex, tokenize
+
+"""
+    离线测试商品搜索的倒排索引, 不需要数据库
+        python search_demo.py              使用下面内置的语料
+        python search_demo.py goods.txt    每行一个商品名称, 行号作为商品id
+"""
+
+CORPUS = [
+    ("Apple iPhone 13 Pro 256G 远峰蓝色", "支持移动联通电信5G 双卡双待手机"),
+    ("华为 HUAWEI Mate 40 Pro 麒麟9000", "5G SoC芯片 超感知徕卡电影影像"),
+    ("小米11 Ultra 至尊 5G 骁龙888", "2K AMOLED四曲面柔性屏 陶瓷黑 手机"),
+    ("新疆阿克苏苹果 冰糖心 5kg", "新鲜水果 脆甜多汁"),
+    ("烟台红富士苹果 10斤装", "当季新鲜水果"),
+    ("Apple MacBook Air 13.3英寸 M1芯片", "8核中央处理器 轻薄笔记本电脑"),
+    ("海南三亚 贵妃芒果 5斤", "新鲜水果 现摘现发"),
+    ("蒙牛 特仑苏 纯牛奶 250ml*16", "早餐奶 整箱装"),
+]
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [(line.strip(), "") for line in f if line.strip()]
+
+
+if __name__ == '__main__':
+    import sys
+
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else CORPUS
+
+    start = time.perf_counter()
+    index = InvertedIndex()
+    for goods_id, (name, goods_brief) in enumerate(corpus, start=1):
+        index.add(goods_id, name=name, goods_brief=goods_brief)
+    print(f"索引 {len(index)} 个商品, 耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(tokenize("烟台红富士苹果 10斤装", unigrams=True))
+    for keywords in ["苹果", "apple", "iph", "新鲜水果", "5g 手机", "果", "三星"]:
+        goods_ids = index.search(keywords)
+        print(keywords, "->", [corpus[goods_id - 1][0] for goods_id in goods_ids])
+
+    # 删除之后不应该再搜索到
+    index.remove(4)
+    assert 4 not in index.search("苹果")
+    assert index.search("苹果") == [5]
@@ -3,6 +3,9 @@ import signal
 import socket
 import sys
 import argparse
+import asyncio
+import threading
+import time
 import uuid
 from concurrent import futures
 # import logging
@@ -15,21 +18,42 @@ import grpc
 from loguru import logger
 
 from goods_srv.proto import goods_pb2_grpc
-from goods_srv.handler.goods import GoodsServicer
+from goods_srv.handler.goods import GoodsServicer, click_counter, goods_num_counter, order_paid, goods_fav
+from goods_srv.search.backend import search_backend
+from goods_srv.model.models import CategoryClosure
+from goods_srv.cache.goods import goods_cache
+from goods_srv.cache.brand import category_brands_cache
+from goods_srv.cache.index_ad import index_ad_cache
+from goods_srv.cache.home_page import home_page_snapshot
 from common.grpc_health.v1 import health_pb2_grpc
 from common.grpc_health.v1 import health
 from common.register import consul
 from goods_srv.settings import settings
 
 
-def on_exit(signo, frame, service_id):
+def on_exit(signo, frame, service_id, consumer=None):
     register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)
     logger.info(f"注销 {service_id} 商品服务")
     register.deregister(service_id)
     logger.info(f"注销成功")
+    if consumer is not None:
+        consumer.shutdown()
+    logger.info(f"写入缓冲的商品点击数 销量 收藏数")
+    click_counter.stop()
+    goods_num_counter.stop()
+    search_backend.stop()
     sys.exit(0)
 
 
+def report_cache_stats(interval):
+    # 定期在日志中输出商品缓存的 命中/未命中/淘汰 次数
+    while True:
+        time.sleep(interval)
+        logger.info(f"商品缓存统计: {goods_cache.stats()}")
+        logger.info(f"分类品牌缓存统计: {category_brands_cache.stats()}")
+        logger.info(f"首页广告缓存统计: {index_ad_cache.stats()}")
+
+
 def get_free_tcp_port():
     # 自动获取端口号
     tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -39,6 +63,78 @@ def get_free_tcp_port():
     return port
 
 
+def start_background_tasks(goods_servicer):
+    # 两种模式共用的后台任务, 返回 rocketmq 的消费者(没有配置 rocketmq 时为 None)
+    # 0. 分类的闭包表和分类表对不上时(比如刚部署)先重新生成, 否则按 topCategory 过滤查不到商品
+    if CategoryClosure.rebuild_if_stale():
+        logger.info("分类闭包表已重新生成")
+    # 1. 后台加载商品搜索索引, 并定期同步其他副本的修改, 搜索时不访问数据库
+    search_backend.start()
+    # 2. 启动商品点击数的批量写入
+    click_counter.start()
+    # 3. 消费订单支付和收藏的消息, 批量累加销量和收藏数
+    goods_num_counter.start()
+    consumer = None
+    if settings.ROCKETMQ_HOST:
+        from rocketmq.client import PushConsumer     # 没有配置 rocketmq 时不需要安装它的客户端
+
+        consumer = PushConsumer("mxshop_goods")
+        consumer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
+        consumer.subscribe("order_paid", order_paid)
+        consumer.subscribe("goods_fav", goods_fav)
+        consumer.start()
+    # 4. 后台构建首页快照
+    home_page_snapshot.start(goods_servicer.build_home_page_rsp)
+    # 5. 定期输出缓存统计
+    if settings.CACHE_STATS_INTERVAL:
+        threading.Thread(target=report_cache_stats, args=(settings.CACHE_STATS_INTERVAL,), daemon=True).start()
+    return consumer
+
+
+def register_service(ip, port, consumer):
+    service_id = str(uuid.uuid1())  # 使用主机ID, 序列号, 和当前时间来生成UUID
+
+    # 主进程退出信号监听
+    """
+        windows下支持的信号是有限的:
+            SIGINT  ctrl+C 中断命令
+            SIGTERM kill 发出的软件终止
+    """
+    signal.signal(signal.SIGINT, partial(on_exit, service_id=service_id, consumer=consumer))
+    signal.signal(signal.SIGTERM, partial(on_exit, service_id=service_id, consumer=consumer))
+
+    logger.info(f"商品服务注册中: {settings.CONSUL_HOST}:{settings.CONSUL_PORT}")
+    register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)    # 连接注册中心  consul
+    if not register.register(name=settings.SERVICE_NAME, id=service_id, tags=settings.SERVICE_TAGS, address=ip, port=port):    # 注册 服务
+        logger.info(f"商品服务注册失败")
+        sys.exit(0)
+    logger.info(f"商品服务注册成功")
+
+
+async def aio_server(ip, port):
+    """
+    asyncio 模式: 只读接口是协程, 通过 aiomysql 查询数据库, 同时处理的请求数不再受线程数限制
+    同步实现的接口(写接口 / 健康检查等)在 migration_thread_pool 中执行
+    """
+    from goods_srv.handler.goods_aio import AsyncGoodsServicer, aio_db
+
+    await aio_db.connect()
+    server = grpc.aio.server(migration_thread_pool=futures.ThreadPoolExecutor(max_workers=settings.AIO_MIGRATION_WORKERS))
+    goods_servicer = AsyncGoodsServicer()
+    goods_pb2_grpc.add_GoodsServicer_to_server(goods_servicer, server)
+    health_pb2_grpc.add_HealthServicer_to_server(health.HealthServicer(), server)
+    server.add_insecure_port(f"{ip}:{port}")
+    consumer = start_background_tasks(goods_servicer)
+
+    logger.info(f"启动商品服务(asyncio): {ip}:{port}")
+    await server.start()
+    register_service(ip, port, consumer)
+    try:
+        await server.wait_for_termination()
+    finally:
+        await aio_db.close()
+
+
 def server():
     parser = argparse.ArgumentParser()
     parser.add_argument('--ip',
@@ -55,6 +151,12 @@ def server():
                         help="the listening port"
                         )
 
+    parser.add_argument('--mode',
+                        choices=["thread", "aio"],
+                        default="thread",
+                        help="thread: 线程池处理请求; aio: 基于 grpc.aio 和 aiomysql 的 asyncio 模式"
+                        )
+
     args = parser.parse_args()
 
     if args.port == 0:
@@ -63,35 +165,25 @@ def server():
         port = args.port
 
     logger.add("logs/goods_srv_{time}.log")
+    if args.mode == "aio":
+        asyncio.run(aio_server(args.ip, port))
+        return
+
     # 1. 实例化server
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
     # 2.1. 注册商品服务
-    goods_pb2_grpc.add_GoodsServicer_to_server(GoodsServicer(), server)
+    goods_servicer = GoodsServicer()
+    goods_pb2_grpc.add_GoodsServicer_to_server(goods_servicer, server)
     # 2.2 注册健康检查  别人封装的  给 consul 调用的  检查你是否健康
     health_pb2_grpc.add_HealthServicer_to_server(health.HealthServicer(), server)
     # 3. 启动server
     server.add_insecure_port(f"{args.ip}:{port}")
-
-    service_id = str(uuid.uuid1())  # 使用主机ID, 序列号, 和当前时间来生成UUID
-
-    # 主进程退出信号监听
-    """
-        windows下支持的信号是有限的:
-            SIGINT  ctrl+C 中断命令
-            SIGTERM kill 发出的软件终止
-    """
-    signal.signal(signal.SIGINT, partial(on_exit, service_id=service_id))
-    signal.signal(signal.SIGTERM, partial(on_exit, service_id=service_id))
+    # 4. 搜索索引 / 计数的批量写入 / 消息消费 / 首页快照 等后台任务
+    consumer = start_background_tasks(goods_servicer)
 
     logger.info(f"启动商品服务: {args.ip}:{port}")
     server.start()
-
-    logger.info(f"商品服务注册中: {settings.CONSUL_HOST}:{settings.CONSUL_PORT}")
-    register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)    # 连接注册中心  consul
-    if not register.register(name=settings.SERVICE_NAME, id=service_id, tags=settings.SERVICE_TAGS, address=args.ip, port=port):    # 注册 服务
-        logger.info(f"商品服务注册失败")
-        sys.exit(0)
-    logger.info(f"商品服务注册成功")
+    register_service(args.ip, port, consumer)
 
     server.wait_for_termination()
 
@@ -1,16 +1,112 @@
 import json
+import time
+from collections import defaultdict
+from datetime import datetime
 
 import grpc
 from loguru import logger
-from peewee import DoesNotExist
+from peewee import DoesNotExist, JOIN, fn
 from google.protobuf import empty_pb2
 
 from goods_srv.proto import goods_pb2, goods_pb2_grpc
 from goods_srv.model.models import *
+from goods_srv.cache.category import category_cache
+from goods_srv.cache.goods import goods_cache
+from goods_srv.cache.brand import category_brands_cache
+from goods_srv.cache.index_ad import index_ad_cache
+from goods_srv.cache.home_page import home_page_snapshot
+from goods_srv.search.backend import search_backend
+from goods_srv.settings import settings
+from common.db.keyset import keyset_paginate, InvalidCursor
+from common.db.write_behind import WriteBehindCounter
+
+
+count_cache = settings.COUNT_CACHE
+
+
+def flush_click_num(deltas):
+    """
+    批量写入点击数  增量相同的商品合并成一条 update goods set click_num = click_num + n where id in (...)
+    """
+    goods_ids_by_num = defaultdict(list)
+    for goods_id, num in deltas.items():
+        goods_ids_by_num[num].append(goods_id)
+
+    # 同时更新 update_time, GoodsExport 的增量导出(since)才能导出点击数的变化
+    now = datetime.now()
+    with Goods._meta.database.atomic():
+        for num, goods_ids in goods_ids_by_num.items():
+            Goods.update(click_num=Goods.click_num + num, update_time=now).where(Goods.id.in_(goods_ids)).execute()
+
+
+click_counter = WriteBehindCounter(flush_click_num, interval=settings.CLICK_FLUSH_INTERVAL,
+                                   max_size=settings.CLICK_BUFFER_SIZE)
+
+
+def flush_goods_num(deltas):
+    """
+    批量写入销量和收藏数  deltas 的 key 为 (字段名, 商品id)
+    同一个字段增量相同的商品合并成一条 update goods set 字段 = 字段 + n where id in (...)
+    """
+    goods_ids_by_num = defaultdict(list)
+    for (field_name, goods_id), num in deltas.items():
+        goods_ids_by_num[(field_name, num)].append(goods_id)
+
+    now = datetime.now()
+    with Goods._meta.database.atomic():
+        for (field_name, num), goods_ids in goods_ids_by_num.items():
+            field = getattr(Goods, field_name)
+            Goods.update({field: field + num, Goods.update_time: now}).where(Goods.id.in_(goods_ids)).execute()
+
+
+# 销量和收藏数 由订单支付和收藏的消息驱动, 同样先在内存中累加 再批量写入, 避免热门商品的行锁竞争
+goods_num_counter = WriteBehindCounter(flush_goods_num, interval=settings.GOODS_NUM_FLUSH_INTERVAL,
+                                       max_size=settings.GOODS_NUM_BUFFER_SIZE)
+
+# GoodsList 支持的排序字段
+ORDERING_FIELDS = {
+    "shop_price": Goods.shop_price,
+    "sold_num": Goods.sold_num,
+}
+
+
+def order_paid(msg):
+    """
+    订单支付成功的消息  累加订单中每个商品的销量
+    消息内容: {"orderSn": 订单号, "goods": [{"goodsId": 商品id, "nums": 数量}]}
+    rocketmq 是可选的, 只有配置了 rocketmq 才会收到消息, 所以在这里才导入
+    """
+    from rocketmq.client import ConsumeStatus
+
+    try:
+        msg_body = json.loads(msg.body.decode("utf-8"))
+        for item in msg_body["goods"]:
+            goods_num_counter.incr(("sold_num", int(item["goodsId"])), int(item["nums"]))
+    except (ValueError, KeyError, TypeError) as e:
+        # 格式错误的消息重试也没有用, 直接丢弃
+        logger.error(f"无法解析的订单支付消息: {msg.body}, {e}")
+    return ConsumeStatus.CONSUME_SUCCESS
+
+
+def goods_fav(msg):
+    """
+    收藏/取消收藏的消息  消息内容: {"goodsId": 商品id, "delta": 1 或者 -1}
+    """
+    from rocketmq.client import ConsumeStatus
+
+    try:
+        msg_body = json.loads(msg.body.decode("utf-8"))
+        goods_num_counter.incr(("fav_num", int(msg_body["goodsId"])), int(msg_body["delta"]))
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"无法解析的收藏消息: {msg.body}, {e}")
+    return ConsumeStatus.CONSUME_SUCCESS
 
 
 class GoodsServicer(goods_pb2_grpc.GoodsServicer):
-    def convert_goods_to_rsp(self, goods):
+    def convert_goods_to_rsp(self, goods, missing_ok=False):
+        """
+        missing_ok: 分类或品牌已经删除(或者不存在)时不抛出异常, 响应中的分类/品牌留空
+        """
         info_rsp = goods_pb2.GoodsInfoResponse()
 
         info_rsp.id = goods.id
@@ -31,39 +127,160 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         info_rsp.isHot = goods.is_hot
         info_rsp.onSale = goods.on_sale
 
-        info_rsp.category.id = goods.category.id
-        info_rsp.category.name = goods.category.name
+        # join_category_brand 没有join到(已经删除或者不存在)时为 None, 和直接查询时一样抛出 DoesNotExist
+        category, brand = goods.category, goods.brand
+        if category is None:
+            if not missing_ok:
+                raise Category.DoesNotExist(f"商品 {goods.id} 的分类不存在")
+        else:
+            info_rsp.category.id = category.id
+            info_rsp.category.name = category.name
 
-        info_rsp.brand.id = goods.brand.id
-        info_rsp.brand.name = goods.brand.name
-        info_rsp.brand.logo = goods.brand.logo
+        if brand is None:
+            if not missing_ok:
+                raise Brands.DoesNotExist(f"商品 {goods.id} 的品牌不存在")
+        else:
+            info_rsp.brand.id = brand.id
+            info_rsp.brand.name = brand.name
+            info_rsp.brand.logo = brand.logo
         return info_rsp
 
-    def category_model_to_dict(self, category):
-        return {
-            "id": category.id,
-            "name": category.name,
-            "parent": category.parent_category_id,
-            "level": category.level,
-            "is_tab": category.is_tab
-        }
-
-    # 商品接口
-    @logger.catch
-    def GoodsList(self, request: goods_pb2.GoodsFilterRequest, context):
-        # 商品列表页
-        rsp = goods_pb2.GoodsListResponse()
-
+    def with_category_brand(self, goods):
+        """
+        一次join查询出商品的分类和品牌, 避免 convert_goods_to_rsp 中每个商品再各查一次分类和品牌(N+1查询)
+        """
+        return self.join_category_brand(
+            goods.select_extend(Category.id, Category.name, Brands.id, Brands.name, Brands.logo))
+
+    def join_category_brand(self, goods):
+        """
+        join 不会带上 BaseModel.select 中的 is_deleted 条件, 放到 on 中
+        分类或品牌已经删除(或者不存在)时join不到, 转换成响应时和之前逐个查询一样抛出 DoesNotExist
+        """
+        return (goods.join(Category, JOIN.LEFT_OUTER, attr="category",
+                           on=((Goods.category == Category.id) & (Category.is_deleted == False)))
+                .switch(Goods)
+                .join(Brands, JOIN.LEFT_OUTER, attr="brand",
+                      on=((Goods.brand == Brands.id) & (Brands.is_deleted == False)))
+                .switch(Goods))
+
+    def goods_rows(self, goods):
+        """
+        列表接口使用的轻量查询: 只查询响应需要的列, 每一行是一个 namedtuple, 不创建 Model 实例
+        分类和品牌同样通过一次join查询, 配合 convert_goods_row_to_rsp 使用
+        """
+        return self.join_category_brand(
+            goods.select(Goods.id, Goods.name, Goods.goods_sn, Goods.click_num, Goods.sold_num, Goods.fav_num,
+                         Goods.market_price, Goods.shop_price, Goods.goods_brief, Goods.ship_free,
+                         Goods.desc_images, Goods.goods_front_image, Goods.is_new, Goods.is_hot, Goods.on_sale,
+                         Category.id.alias("category_id"), Category.name.alias("category_name"),
+                         Brands.id.alias("brand_id"), Brands.name.alias("brand_name"),
+                         Brands.logo.alias("brand_logo"))).namedtuples()
+
+    def convert_goods_row_to_rsp(self, row):
+        # 和 convert_goods_to_rsp 的结果相同, 一次构造整个消息
+        if row.category_id is None:
+            raise Category.DoesNotExist(f"商品 {row.id} 的分类不存在")
+        if row.brand_id is None:
+            raise Brands.DoesNotExist(f"商品 {row.id} 的品牌不存在")
+        return goods_pb2.GoodsInfoResponse(
+            id=row.id,
+            categoryId=row.category_id,
+            name=row.name,
+            goodsSn=row.goods_sn,
+            clickNum=row.click_num,
+            soldNum=row.sold_num,
+            favNum=row.fav_num,
+            marketPrice=row.market_price,
+            shopPrice=row.shop_price,
+            goodsBrief=row.goods_brief,
+            shipFree=row.ship_free,
+            goodsFrontImage=row.goods_front_image,
+            isNew=row.is_new,
+            descImages=row.desc_images,
+            images=row.desc_images,
+            isHot=row.is_hot,
+            onSale=row.on_sale,
+            category=goods_pb2.CategoryBriefInfoResponse(id=row.category_id, name=row.category_name),
+            brand=goods_pb2.BrandInfoResponse(id=row.brand_id, name=row.brand_name, logo=row.brand_logo),
+        )
+
+    def with_brand_category(self, category_brands):
+        """
+        一次join查询出品牌分类关系对应的品牌和分类, 已经删除的品牌和分类不返回
+        """
+        return (category_brands.select_extend(Brands.id, Brands.name, Brands.logo,
+                                              Category.id, Category.name, Category.parent_category,
+                                              Category.level, Category.is_tab)
+                .join(Brands)
+                .switch(GoodsCategoryBrand)
+                .join(Category)
+                .switch(GoodsCategoryBrand)
+                .where((Brands.is_deleted == False) & (Category.is_deleted == False)))
+
+    def category_brands_query(self, category_ids):
+        return self.with_brand_category(GoodsCategoryBrand.select()).where(
+            GoodsCategoryBrand.category.in_(category_ids))
+
+    def load_category_brands_rsp(self, category_ids):
+        # 分类品牌缓存没有命中时从数据库加载, 返回 {分类id: BrandListResponse}, 没有品牌的分类返回空列表
+        return self.build_category_brands_rsp(category_ids, self.category_brands_query(category_ids))
+
+    def build_category_brands_rsp(self, category_ids, category_brands):
+        rsps = {category_id: goods_pb2.BrandListResponse() for category_id in category_ids}
+        for category_brand in category_brands:
+            rsp = rsps[category_brand.category_id]
+            brand_rsp = rsp.data.add()
+            brand_rsp.id = category_brand.brand.id
+            brand_rsp.name = category_brand.brand.name
+            brand_rsp.logo = category_brand.brand.logo
+            rsp.total += 1
+        return rsps
+
+    def invalidate_brand(self, brand_id):
+        # 品牌修改/删除后, 失效这个品牌所在的所有分类的品牌列表 以及引用了这个品牌的首页广告
+        category_ids = [category_brand.category_id for category_brand in
+                        GoodsCategoryBrand.select(GoodsCategoryBrand.category).where(GoodsCategoryBrand.brand == brand_id)]
+        category_brands_cache.invalidate(*category_ids)
+        self.invalidate_index_ads(brand_id=brand_id)
+        self.invalidate_goods_of(Goods.brand == brand_id)
+        home_page_snapshot.invalidate()
+
+    def invalidate_goods_of(self, condition):
+        """
+        缓存的商品详情中带有分类名称 和 品牌名称/logo, 分类或品牌修改/删除后失效直接属于它的商品
+        (响应中只有商品自己的分类, 子分类下的商品不受影响)
+        """
+        goods_ids = [goods.id for goods in Goods.select(Goods.id).where(condition)]
+        for i in range(0, len(goods_ids), settings.BULK_CHUNK_SIZE):
+            goods_cache.invalidate(*goods_ids[i:i + settings.BULK_CHUNK_SIZE])
+
+    def goods_by_ids(self, goods_ids):
+        return self.goods_rows(Goods.select()).where(Goods.id.in_(goods_ids))
+
+    def load_goods_rsp(self, goods_ids):
+        # 商品缓存没有命中时从数据库加载, 返回 {商品id: GoodsInfoResponse}
+        return self.goods_rows_to_rsp(self.goods_by_ids(goods_ids))
+
+    def goods_rows_to_rsp(self, rows):
+        # 分类或品牌已经删除的商品和之前逐个查询时一样当作不存在, 不影响同一批中的其他商品
+        return {row.id: self.convert_goods_row_to_rsp(row) for row in rows
+                if row.category_id is not None and row.brand_id is not None}
+
+    def filter_goods(self, request: goods_pb2.GoodsFilterRequest):
+        """
+        根据 GoodsList 的过滤和排序条件构建查询, 返回 (查询, 游标分页的排序字段, 是否倒序)
+        model/migrate.py 中维护的索引覆盖了这里的过滤条件组合, 可以用 demo/explain_goods_list.py 检查
+        """
         goods = Goods.select()
 
-        if request.ordering:    # 排序
-            if "shop_price" in request.ordering:
-                if len(request.ordering) == 10:
-                    goods = goods.order_by(Goods.shop_price)
-                elif len(request.ordering) == 11:
-                    goods = goods.order_by(-Goods.shop_price)
-        if request.keyWords:  # 搜索
-            goods = goods.filter(Goods.name.contains(request.keyWords))
+        sort_field = None       # 游标分页使用的排序字段
+        sort_desc = False
+        if request.ordering:    # 排序  shop_price / -shop_price 按价格, -sold_num 销量最高(sold_num 销量最低)
+            sort_field = ORDERING_FIELDS.get(request.ordering.lstrip("-"))
+            if sort_field is not None:
+                sort_desc = request.ordering.startswith("-")
+                goods = goods.order_by(sort_field.desc() if sort_desc else sort_field.asc())
         if request.isHot:
             goods = goods.filter(Goods.is_hot == True)
         if request.isNew:
@@ -76,29 +293,44 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
             goods = goods.filter(Goods.brand_id == request.brand)
 
         if request.topCategory:
-            # 通过category来查询商品, 这个category可能是一级、二级或者三级分类
-            # orm可以帮你提高效率的, 但是不能因为使用orm而放弃了解sql语句
-            try:
-                ids = []
-                category = Category.get(Category.id == request.topCategory)
-                level = category.level
-
-                if level == 1:
-                    c2 = Category.alias()
-                    categorys = Category.select().where(Category.parent_category_id.in_(
-                        c2.select(c2.id).where(c2.parent_category_id == request.topCategory)))
-                    for category in categorys:
-                        ids.append(category.id)
-                elif level == 2:
-                    categorys = Category.select().where(Category.parent_category_id == request.topCategory)
-                    for category in categorys:
-                        ids.append(category.id)
-                elif level == 3:
-                    ids.append(request.topCategory)
-
-                goods = goods.where(Goods.category_id.in_(ids))
-            except Exception as e:
-                pass
+            # 通过category来查询商品, 这个category可以是任意层级的分类
+            # 通过闭包表一次join查出所有子孙分类下的商品; 分类不存在时和之前一样忽略这个条件
+            if category_cache.tree().get(request.topCategory) is not None:
+                goods = (goods.join(CategoryClosure, on=(CategoryClosure.descendant == Goods.category))
+                         .where(CategoryClosure.ancestor == request.topCategory)
+                         .switch(Goods))
+
+        if request.keyWords:  # 搜索  由搜索后端返回全部相关的商品id, 和上面的过滤条件取交集之后再限制数量
+            goods_ids = self.match_search_ids(goods, search_backend.search(request.keyWords),
+                                              settings.SEARCH_MAX_RESULTS)
+            goods = goods.where(Goods.id.in_(goods_ids))
+            if not request.ordering and goods_ids:    # 没有指定排序时按相关度排序
+                goods = goods.order_by(fn.FIELD(Goods.id, *goods_ids))
+
+        return goods, sort_field, sort_desc
+
+    def match_search_ids(self, goods, ranked_ids, limit):
+        """
+        按相关度的顺序 每次取 limit 个商品id 和过滤条件取交集, 凑够 limit 个就停止
+        排名靠后但满足过滤条件的商品不会因为只取了前 limit 个搜索结果而丢失
+        """
+        matched = []
+        ids = goods.select(Goods.id).order_by().tuples()
+        for i in range(0, len(ranked_ids), limit):
+            chunk = ranked_ids[i:i + limit]
+            found = {row[0] for row in ids.where(Goods.id.in_(chunk))}
+            matched.extend(goods_id for goods_id in chunk if goods_id in found)
+            if len(matched) >= limit:
+                return matched[:limit]
+        return matched
+
+    # 商品接口
+    @logger.catch
+    def GoodsList(self, request: goods_pb2.GoodsFilterRequest, context):
+        # 商品列表页
+        rsp = goods_pb2.GoodsListResponse()
+
+        goods, sort_field, sort_desc = self.filter_goods(request)
 
         # 分页 limit offset
         start = 0
@@ -109,22 +341,52 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         if request.pages:
             start = (request.pages - 1) * per_page_nums
 
-        rsp.total = goods.count()
-        goods = goods.limit(per_page_nums).offset(start)
+        if not request.skipTotal:
+            rsp.total = count_cache.count(goods)
+        goods = self.goods_rows(goods)
+        if request.HasField("cursor"):
+            # 游标分页, 翻到多深都只扫描一页的数据
+            try:
+                goods, next_cursor = keyset_paginate(goods, Goods.id, request.cursor, per_page_nums, sort_field, sort_desc)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return goods_pb2.GoodsListResponse()
+            rsp.nextCursor = next_cursor
+        else:
+            goods = goods.limit(per_page_nums).offset(start)
 
-        for good in goods:
-            rsp.data.append(self.convert_goods_to_rsp(good))
+        rsp.data.extend(self.convert_goods_row_to_rsp(row) for row in goods)
         return rsp
 
     @logger.catch
     def BatchGetGoods(self, request: goods_pb2.BatchGoodsIdInfo, context):
         # 批量获取商品详情, 订单新建的时候可以使用
+        if not self.check_goods_fields(request, context):
+            return goods_pb2.GoodsListResponse()
+        goods = goods_cache.get_many(list(request.id), self.load_goods_rsp)
+        return self.build_batch_goods_rsp(request, goods)
+
+    def check_goods_fields(self, request: goods_pb2.BatchGoodsIdInfo, context):
+        if request.fields.paths and not request.fields.IsValidForDescriptor(goods_pb2.GoodsInfoResponse.DESCRIPTOR):
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"无效的字段: {', '.join(request.fields.paths)}")
+            return False
+        return True
+
+    def build_batch_goods_rsp(self, request: goods_pb2.BatchGoodsIdInfo, goods):
+        # fields 不为空时只返回其中的字段; 不存在的商品id 按请求顺序放在 notFound 中, 不需要再查总数
         rsp = goods_pb2.GoodsListResponse()
-        goods = Goods.select().where(Goods.id.in_(list(request.id)))
-
-        rsp.total = goods.count()
-        for good in goods:
-            rsp.data.append(self.convert_goods_to_rsp(good))
+        fields = request.fields if request.fields.paths else None
+        for goods_id in dict.fromkeys(request.id):
+            info = goods.get(goods_id)
+            if info is None:
+                rsp.notFound.append(goods_id)
+            elif fields is None:
+                rsp.data.append(info)
+            else:
+                fields.MergeMessage(info, rsp.data.add())
+        rsp.total = len(rsp.data)
         return rsp
 
     @logger.catch
@@ -134,6 +396,10 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         try:
             goods = Goods.get(Goods.id==request.id)
             goods.delete_instance()
+            search_backend.remove(goods.id)
+            goods_cache.invalidate(goods.id)
+            self.invalidate_index_ads(goods_ids=[goods.id])
+            home_page_snapshot.invalidate()
             return empty_pb2.Empty()
         except DoesNotExist as e:
             context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -147,17 +413,22 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     @logger.catch
     def GetGoodsDetail(self, request:goods_pb2.GoodInfoRequest, context):
         # 获取商品的详情
-        try:
-            goods = Goods.get(Goods.id==request.id)
-            # 每次请求增加click_num
-            goods.click_num += 1
-            goods.save()
-            return self.convert_goods_to_rsp(goods)
-        except DoesNotExist:
+        return self.build_goods_detail_rsp(request.id, goods_cache.get(request.id, self.load_goods_rsp), context)
+
+    def build_goods_detail_rsp(self, goods_id, cached, context):
+        if cached is None:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details("记录不存在")
             return goods_pb2.GoodsInfoResponse()
 
+        # 每次请求增加click_num  先记在内存中, 由后台线程批量写入数据库
+        click_counter.incr(goods_id)
+        # 缓存中的响应是共享的, 复制一份再修改
+        rsp = goods_pb2.GoodsInfoResponse()
+        rsp.CopyFrom(cached)
+        rsp.clickNum += click_counter.pending(goods_id)
+        return rsp
+
     @logger.catch
     def CreateGoods(self, request:goods_pb2.CreateGoodsInfo, context):
         # 新建商品
@@ -191,6 +462,8 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         goods.is_hot = request.isHot
         goods.on_sale = request.onSale
         goods.save()
+        search_backend.index(goods)
+        home_page_snapshot.invalidate()
 
         # TODO 此处完善库存的设置 - 分布式事务
         return self.convert_goods_to_rsp(goods)
@@ -241,80 +514,215 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         # goods.is_hot = request.isHot
         # goods.on_sale = request.onSale
         goods.save()
+        search_backend.index(goods)
+        goods_cache.invalidate(goods.id)
+        self.invalidate_index_ads(goods_ids=[goods.id])
+        home_page_snapshot.invalidate()
 
         # TODO 此处完善库存的设置 - 分布式事务
         return self.convert_goods_to_rsp(goods)
 
-    # 商品分类
+    def upsert_goods_chunk(self, chunk):
+        """
+        写入一批商品, chunk 为 [(请求流中的序号, CreateGoodsInfo)]
+        分类和品牌各一次in查询, 有id的商品一条 insert ... on duplicate key update, 没有id的逐条 insert
+        整批在一个事务中, 返回 [BulkUpsertGoodsResponse]
+        """
+        category_ids = {request.categoryId for _, request in chunk}
+        brand_ids = {request.brandId for _, request in chunk}
+        categorys = {category.id for category in Category.select(Category.id).where(Category.id.in_(list(category_ids)))}
+        brands = {brand.id for brand in Brands.select(Brands.id).where(Brands.id.in_(list(brand_ids)))}
+        # 要更新的商品中已经被删除的(BaseModel.select 会过滤掉, 这里需要查出来), 只有请求要求恢复时才恢复
+        update_ids = [request.id for _, request in chunk if request.id]
+        deleted_ids = set()
+        if update_ids:
+            deleted_ids = {goods.id for goods in super(BaseModel, Goods).select(Goods.id).where(
+                Goods.id.in_(update_ids), Goods.is_deleted == True)}
+
+        rsps = []
+        updates, restores, inserts = [], [], []
+        now = datetime.now()
+        for index, request in chunk:
+            rsp = goods_pb2.BulkUpsertGoodsResponse(index=index, id=request.id)
+            rsps.append(rsp)
+            if request.categoryId not in categorys:
+                rsp.error = "商品分类不存在"
+                continue
+            if request.brandId not in brands:
+                rsp.error = "品牌不存在"
+                continue
+
+            row = {
+                Goods.category: request.categoryId,
+                Goods.brand: request.brandId,
+                Goods.name: request.name,
+                Goods.goods_sn: request.goodsSn,
+                Goods.market_price: request.marketPrice,
+                Goods.shop_price: request.shopPrice,
+                Goods.goods_brief: request.goodsBrief,
+                Goods.ship_free: request.shipFree,
+                Goods.images: list(request.images),
+                Goods.desc_images: list(request.descImages),
+                Goods.goods_front_image: request.goodsFrontImage,
+                Goods.is_new: request.isNew,
+                Goods.is_hot: request.isHot,
+                Goods.on_sale: request.onSale,
+                Goods.update_time: now,
+            }
+            if request.id:
+                row[Goods.id] = request.id
+                if request.restoreDeleted:
+                    row[Goods.is_deleted] = False
+                    restores.append(row)
+                else:
+                    rsp.deleted = request.id in deleted_ids
+                    updates.append(row)
+            else:
+                inserts.append((rsp, row))
+
+        if not updates and not restores and not inserts:
+            return rsps
+
+        try:
+            with Goods._meta.database.atomic():
+                # 已存在的商品只更新导入的字段, 点击数/销量/收藏数/添加时间保持不变; is_deleted 只在要求恢复时更新
+                for rows in (updates, restores):
+                    if rows:
+                        preserve = [field for field in rows[0] if field is not Goods.id]
+                        Goods.insert_many(rows).on_conflict(preserve=preserve).execute()
+                # 新增的商品逐条 insert 取得各自的id: 多行 insert 的自增id不保证连续
+                # (innodb_autoinc_lock_mode=2 或者 auto_increment_increment>1 时), 仍然在同一个事务中
+                for rsp, row in inserts:
+                    rsp.id = Goods.insert(row).execute()
+        except Exception as e:
+            logger.exception(f"批量写入商品失败: {e}")
+            for rsp in rsps:
+                if not rsp.error:
+                    rsp.error = f"写入失败: {e}"
+        return rsps
+
     @logger.catch
-    def GetAllCategorysList(self, request: empty_pb2.Empty, context):
-        # 商品的分类
-        level1 = []
-        level2 = []
-        level3 = []
+    def BulkUpsertGoods(self, request_iterator, context):
+        """
+        批量导入商品  每 BULK_CHUNK_SIZE 个商品写入一次(一个事务), 每个商品返回一条结果
+        全部写完后统一更新搜索索引 以及失效缓存
+        """
+        written = {}    # 商品id -> (name, goods_brief), 仍然是删除状态的商品为 None
+
+        def write(chunk):
+            rsps = self.upsert_goods_chunk(chunk)
+            requests = dict(chunk)
+            for rsp in rsps:
+                if not rsp.error:
+                    request = requests[rsp.index]
+                    written[rsp.id] = None if rsp.deleted else (request.name, request.goodsBrief)
+            return rsps
+
+        chunk = []
+        for index, request in enumerate(request_iterator):
+            chunk.append((index, request))
+            if len(chunk) >= settings.BULK_CHUNK_SIZE:
+                yield from write(chunk)
+                chunk = []
+        if chunk:
+            yield from write(chunk)
+
+        if written:
+            for goods_id, fields in written.items():
+                if fields is not None:      # 已删除的商品不加入搜索索引
+                    name, goods_brief = fields
+                    search_backend.index(Goods(id=goods_id, name=name, goods_brief=goods_brief))
+            goods_ids = list(written)
+            goods_cache.invalidate(*goods_ids)
+            for i in range(0, len(goods_ids), settings.BULK_CHUNK_SIZE):
+                self.invalidate_index_ads(goods_ids=goods_ids[i:i + settings.BULK_CHUNK_SIZE])
+            home_page_snapshot.invalidate()
+            logger.info(f"批量导入了 {len(written)} 个商品")
+
+    def GoodsExport(self, request: goods_pb2.GoodsExportRequest, context):
+        """
+        按主键范围分批导出商品: where id > 上一批最后的id order by id limit BULK_CHUNK_SIZE
+        每批只查询一次, 生成器按客户端的接收速度逐条返回, 客户端断开后停止查询
+        不能用 logger.catch: 生成器中途的异常会被吞掉, 客户端收到 OK 会把不完整的导出当成完整的
+        """
+        last_id = request.startId
+        try:
+            while context.is_active():
+                chunk = list(self.export_goods_chunk(request, last_id))
+                for good in chunk:
+                    yield self.convert_export_goods_to_rsp(good)
+                if len(chunk) < settings.BULK_CHUNK_SIZE:
+                    break
+                last_id = chunk[-1].id
+        except Exception as e:
+            logger.exception(f"导出商品失败, 最后导出的商品id: {last_id}")
+            context.abort(grpc.StatusCode.INTERNAL, f"导出商品失败: {e}")
+
+    def export_goods_chunk(self, request: goods_pb2.GoodsExportRequest, last_id):
+        if request.includeDeleted:
+            # 需要包含逻辑删除的商品, 所以不能用 BaseModel.select
+            goods = super(BaseModel, Goods).select()
+        else:
+            goods = Goods.select()
+        if request.since:
+            goods = goods.where(Goods.update_time >= datetime.fromtimestamp(request.since))
+        return (self.with_category_brand(goods.where(Goods.id > last_id))
+                .order_by(Goods.id).limit(settings.BULK_CHUNK_SIZE))
+
+    def convert_export_goods_to_rsp(self, goods):
+        # 分类或品牌已经删除的商品同样要导出, 分类/品牌留空
+        rsp = self.convert_goods_to_rsp(goods, missing_ok=True)
+        rsp.isDeleted = bool(goods.is_deleted)
+        return rsp
 
+    def build_category_list_rsp(self, tree):
         category_list_rsp = goods_pb2.CategoryListResponse()
-        category_list_rsp.total = Category.select().count()
-        for category in Category.select():
-            # 还有什么用
+        category_list_rsp.total = len(tree.nodes)
+        for category in tree.all():
             category_rsp = goods_pb2.CategoryInfoResponse()
-            category_rsp.id = category.id
-            category_rsp.name = category.name
-            if category.parent_category_id:
-                category_rsp.parentCategory = category.parent_category_id
-            category_rsp.level = category.level
-            category_rsp.isTab = category.is_tab
+            category_rsp.id = category["id"]
+            category_rsp.name = category["name"]
+            if category["parent"]:
+                category_rsp.parentCategory = category["parent"]
+            category_rsp.level = category["level"]
+            category_rsp.isTab = category["is_tab"]
 
             category_list_rsp.data.append(category_rsp)
 
-            if category.level == 1:
-                level1.append(self.category_model_to_dict(category))
-            elif category.level == 2:
-                level2.append(self.category_model_to_dict(category))
-            elif category.level == 3:
-                level3.append(self.category_model_to_dict(category))
-
-        # 开始整理
-        for data3 in level3:                                # 遍历三级类目
-            for data2 in level2:                            # 遍历二级类目
-                if data3["parent"] == data2["id"]:          # 如果 三级类目的父id 是 二级类目的id
-                    if "sub_category" not in data2:
-                        data2["sub_category"] = [data3]
-                    else:
-                        data2["sub_category"].append(data3)
-
-        for data2 in level2:                                # 遍历二级类目
-            for data1 in level1:                            # 遍历一级类目
-                if data2["parent"] == data1["id"]:          # 如果 二级类目的父id 是 一级类目的id
-                    if "sub_category" not in data1:
-                        data1["sub_category"] = [data2]
-                    else:
-                        data1["sub_category"].append(data2)
-
-        category_list_rsp.jsonData = json.dumps(level1)
+        # 一级类目 -> 二级类目 -> 三级类目 的嵌套结构
+        category_list_rsp.jsonData = json.dumps(tree.json_tree())
         return category_list_rsp
 
+    # 商品分类
+    @logger.catch
+    def GetAllCategorysList(self, request: empty_pb2.Empty, context):
+        # 商品的分类
+        # 同一个版本的分类树只构建一次响应, 分类变更后分类树被整体替换, 缓存的响应也随之失效
+        # 注意: 返回的是共享的对象, 不能再修改
+        tree = category_cache.tree()
+        return tree.memoize("all_categorys_rsp", lambda: self.build_category_list_rsp(tree))
+
     @logger.catch
     def GetCategorysList(self, request: goods_pb2.CategoryListResponse, context):
         category_list_rsp = goods_pb2.CategoryResponse()
+        tree = category_cache.tree()
 
-        category_info = Category.select().where(Category.level == request.level)
-        category_list_rsp.total = category_info.count()
+        category_info = tree.by_level(request.level)
+        category_list_rsp.total = len(category_info)
         for category in category_info:
             category_rsp = goods_pb2.CategorySubInfoResponse()
-            category_rsp.id = category.id
-            category_rsp.name = category.name
-            if category.parent_category:  # 判断查询的类目 是否有 父类目
-                category_rsp.parentCategory = category.parent_category_id
-            category_rsp.level = category.level
-            category_rsp.isTab = category.is_tab
-
-            sub_category_info = Category.select().where(Category.parent_category == category.id)
-            for cat in sub_category_info:
+            category_rsp.id = category["id"]
+            category_rsp.name = category["name"]
+            if category["parent"]:  # 判断查询的类目 是否有 父类目
+                category_rsp.parentCategory = category["parent"]
+            category_rsp.level = category["level"]
+            category_rsp.isTab = category["is_tab"]
+
+            for cat in tree.sub_categorys(category["id"]):
                 sub_category_rsp = goods_pb2.CategorySubInfoResponse()
-                sub_category_rsp.id = cat.id
-                sub_category_rsp.name = cat.name
-                sub_category_rsp.level = cat.level
+                sub_category_rsp.id = cat["id"]
+                sub_category_rsp.name = cat["name"]
+                sub_category_rsp.level = cat["level"]
                 category_rsp.subCat.append(sub_category_rsp)
 
             category_list_rsp.data.append(category_rsp)
@@ -323,30 +731,31 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     @logger.catch
     def GetSubCategory(self, request: goods_pb2.CategoryListRequest, context):
         category_list_rsp = goods_pb2.SubCategoryListResponse()
+        tree = category_cache.tree()
 
-        try:
-            category_info = Category.get(Category.id == request.id)
-            category_list_rsp.info.id = category_info.id
-            category_list_rsp.info.name = category_info.name
-            category_list_rsp.info.level = category_info.level
-            category_list_rsp.info.isTab = category_info.is_tab
-            if category_info.parent_category:
-                category_list_rsp.info.parentCategory = category_info.parent_category_id
-        except DoesNotExist:
+        category_info = tree.get(request.id)
+        if category_info is None:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details('记录不存在')
             return goods_pb2.SubCategoryListResponse()
 
-        categorys = Category.select().where(Category.parent_category == request.id)
-        category_list_rsp.total = categorys.count()
+        category_list_rsp.info.id = category_info["id"]
+        category_list_rsp.info.name = category_info["name"]
+        category_list_rsp.info.level = category_info["level"]
+        category_list_rsp.info.isTab = category_info["is_tab"]
+        if category_info["parent"]:
+            category_list_rsp.info.parentCategory = category_info["parent"]
+
+        categorys = tree.sub_categorys(request.id)
+        category_list_rsp.total = len(categorys)
         for category in categorys:
             category_rsp = goods_pb2.CategoryInfoResponse()
-            category_rsp.id = category.id
-            category_rsp.name = category.name
-            if category.parent_category:   # 判断查询的类目 是否有 父类目
-                category_rsp.parentCategory = category.parent_category_id
-            category_rsp.level = category.level
-            category_rsp.isTab = category.is_tab
+            category_rsp.id = category["id"]
+            category_rsp.name = category["name"]
+            if category["parent"]:   # 判断查询的类目 是否有 父类目
+                category_rsp.parentCategory = category["parent"]
+            category_rsp.level = category["level"]
+            category_rsp.isTab = category["is_tab"]
 
             category_list_rsp.subCategorys.append(category_rsp)
 
@@ -362,7 +771,11 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
                 category.parent_category = request.parentCategory
             category.level = request.level
             category.is_tab = request.isTab
-            category.save()
+            with Category._meta.database.atomic():
+                category.save()
+                CategoryClosure.add(category.id, category.parent_category_id)
+            category_cache.invalidate()
+            home_page_snapshot.invalidate()
 
             # 返回数据
             category_rsp = goods_pb2.CategoryInfoResponse()
@@ -383,7 +796,13 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     def DeleteCategory(self, request: goods_pb2.DeleteCategoryRequest, context):
         try:
             category = Category.get(request.id)
-            category.delete_instance()
+            with Category._meta.database.atomic():
+                category.delete_instance()
+                # 祖先分类下不再能查到这个分类(以及它的子分类)的商品
+                CategoryClosure.remove(category.id)
+            category_cache.invalidate()
+            self.invalidate_goods_of(Goods.category == category.id)
+            home_page_snapshot.invalidate()
 
             # TODO 删除响应的category下的商品
             return empty_pb2.Empty()
@@ -398,27 +817,41 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
             category = Category.get(request.id)
             if request.name:
                 category.name = request.name
+            parent_changed = bool(request.parentCategory) and request.parentCategory != category.parent_category_id
             if request.parentCategory:
                 category.parent_category = request.parentCategory
             if request.level:
                 category.level = request.level
             category.is_tab = request.isTab
-            category.save()
+            with Category._meta.database.atomic():
+                category.save()
+                if parent_changed:
+                    CategoryClosure.move(category.id, request.parentCategory)
+            category_cache.invalidate()
+            self.invalidate_goods_of(Goods.category == category.id)
+            home_page_snapshot.invalidate()
 
             return empty_pb2.Empty()
         except DoesNotExist:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details('记录不存在')
             return empty_pb2.Empty()
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return empty_pb2.Empty()
 
     # 轮播图
     @logger.catch
     def BannerList(self, request: empty_pb2.Empty, context):
-        # 获取分类列表
+        # 获取轮播图列表
+        return self.build_banner_list_rsp()
+
+    def build_banner_list_rsp(self):
         rsp = goods_pb2.BannerListResponse()
-        banners = Banner.select()
+        banners = list(Banner.select())
 
-        rsp.total = banners.count()
+        rsp.total = len(banners)
         for banner in banners:
             banner_rsp = goods_pb2.BannerResponse()
 
@@ -439,6 +872,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         banner.index = request.index
         banner.url = request.url
         banner.save()
+        home_page_snapshot.invalidate()
 
         banner_rsp = goods_pb2.BannerResponse()
         banner_rsp.id = banner.id
@@ -452,6 +886,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         try:
             banner = Banner.get(request.id)
             banner.delete_instance()
+            home_page_snapshot.invalidate()
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -471,6 +906,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
                 banner.url = request.url
 
             banner.save()
+            home_page_snapshot.invalidate()
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -494,8 +930,18 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         if request.pages:
             start = (request.pages - 1) * per_page_nums
 
-        rsp.total = brands.count()
-        brands = brands.limit(per_page_nums).offset(start)
+        if not request.skipTotal:
+            rsp.total = count_cache.count(brands)
+        if request.HasField("cursor"):
+            try:
+                brands, next_cursor = keyset_paginate(brands, Brands.id, request.cursor, per_page_nums)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return goods_pb2.BrandListResponse()
+            rsp.nextCursor = next_cursor
+        else:
+            brands = brands.limit(per_page_nums).offset(start)
 
         for brand in brands:
             brand_rsp = goods_pb2.BrandInfoResponse()
@@ -549,6 +995,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         try:
             brand = Brands.get(request.id)
             brand.delete_instance()
+            self.invalidate_brand(brand.id)
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -566,6 +1013,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
                 brand.logo = request.logo
 
             brand.save()
+            self.invalidate_brand(brand.id)
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -578,19 +1026,28 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     def CategoryBrandList(self, request: goods_pb2.CategoryBrandFilterRequest, context):
         # 获取品牌分类列表
         rsp = goods_pb2.CategoryBrandListResponse()
-        category_brands = GoodsCategoryBrand.select()
+        category_brands = self.with_brand_category(GoodsCategoryBrand.select())
 
         # 分页
         start = 0
         per_page_nums = 10
         if request.pagePerNums:
-            per_page_nums = request.PagePerNums
+            per_page_nums = request.pagePerNums
         if request.pages:
             start = per_page_nums * (request.pages - 1)
 
-        category_brands = category_brands.limit(per_page_nums).offset(start)
-
         rsp.total = category_brands.count()
+        if request.HasField("cursor"):
+            try:
+                category_brands, next_cursor = keyset_paginate(category_brands, GoodsCategoryBrand.id, request.cursor, per_page_nums)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return goods_pb2.CategoryBrandListResponse()
+            rsp.nextCursor = next_cursor
+        else:
+            category_brands = category_brands.order_by(GoodsCategoryBrand.id).limit(per_page_nums).offset(start)
+
         for category_brand in category_brands:
             category_brand_rsp = goods_pb2.CategoryBrandResponse()
 
@@ -601,7 +1058,8 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
 
             category_brand_rsp.category.id = category_brand.category.id
             category_brand_rsp.category.name = category_brand.category.name
-            category_brand_rsp.category.parentCategory = category_brand.category.parent_category_id
+            if category_brand.category.parent_category_id:   # 一级分类没有父分类
+                category_brand_rsp.category.parentCategory = category_brand.category.parent_category_id
             category_brand_rsp.category.level = category_brand.category.level
             category_brand_rsp.category.isTab = category_brand.category.is_tab
 
@@ -611,25 +1069,14 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     @logger.catch
     def GetCategoryBrandList(self, request: goods_pb2.CategoryInfoRequest, context):
         # 获取某一个分类的所有品牌
-        rsp = goods_pb2.BrandListResponse()     # 声明 类实例  返回类
-        try:
-            category = Category.get(Category.id == request.id)  # 查询 Category(品牌) 传入的id
-            category_brands = GoodsCategoryBrand.select().where(GoodsCategoryBrand.category == category)
-            rsp.total = category_brands.count()
-            for category_brand in category_brands:
-                # 品牌表
-                brand_rsp = goods_pb2.BrandInfoResponse()
-                brand_rsp.id = category_brand.brand.id
-                brand_rsp.name = category_brand.brand.name
-                brand_rsp.logo = category_brand.brand.logo
-
-                rsp.data.append(brand_rsp)
-        except DoesNotExist as e:
+        # 分类是否存在直接从分类树中判断, 品牌列表按分类缓存
+        if category_cache.tree().get(request.id) is None:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details('记录不存在')
-            return rsp
+            return goods_pb2.BrandListResponse()
 
-        return rsp
+        # 缓存中的响应是共享的, 不能修改
+        return category_brands_cache.get(request.id, self.load_category_brands_rsp)
 
     @logger.catch
     def CreateCategoryBrand(self, request: goods_pb2.CategoryBrandRequest, context):
@@ -641,6 +1088,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
             category = Category.get(request.categoryId)
             category_brand.category = category
             category_brand.save()
+            category_brands_cache.invalidate(category.id)
 
             rsp = goods_pb2.CategoryBrandResponse()
             rsp.id = category_brand.id  # 另外一种思路  前端传递回来  我们就没必要原样的数据再返回过去  自己回显即可
@@ -660,6 +1108,7 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
         try:
             category_brand = GoodsCategoryBrand.get(request.id)
             category_brand.delete_instance()
+            category_brands_cache.invalidate(category_brand.category_id)
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -671,11 +1120,13 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
     def UpdateCategoryBrand(self, request: goods_pb2.CategoryBrandRequest, context):
         try:
             category_brand = GoodsCategoryBrand.get(request.id)
+            old_category_id = category_brand.category_id
             brand = Brands.get(request.brandId)                     # 查询 是否 有 brand 这条数据
             category_brand.brand = brand                            # 修改 brand
             category = Category.get(request.categoryId)             # 查询 是否 有 category 这条数据
             category_brand.category = category                      # 修改 category
             category_brand.save()
+            category_brands_cache.invalidate(old_category_id, category.id)
 
             return empty_pb2.Empty()
         except DoesNotExist:
@@ -687,29 +1138,90 @@ class GoodsServicer(goods_pb2_grpc.GoodsServicer):
             context.set_details('内部错误')
             return empty_pb2.Empty()
 
-    @logger.catch
-    def IndexAdList(self, request: goods_pb2.IndexAdRequest, context):
-        try:
-            index_ad = IndexAd.get(IndexAd.category == request.id)
-            goods = Goods.get(index_ad.goods_id)
+    def load_index_ad_rsp(self, category_ids):
+        """
+        首页广告缓存没有命中时加载, 返回 {分类id: IndexAdResponse}
+        商品通过商品缓存获取, 三个品牌一次 in 查询; 商品或者品牌不存在的分类不返回
+        """
+        index_ads = {}
+        for index_ad in IndexAd.select().where(IndexAd.category.in_(category_ids)).order_by(IndexAd.id):
+            index_ads.setdefault(index_ad.category_id, index_ad)
+        if not index_ads:
+            return {}
+
+        goods = goods_cache.get_many([index_ad.goods_id for index_ad in index_ads.values()], self.load_goods_rsp)
+        brand_ids = {brand_id for index_ad in index_ads.values()
+                     for brand_id in (index_ad.brands_one_id, index_ad.brands_two_id, index_ad.brands_three_id)}
+        brands = {brand.id: brand for brand in Brands.select().where(Brands.id.in_(list(brand_ids)))}
+
+        rsps = {}
+        for category_id, index_ad in index_ads.items():
+            brand_ids = (index_ad.brands_one_id, index_ad.brands_two_id, index_ad.brands_three_id)
+            if index_ad.goods_id not in goods or any(brand_id not in brands for brand_id in brand_ids):
+                continue
             rsp = goods_pb2.IndexAdResponse()
-            rsp.goods.append(self.convert_goods_to_rsp(goods))
-
-            for i in range(3):
-                brands = goods_pb2.BrandInfoResponse()
-                if i == 0:
-                    brand_info = Brands.get(index_ad.brands_one_id)
-                elif i == 1:
-                    brand_info = Brands.get(index_ad.brands_two_id)
-                else:
-                    brand_info = Brands.get(index_ad.brands_three_id)
-                brands.id = brand_info.id
-                brands.name = brand_info.name
-                brands.logo = brand_info.logo
-                rsp.brands.append(brands)
-            return rsp
+            rsp.goods.append(goods[index_ad.goods_id])
+            for brand_id in brand_ids:
+                brand_rsp = rsp.brands.add()
+                brand_rsp.id = brands[brand_id].id
+                brand_rsp.name = brands[brand_id].name
+                brand_rsp.logo = brands[brand_id].logo
+            rsps[category_id] = rsp
+        return rsps
+
+    def invalidate_index_ads(self, goods_ids=None, brand_id=None):
+        # 商品或者品牌 修改/删除 后, 失效引用了它们的首页广告
+        if goods_ids is not None:
+            condition = IndexAd.goods.in_(goods_ids)
+        else:
+            condition = ((IndexAd.brands_one == brand_id) | (IndexAd.brands_two == brand_id) |
+                         (IndexAd.brands_three == brand_id))
+        category_ids = [index_ad.category_id for index_ad in IndexAd.select(IndexAd.category).where(condition)]
+        if category_ids:
+            index_ad_cache.invalidate(*category_ids)
 
-        except DoesNotExist:
+    @logger.catch
+    def IndexAdList(self, request: goods_pb2.IndexAdRequest, context):
+        # 首页广告很少变化, 整个响应按分类缓存, 缓存中的响应是共享的, 不能修改
+        rsp = index_ad_cache.get(request.id, self.load_index_ad_rsp)
+        if rsp is None:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details('记录不存在')
-            return empty_pb2.Empty()
+            return goods_pb2.IndexAdResponse()
+        return rsp
+
+    def build_home_page_rsp(self):
+        """
+        构建首页快照, 和分别调用 BannerList / GetAllCategorysList / IndexAdList / GoodsList(isHot, isNew) 的结果相同
+        """
+        rsp = goods_pb2.HomePageResponse()
+        rsp.banners.CopyFrom(self.build_banner_list_rsp())
+
+        tree = category_cache.tree()
+        rsp.categorys.CopyFrom(tree.memoize("all_categorys_rsp", lambda: self.build_category_list_rsp(tree)))
+
+        tabs = [category for category in tree.by_level(1) if category["is_tab"]]
+        index_ads = index_ad_cache.get_many([category["id"] for category in tabs], self.load_index_ad_rsp)
+        for category in tabs:
+            tab = rsp.tabs.add()
+            tab.category.id = category["id"]
+            tab.category.name = category["name"]
+            tab.category.level = category["level"]
+            tab.category.isTab = category["is_tab"]
+            if category["id"] in index_ads:
+                tab.indexAd.CopyFrom(index_ads[category["id"]])
+
+        for goods_list_rsp, request in ((rsp.hotGoods, goods_pb2.GoodsFilterRequest(isHot=True)),
+                                        (rsp.newGoods, goods_pb2.GoodsFilterRequest(isNew=True))):
+            goods, _, _ = self.filter_goods(request)
+            goods_list_rsp.total = goods.count()
+            goods_list_rsp.data.extend(self.convert_goods_row_to_rsp(row) for row in
+                                       self.goods_rows(goods).limit(settings.HOME_PAGE_GOODS_NUMS))
+
+        rsp.buildTime = int(time.time())
+        return rsp
+
+    @logger.catch
+    def HomePageSnapshot(self, request: empty_pb2.Empty, context):
+        # 首页快照由后台线程构建, 返回的是共享的对象, 不能修改
+        return home_page_snapshot.get(self.build_home_page_rsp)
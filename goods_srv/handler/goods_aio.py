@@ -0,0 +1,160 @@
+import asyncio
+
+import grpc
+from loguru import logger
+
+from goods_srv.proto import goods_pb2
+from goods_srv.model.models import *
+from goods_srv.handler.goods import GoodsServicer, count_cache
+from goods_srv.cache.category import category_cache
+from goods_srv.cache.goods import goods_cache
+from goods_srv.cache.brand import category_brands_cache
+from goods_srv.settings import settings
+from common.db.aio import AsyncDatabase
+from common.db.keyset import keyset_query, keyset_page, InvalidCursor
+
+"""
+    asyncio 模式(goods_srv_server.py --mode aio)使用的商品服务
+        1. 只读接口改成协程, 通过 aiomysql 的连接池查询数据库, 等待数据库时不占用线程, 慢请求不会让其他请求排队
+        2. 其余接口(写接口 / 批量导入 / 首页等)沿用 GoodsServicer 的同步实现, 由 grpc.aio 放到 migration_thread_pool 中执行
+    查询仍然由 GoodsServicer 中的方法构建, 只是换成 aio_db 执行, 两种模式的返回结果相同
+"""
+
+aio_db = AsyncDatabase(settings.DB, maxsize=settings.AIO_DB_POOL_SIZE)
+
+
+class AsyncGoodsServicer(GoodsServicer):
+    async def aload_goods_rsp(self, goods_ids):
+        rows = await aio_db.execute(self.goods_by_ids(goods_ids))
+        return self.goods_rows_to_rsp(rows)
+
+    async def aload_category_brands_rsp(self, category_ids):
+        category_brands = await aio_db.execute(self.category_brands_query(category_ids))
+        return self.build_category_brands_rsp(category_ids, category_brands)
+
+    # 商品接口
+    @logger.catch
+    async def GoodsList(self, request: goods_pb2.GoodsFilterRequest, context):
+        rsp = goods_pb2.GoodsListResponse()
+
+        await category_cache.tree_async(aio_db)     # 保证 filter_goods 中使用的分类树不需要再同步查询数据库
+        if request.keyWords:
+            # 搜索后端可能需要同步索引, 放到线程池中执行
+            goods, sort_field, sort_desc = await asyncio.get_running_loop().run_in_executor(
+                None, self.filter_goods, request)
+        else:
+            goods, sort_field, sort_desc = self.filter_goods(request)
+
+        start = 0
+        per_page_nums = 10
+        if request.pagePerNums:
+            per_page_nums = request.pagePerNums
+        if request.pages:
+            start = (request.pages - 1) * per_page_nums
+
+        if not request.skipTotal:
+            rsp.total = await count_cache.count_async(goods, aio_db)
+        goods = self.goods_rows(goods)
+        if request.HasField("cursor"):
+            try:
+                goods, keys = keyset_query(goods, Goods.id, request.cursor, per_page_nums, sort_field, sort_desc)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return goods_pb2.GoodsListResponse()
+            rows, rsp.nextCursor = keyset_page(goods, keys, await aio_db.execute(goods), per_page_nums)
+        else:
+            rows = await aio_db.execute(goods.limit(per_page_nums).offset(start))
+
+        rsp.data.extend(self.convert_goods_row_to_rsp(row) for row in rows)
+        return rsp
+
+    @logger.catch
+    async def BatchGetGoods(self, request: goods_pb2.BatchGoodsIdInfo, context):
+        if not self.check_goods_fields(request, context):
+            return goods_pb2.GoodsListResponse()
+        goods = await goods_cache.get_many_async(list(request.id), self.aload_goods_rsp)
+        return self.build_batch_goods_rsp(request, goods)
+
+    @logger.catch
+    async def GetGoodsDetail(self, request: goods_pb2.GoodInfoRequest, context):
+        goods = await goods_cache.get_many_async([request.id], self.aload_goods_rsp)
+        return self.build_goods_detail_rsp(request.id, goods.get(request.id), context)
+
+    async def GoodsExport(self, request: goods_pb2.GoodsExportRequest, context):
+        # 客户端断开时 grpc.aio 会取消这个协程, 不需要再检查连接状态
+        # 注意: logger.catch 不支持异步生成器, 加上后 grpc 会把它当成同步的接口
+        last_id = request.startId
+        while True:
+            chunk = await aio_db.execute(self.export_goods_chunk(request, last_id))
+            for good in chunk:
+                yield self.convert_export_goods_to_rsp(good)
+            if len(chunk) < settings.BULK_CHUNK_SIZE:
+                break
+            last_id = chunk[-1].id
+
+    # 商品分类: 分类树在内存中, 先异步检查版本号(需要时异步重建), 再直接复用同步的实现
+    @logger.catch
+    async def GetAllCategorysList(self, request, context):
+        await category_cache.tree_async(aio_db)
+        return super().GetAllCategorysList(request, context)
+
+    @logger.catch
+    async def GetCategorysList(self, request, context):
+        await category_cache.tree_async(aio_db)
+        return super().GetCategorysList(request, context)
+
+    @logger.catch
+    async def GetSubCategory(self, request, context):
+        await category_cache.tree_async(aio_db)
+        return super().GetSubCategory(request, context)
+
+    # 品牌
+    @logger.catch
+    async def BrandList(self, request: goods_pb2.BrandFilterRequest, context):
+        rsp = goods_pb2.BrandListResponse()
+        brands = Brands.select()
+
+        start = 0
+        per_page_nums = 10
+        if request.pagePerNums:
+            per_page_nums = request.pagePerNums
+        if request.pages:
+            start = (request.pages - 1) * per_page_nums
+
+        if not request.skipTotal:
+            rsp.total = await count_cache.count_async(brands, aio_db)
+        if request.HasField("cursor"):
+            try:
+                brands, keys = keyset_query(brands, Brands.id, request.cursor, per_page_nums)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return goods_pb2.BrandListResponse()
+            rows, rsp.nextCursor = keyset_page(brands, keys, await aio_db.execute(brands), per_page_nums)
+        else:
+            rows = await aio_db.execute(brands.limit(per_page_nums).offset(start))
+
+        for brand in rows:
+            rsp.data.append(goods_pb2.BrandInfoResponse(id=brand.id, name=brand.name, logo=brand.logo))
+        return rsp
+
+    @logger.catch
+    async def GetBrand(self, request: goods_pb2.BrandRequest, context):
+        brand = await aio_db.first(Brands.select().where(Brands.id == request.id))
+        if brand is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('记录不存在')
+            return goods_pb2.BrandInfoResponse()
+        return goods_pb2.BrandInfoResponse(id=brand.id, name=brand.name, logo=brand.logo)
+
+    @logger.catch
+    async def GetCategoryBrandList(self, request: goods_pb2.CategoryInfoRequest, context):
+        tree = await category_cache.tree_async(aio_db)
+        if tree.get(request.id) is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details('记录不存在')
+            return goods_pb2.BrandListResponse()
+
+        rsps = await category_brands_cache.get_many_async([request.id], self.aload_category_brands_rsp)
+        return rsps[request.id]
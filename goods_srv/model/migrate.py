@@ -0,0 +1,50 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from loguru import logger
+
+from goods_srv.model.models import *
+
+"""
+    数据库迁移: 补建缺少的表和 Meta.indexes 中声明的索引, 可以重复执行
+        python goods_srv/model/migrate.py          # 执行迁移
+        python goods_srv/model/migrate.py --dry    # 只打印需要执行的sql
+    create_tables 只在建表时创建索引, 已经存在的表需要通过这里补建
+"""
+
+MODELS = [Category, CategoryClosure, Brands, Goods, GoodsCategoryBrand, Banner, IndexAd, CatalogVersion]
+
+
+def missing_indexes(model):
+    # mysql 不支持 create index if not exists, 先查出表上已有的索引名
+    database = model._meta.database
+    existing = {index.name for index in database.get_indexes(model._meta.table_name)}
+    return [index for index in model._meta.fields_to_index() if index._name not in existing]
+
+
+def migrate(models=MODELS, dry=False):
+    database = models[0]._meta.database
+    missing_tables = [model for model in models if not model.table_exists()]
+    for model in missing_tables:
+        logger.info(f"新建表: {model._meta.table_name}")
+    if not dry:
+        database.create_tables(missing_tables)
+
+    for model in models:
+        if model in missing_tables:     # 新建的表已经带上了索引
+            continue
+        for index in missing_indexes(model):
+            query = model._schema._create_index(index, safe=False)
+            logger.info(f"新建索引: {database.get_sql_context().sql(query).query()[0]}")
+            if not dry:
+                database.execute(query)
+
+    if not dry and CategoryClosure.rebuild_if_stale():     # 根据已有的分类生成闭包表
+        logger.info("分类闭包表已生成")
+
+
+if __name__ == '__main__':
+    migrate(dry="--dry" in sys.argv)
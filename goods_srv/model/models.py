@@ -53,6 +53,99 @@ class Category(BaseModel):
     is_tab = BooleanField(default=False, verbose_name="是否显示首页")
 
 
+class CategoryClosure(Model):
+    """
+    分类的闭包表  每个分类和它的每一个祖先(包括自己, depth 为 0)各一行
+    查询某个分类下任意层级的商品只需要一次join: goods.category_id = descendant and ancestor = 分类id
+    由分类的新建/修改/删除维护, 记录直接物理删除, 所以不继承 BaseModel
+    """
+    ancestor = ForeignKeyField(Category, backref="descendant_links", verbose_name="祖先分类")
+    descendant = ForeignKeyField(Category, backref="ancestor_links", verbose_name="子孙分类")
+    depth = IntegerField(default=0, verbose_name="相隔的层数")
+
+    class Meta:
+        database = settings.DB
+        primary_key = CompositeKey("ancestor", "descendant")
+
+    @classmethod
+    def subtree_ids(cls, category_id):
+        return [row.descendant_id for row in cls.select(cls.descendant).where(cls.ancestor == category_id)]
+
+    @classmethod
+    def add(cls, category_id, parent_id=None):
+        # 新建分类: 自己 + 父分类的所有祖先
+        rows = [{"ancestor": category_id, "descendant": category_id, "depth": 0}]
+        if parent_id:
+            rows.extend({"ancestor": row.ancestor_id, "descendant": category_id, "depth": row.depth + 1}
+                        for row in cls.select(cls.ancestor, cls.depth).where(cls.descendant == parent_id))
+        cls.insert_many(rows).execute()
+
+    @classmethod
+    def detach(cls, category_id):
+        """
+        断开分类(连同它的子孙)和原来所有祖先的关系, 子树内部的关系保留
+        mysql 不允许 delete 的子查询中引用同一张表, 所以先查出子树的id
+        """
+        subtree_ids = cls.subtree_ids(category_id)
+        if subtree_ids:
+            cls.delete().where(cls.descendant.in_(subtree_ids) & cls.ancestor.not_in(subtree_ids)).execute()
+        return subtree_ids
+
+    @classmethod
+    def remove(cls, category_id):
+        # 删除分类: 子分类和祖先断开, 再删除和这个分类自己相关的记录
+        cls.detach(category_id)
+        cls.delete().where((cls.ancestor == category_id) | (cls.descendant == category_id)).execute()
+
+    @classmethod
+    def move(cls, category_id, parent_id):
+        """
+        修改父分类: 整棵子树挂到新的父分类下
+        新的父分类是自己或者自己的子孙时抛出 ValueError
+        """
+        subtree = [(row.descendant_id, row.depth) for row in
+                   cls.select(cls.descendant, cls.depth).where(cls.ancestor == category_id)]
+        if parent_id in {descendant_id for descendant_id, _ in subtree}:
+            raise ValueError("不能把分类移动到自己或者自己的子分类下")
+
+        cls.detach(category_id)
+        if parent_id:
+            parents = cls.select(cls.ancestor, cls.depth).where(cls.descendant == parent_id)
+            rows = [{"ancestor": parent.ancestor_id, "descendant": descendant_id, "depth": parent.depth + depth + 1}
+                    for parent in parents for descendant_id, depth in subtree]
+            if rows:
+                cls.insert_many(rows).execute()
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        # 根据分类表重新生成整个闭包表, 用于初始化已有的数据
+        parents = {category.id: category.parent_category_id
+                   for category in Category.select(Category.id, Category.parent_category)}
+        rows = []
+        for category_id in parents:
+            ancestor_id, depth = category_id, 0
+            while ancestor_id in parents and depth <= len(parents):    # depth 的限制防止脏数据中有环
+                rows.append({"ancestor": ancestor_id, "descendant": category_id, "depth": depth})
+                ancestor_id, depth = parents[ancestor_id], depth + 1
+
+        with cls._meta.database.atomic():
+            cls.delete().execute()
+            for i in range(0, len(rows), batch_size):
+                cls.insert_many(rows[i:i + batch_size]).execute()
+
+    @classmethod
+    def rebuild_if_stale(cls):
+        """
+        服务启动时检查: 每个分类都有一条 depth 为 0 的记录, 数量和分类数对不上时(比如刚部署 还没有生成过)重新生成
+        返回是否重新生成了
+        """
+        cls.create_table(safe=True)
+        if cls.select().where(cls.depth == 0).count() == Category.select().count():
+            return False
+        cls.rebuild()
+        return True
+
+
 class Brands(BaseModel):
     """
     品牌
@@ -83,6 +176,20 @@ class Goods(BaseModel):
     is_new = BooleanField(default=False, verbose_name="是否新品")
     is_hot = BooleanField(default=False, verbose_name="是否热销")
 
+    class Meta:
+        # GoodsList 的过滤条件组合, 已有的数据库通过 model/migrate.py 补建
+        indexes = (
+            # 按价格排序的游标分页
+            (("shop_price", "id"), False),
+            # 分类(闭包表join) / 品牌 / 热销 / 新品 过滤, 再加上价格区间 或者 按价格排序
+            (("category", "is_deleted", "shop_price"), False),
+            (("brand", "is_deleted", "shop_price"), False),
+            (("is_hot", "is_deleted", "shop_price"), False),
+            (("is_new", "is_deleted", "shop_price"), False),
+            # 按销量排序(热销榜)的游标分页
+            (("sold_num", "id"), False),
+        )
+
 
 class GoodsCategoryBrand(BaseModel):
     """
@@ -119,8 +226,43 @@ class IndexAd(BaseModel):
     brands_three = ForeignKeyField(Brands, verbose_name="品牌3")
 
 
+class CatalogVersion(BaseModel):
+    """
+    商品目录的版本号  分类等数据变更时递增, 多个副本据此判断本地缓存是否过期
+    """
+    name = CharField(max_length=50, unique=True, verbose_name="缓存名称")
+    version = IntegerField(default=0, verbose_name="版本号")
+
+    @classmethod
+    def current(cls, name):
+        try:
+            return cls.get(cls.name == name).version
+        except DoesNotExist:
+            return 0
+        except DatabaseError:
+            # 还没有执行 model/migrate.py 时没有这张表, 当作版本 0
+            if not cls.table_exists():
+                return 0
+            raise
+
+    @classmethod
+    def bump(cls, name):
+        # 直接在数据库中自增, 避免多个副本同时修改时丢失更新
+        try:
+            rows = cls.update(version=cls.version + 1, update_time=datetime.now()).where(cls.name == name).execute()
+        except DatabaseError:
+            # 没有表时先建表, 否则其他副本感知不到这次修改
+            if cls.table_exists():
+                raise
+            cls.create_table(safe=True)
+            rows = 0
+        if not rows:
+            cls.insert(name=name, version=1).on_conflict_ignore().execute()
+
+
 if __name__ == '__main__':
-    settings.DB.create_tables([Category, Brands, Goods, GoodsCategoryBrand, Banner, IndexAd])
+    settings.DB.create_tables([Category, CategoryClosure, Brands, Goods, GoodsCategoryBrand, Banner, IndexAd, CatalogVersion])
+    CategoryClosure.rebuild()   # 根据已有的分类生成闭包表
     index_ad = IndexAd.get(IndexAd.category == 135200)
     print(index_ad.id)
     # c1 = Category(name="bobby1", level=1)
@@ -45,6 +45,16 @@ class GoodsStub(object):
                 request_serializer=goods__pb2.GoodInfoRequest.SerializeToString,
                 response_deserializer=goods__pb2.GoodsInfoResponse.FromString,
                 )
+        self.BulkUpsertGoods = channel.stream_stream(
+                '/Goods/BulkUpsertGoods',
+                request_serializer=goods__pb2.CreateGoodsInfo.SerializeToString,
+                response_deserializer=goods__pb2.BulkUpsertGoodsResponse.FromString,
+                )
+        self.GoodsExport = channel.unary_stream(
+                '/Goods/GoodsExport',
+                request_serializer=goods__pb2.GoodsExportRequest.SerializeToString,
+                response_deserializer=goods__pb2.GoodsInfoResponse.FromString,
+                )
         self.GetAllCategorysList = channel.unary_unary(
                 '/Goods/GetAllCategorysList',
                 request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
@@ -150,6 +160,11 @@ class GoodsStub(object):
                 request_serializer=goods__pb2.IndexAdRequest.SerializeToString,
                 response_deserializer=goods__pb2.IndexAdResponse.FromString,
                 )
+        self.HomePageSnapshot = channel.unary_unary(
+                '/Goods/HomePageSnapshot',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=goods__pb2.HomePageResponse.FromString,
+                )
 
 
 class GoodsServicer(object):
@@ -198,6 +213,20 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BulkUpsertGoods(self, request_iterator, context):
+        """批量导入 商品, 有id的更新 没有id的新增
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GoodsExport(self, request, context):
+        """按id顺序导出全部(或者增量的)商品
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetAllCategorysList(self, request, context):
         """商品分类
         获取所有分类列表
@@ -349,6 +378,13 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def HomePageSnapshot(self, request, context):
+        """首页: 轮播图 + 全部分类 + 每个首页分类的广告 + 热销/新品商品, 由后台预先构建好
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GoodsServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -382,6 +418,16 @@ def add_GoodsServicer_to_server(servicer, server):
                     request_deserializer=goods__pb2.GoodInfoRequest.FromString,
                     response_serializer=goods__pb2.GoodsInfoResponse.SerializeToString,
             ),
+            'BulkUpsertGoods': grpc.stream_stream_rpc_method_handler(
+                    servicer.BulkUpsertGoods,
+                    request_deserializer=goods__pb2.CreateGoodsInfo.FromString,
+                    response_serializer=goods__pb2.BulkUpsertGoodsResponse.SerializeToString,
+            ),
+            'GoodsExport': grpc.unary_stream_rpc_method_handler(
+                    servicer.GoodsExport,
+                    request_deserializer=goods__pb2.GoodsExportRequest.FromString,
+                    response_serializer=goods__pb2.GoodsInfoResponse.SerializeToString,
+            ),
             'GetAllCategorysList': grpc.unary_unary_rpc_method_handler(
                     servicer.GetAllCategorysList,
                     request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
@@ -487,6 +533,11 @@ def add_GoodsServicer_to_server(servicer, server):
                     request_deserializer=goods__pb2.IndexAdRequest.FromString,
                     response_serializer=goods__pb2.IndexAdResponse.SerializeToString,
             ),
+            'HomePageSnapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.HomePageSnapshot,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=goods__pb2.HomePageResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'Goods', rpc_method_handlers)
@@ -599,6 +650,40 @@ class Goods(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def BulkUpsertGoods(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/Goods/BulkUpsertGoods',
+            goods__pb2.CreateGoodsInfo.SerializeToString,
+            goods__pb2.BulkUpsertGoodsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GoodsExport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/Goods/GoodsExport',
+            goods__pb2.GoodsExportRequest.SerializeToString,
+            goods__pb2.GoodsInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetAllCategorysList(request,
             target,
@@ -955,3 +1040,20 @@ class Goods(object):
             goods__pb2.IndexAdResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def HomePageSnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/Goods/HomePageSnapshot',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            goods__pb2.HomePageResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
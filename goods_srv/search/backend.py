@@ -0,0 +1,114 @@
+import abc
+import importlib
+import threading
+from datetime import timedelta
+
+from loguru import logger
+
+from goods_srv.model.models import BaseModel, Goods
+from goods_srv.search.inverted_index import InvertedIndex
+from goods_srv.settings import settings
+
+
+class SearchBackend(metaclass=abc.ABCMeta):
+    """
+    商品搜索后端, GoodsList 用 search 返回的商品id 和其他过滤条件取交集
+    """
+
+    @abc.abstractmethod
+    def search(self, keywords, limit=None):     # 按相关度排序的商品id列表
+        pass
+
+    @abc.abstractmethod
+    def index(self, goods):     # 新增 或 更新 商品
+        pass
+
+    @abc.abstractmethod
+    def remove(self, goods_id):     # 删除 商品
+        pass
+
+    def start(self):    # 服务启动时调用, 需要后台同步的后端在这里启动
+        pass
+
+    def stop(self):
+        pass
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    默认的搜索后端: 进程内的倒排索引
+        1. start 之后由后台线程从数据库加载全部商品的 name 和 goods_brief
+        2. 本进程的新增/修改/删除 通过 index 和 remove 立即生效
+        3. 后台线程每隔 sync_interval 秒按 update_time 增量同步其他副本的修改 (逻辑删除也会更新 update_time)
+           update_time 是写入方在提交之前取的本机时间, 晚提交的行可能比已经同步到的 update_time 更早,
+           所以每次从 watermark 往前 sync_window 秒(至少 sync_interval 秒)开始查询, 重复索引同一个商品没有影响
+    search 只读取当前的索引, 不等待同步; 第一次加载完成之前搜索到的是已经加载的部分
+    """
+
+    def __init__(self, sync_interval=10, sync_window=60):
+        self.sync_interval = sync_interval
+        self.sync_window = timedelta(seconds=max(sync_interval, sync_window))
+        self.inverted_index = InvertedIndex()
+        self._watermark = None      # 已经同步到的 update_time
+        self._lock = threading.Lock()   # 保证同一时间只有一个线程在同步
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def sync(self):
+        with self._lock:
+            # 需要包含逻辑删除的商品, 所以不能用 BaseModel.select
+            query = super(BaseModel, Goods).select(Goods.id, Goods.name, Goods.goods_brief,
+                                                   Goods.is_deleted, Goods.update_time)
+            if self._watermark is not None:
+                query = query.where(Goods.update_time >= self._watermark - self.sync_window)
+
+            changed = 0
+            for goods in query.iterator():
+                if goods.is_deleted:
+                    self.inverted_index.remove(goods.id)
+                else:
+                    self.inverted_index.add(goods.id, name=goods.name, goods_brief=goods.goods_brief)
+                if self._watermark is None or goods.update_time > self._watermark:
+                    self._watermark = goods.update_time
+                changed += 1
+
+            if changed:
+                logger.info(f"搜索索引同步了 {changed} 个商品, 当前商品数: {len(self.inverted_index)}")
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.exception(f"同步搜索索引失败, 稍后重试: {e}")
+            if self._stopped.wait(self.sync_interval):
+                break
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def search(self, keywords, limit=None):
+        return self.inverted_index.search(keywords, limit=limit)
+
+    def index(self, goods):
+        self.inverted_index.add(goods.id, name=goods.name, goods_brief=goods.goods_brief)
+
+    def remove(self, goods_id):
+        self.inverted_index.remove(goods_id)
+
+
+def load_backend(path, **kwargs):
+    """
+    path: 搜索后端类的完整路径, 比如 goods_srv.search.backend.InvertedIndexBackend
+    """
+    module_name, class_name = path.rsplit(".", 1)
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(**kwargs)
+
+
+search_backend = load_backend(settings.SEARCH_BACKEND, **settings.SEARCH_OPTIONS)
@@ -0,0 +1,121 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+"""
+    进程内的倒排索引, 不依赖数据库, 可以直接用本地的语料测试
+    分词规则:
+        英文和数字: 按单词切分, 搜索时按前缀匹配 (iph 可以搜到 iphone)
+        中文: 相邻两个字切成一个词(bigram), 索引时额外保存单字, 这样搜索单个字也能命中
+"""
+
+TOKEN_RE = re.compile(r"[0-9a-z]+|[\u3400-\u4dbf\u4e00-\u9fff]+")
+
+
+def is_cjk(token):
+    return "\u3400" <= token[0] <= "\u9fff"
+
+
+def tokenize(text, unigrams=False):
+    """
+    unigrams: 中文是否同时返回单字, 建索引时使用
+    """
+    tokens = []
+    for word in TOKEN_RE.findall(text.lower()):
+        if not is_cjk(word) or len(word) == 1:
+            tokens.append(word)
+            continue
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        if unigrams:
+            tokens.extend(word)
+    return tokens
+
+
+class InvertedIndex:
+    """
+    postings: 词 -> {文档id: 权重}, 权重 = 词频 * 字段权重
+    """
+
+    def __init__(self, field_weights=None):
+        self.field_weights = field_weights or {"name": 2.0, "goods_brief": 1.0}
+        self.postings = defaultdict(dict)
+        self.doc_tokens = {}        # 文档id -> 词的集合, 删除文档时使用
+        self._words = []            # 排好序的英文单词, 用来做前缀匹配
+        self._words_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def add(self, doc_id, **fields):
+        weights = defaultdict(float)
+        for field, text in fields.items():
+            for token in tokenize(text or "", unigrams=True):
+                weights[token] += self.field_weights.get(field, 1.0)
+
+        with self._lock:
+            self._remove(doc_id)
+            for token, weight in weights.items():
+                if token not in self.postings and not is_cjk(token):
+                    self._words_dirty = True
+                self.postings[token][doc_id] = weight
+            self.doc_tokens[doc_id] = set(weights)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for token in self.doc_tokens.pop(doc_id, ()):
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[token]
+                self._words_dirty = self._words_dirty or not is_cjk(token)
+
+    def _expand(self, token):
+        # 英文按前缀匹配, 中文按整个词匹配
+        if is_cjk(token):
+            return [token] if token in self.postings else []
+        if self._words_dirty:
+            self._words = sorted(word for word in self.postings if not is_cjk(word))
+            self._words_dirty = False
+        matched = []
+        for i in range(bisect_left(self._words, token), len(self._words)):
+            if not self._words[i].startswith(token):
+                break
+            matched.append(self._words[i])
+        return matched
+
+    def search(self, text, limit=None):
+        """
+        返回按相关度从高到低排序的文档id, 所有关键词都要命中
+        """
+        tokens = list(dict.fromkeys(tokenize(text)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            total = len(self.doc_tokens)
+            scores = None
+            for token in tokens:
+                token_scores = defaultdict(float)
+                for word in self._expand(token):
+                    docs = self.postings[word]
+                    idf = math.log(1 + total / len(docs))
+                    for doc_id, weight in docs.items():
+                        token_scores[doc_id] += weight * idf
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {doc_id: score + token_scores[doc_id]
+                              for doc_id, score in scores.items() if doc_id in token_scores}
+                if not scores:
+                    return []
+
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return ranked[:limit] if limit else ranked
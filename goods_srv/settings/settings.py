@@ -1,10 +1,13 @@
 import json
 
 import nacos
+import redis
 from playhouse.pool import PooledMySQLDatabase
 from playhouse.shortcuts import ReconnectMixin
 from loguru import logger
 
+from common.db.count import CountCache
+
 
 # 使用peewee的连接池, 使用ReconnectMixin来防止出现连接断开查询失败
 class ReconnectMysqlDatabase(PooledMySQLDatabase, ReconnectMixin):
@@ -42,6 +45,64 @@ CONSUL_PORT = data["consul"]["port"]
 SERVICE_NAME = data["name"]
 SERVICE_TAGS = data["tags"]
 
+# 缓存相关的配置
+CACHE = data.get("cache", {})
+# 多久(秒)去数据库检查一次分类的版本号, 其他副本修改了分类后 本地缓存最迟在这个时间后失效
+CATEGORY_VERSION_CHECK_INTERVAL = CACHE.get("category_version_check_interval", 5)
+# 列表接口总数的缓存, 配置项见 CountCache.from_config
+COUNT_CACHE = CountCache.from_config(data)
+# 热点商品详情的缓存: 进程内最多缓存多少个商品 以及缓存时间(秒), redis 中的缓存时间(秒)
+GOODS_CACHE_SIZE = CACHE.get("goods_size", 10000)
+GOODS_CACHE_TTL = CACHE.get("goods_ttl", 10)
+GOODS_CACHE_REDIS_TTL = CACHE.get("goods_redis_ttl", 300)
+# 分类下的品牌列表的缓存: 进程内最多缓存多少个分类 以及缓存时间(秒), redis 中的缓存时间(秒)
+CATEGORY_BRANDS_CACHE_SIZE = CACHE.get("category_brands_size", 1000)
+CATEGORY_BRANDS_CACHE_TTL = CACHE.get("category_brands_ttl", 60)
+CATEGORY_BRANDS_CACHE_REDIS_TTL = CACHE.get("category_brands_redis_ttl", 300)
+# 首页分类广告的缓存: 进程内最多缓存多少个分类 以及缓存时间(秒), redis 中的缓存时间(秒)
+INDEX_AD_CACHE_SIZE = CACHE.get("index_ad_size", 1000)
+INDEX_AD_CACHE_TTL = CACHE.get("index_ad_ttl", 60)
+INDEX_AD_CACHE_REDIS_TTL = CACHE.get("index_ad_redis_ttl", 3600)
+# 首页快照: 多久(秒)检查一次是否需要重建, 最长多久(秒)重建一次, 热销/新品各返回多少个商品
+HOME_PAGE_CHECK_INTERVAL = CACHE.get("home_page_check_interval", 5)
+HOME_PAGE_MAX_AGE = CACHE.get("home_page_max_age", 60)
+HOME_PAGE_GOODS_NUMS = CACHE.get("home_page_goods_nums", 10)
+# 多久(秒)在日志中输出一次缓存的命中统计, 0 表示不输出
+CACHE_STATS_INTERVAL = CACHE.get("stats_interval", 60)
+
+# redis的配置(可选), 配置了才会启用 redis 这一级缓存
+REDIS_CLIENT = None
+if data.get("redis"):
+    pool = redis.ConnectionPool(host=data["redis"]["host"], port=data["redis"]["port"], db=data["redis"].get("db", 0))
+    REDIS_CLIENT = redis.StrictRedis(connection_pool=pool)
+
+# 商品搜索的配置, 默认使用进程内的倒排索引
+SEARCH = data.get("search", {})
+SEARCH_BACKEND = SEARCH.get("backend", "goods_srv.search.backend.InvertedIndexBackend")
+SEARCH_OPTIONS = SEARCH.get("options", {"sync_interval": 10, "sync_window": 60})     # 传给搜索后端的参数
+SEARCH_MAX_RESULTS = SEARCH.get("max_results", 1000)              # 和其他过滤条件取交集后 最多返回多少个相关的商品
+
+# 商品点击数先在内存中累加, 每隔 interval 秒(或者缓冲的商品数超过 max_size 时)批量写入数据库
+COUNTER = data.get("counter", {})
+CLICK_FLUSH_INTERVAL = COUNTER.get("click_flush_interval", 5)
+CLICK_BUFFER_SIZE = COUNTER.get("click_buffer_size", 10000)
+# 销量和收藏数(由订单支付和收藏的消息累加)的批量写入
+GOODS_NUM_FLUSH_INTERVAL = COUNTER.get("goods_num_flush_interval", 10)
+GOODS_NUM_BUFFER_SIZE = COUNTER.get("goods_num_buffer_size", 10000)
+
+# rocketmq的配置(可选), 配置了才会消费订单支付和收藏的消息来统计销量和收藏数
+ROCKETMQ_HOST = data.get("rocketmq", {}).get("host")
+ROCKETMQ_PORT = data.get("rocketmq", {}).get("port")
+
+# 批量导入/导出商品时 每批处理多少个商品
+BULK = data.get("bulk", {})
+BULK_CHUNK_SIZE = BULK.get("chunk_size", 500)
+
+# asyncio 模式(--mode aio)的配置: aiomysql 连接池的大小, 以及执行同步接口(写接口等)的线程数
+AIO = data.get("aio", {})
+AIO_DB_POOL_SIZE = AIO.get("db_pool_size", 50)
+AIO_MIGRATION_WORKERS = AIO.get("migration_workers", 10)
+
 DB = ReconnectMysqlDatabase(data["mysql"]["db"],
                             host=data["mysql"]["host"],
                             port=data["mysql"]["port"],
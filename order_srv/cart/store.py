@@ -0,0 +1,218 @@
+from collections import namedtuple
+from datetime import datetime
+
+from loguru import logger
+from peewee import Case, fn
+
+from order_srv.model.models import ShoppingCart
+from order_srv.settings import settings
+from common.db.write_behind import WriteBehindCounter
+
+# 购物车中的一个商品, redis 中没有行id, 用商品id作为 id
+CartItem = namedtuple("CartItem", ["id", "user", "goods", "nums", "checked"])
+
+
+class MysqlCartStore:
+    """
+    默认的购物车存储: 直接读写 mysql 的 shopping_cart 表
+    """
+    transactional = True    # remove 在下单的数据库事务中执行, 随订单一起回滚
+
+    def items(self, user_id):
+        return [CartItem(item.id, item.user, item.goods, item.nums, item.checked)
+                for item in ShoppingCart.select().where(ShoppingCart.user == user_id)]
+
+    def checked_items(self, user_id):
+        return [item for item in self.items(user_id) if item.checked]
+
+    def add(self, user_id, goods_id, nums):
+        """
+        一条 insert ... on duplicate key update 完成新增或者合并, 并发加入同一个商品时数量不会丢失, 返回购物车记录的id
+        记录已经被逻辑删除时 相当于重新加入: 数量重置, 重新选中
+        mysql 按顺序执行 update 中的赋值, is_deleted 必须放在用到它的赋值之后
+        """
+        restored = ShoppingCart.is_deleted == True
+        return ShoppingCart.insert(user=user_id, goods=goods_id, nums=nums).on_conflict(update={
+            ShoppingCart.nums: Case(None, [(restored, nums)], ShoppingCart.nums + nums),
+            ShoppingCart.checked: Case(None, [(restored, True)], ShoppingCart.checked),
+            ShoppingCart.is_deleted: False,
+            ShoppingCart.update_time: datetime.now(),
+            # 更新已有的记录时 让 lastrowid 返回这条记录的id
+            ShoppingCart.id: fn.LAST_INSERT_ID(ShoppingCart.id),
+        }).execute()
+
+    def update(self, user_id, goods_id, nums, checked):
+        # 记录不存在时返回 False
+        item = ShoppingCart.get_or_none(ShoppingCart.user == user_id, ShoppingCart.goods == goods_id)
+        if item is None:
+            return False
+        item.checked = checked
+        if nums:
+            item.nums = nums
+        item.save()
+        return True
+
+    def delete(self, user_id, goods_id):
+        item = ShoppingCart.get_or_none(ShoppingCart.user == user_id, ShoppingCart.goods == goods_id)
+        if item is None:
+            return False
+        item.delete_instance()
+        return True
+
+    def remove(self, user_id, goods_ids):
+        # 下单成功后删除已经购买的商品, 在下单的数据库事务中执行
+        ShoppingCart.delete().where(ShoppingCart.user == user_id, ShoppingCart.goods.in_(goods_ids)).execute()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class RedisCartStore:
+    """
+    每个用户的购物车是一个 redis hash: order_srv:cart:{user_id}
+        n:{goods_id} -> 购买数量 (HINCRBY 原子累加)    c:{goods_id} -> 是否选中 1/0
+        _loaded      -> 已经从 mysql 加载过 (区分 空购物车 和 还没有加载)
+    redis 是购物车的主存储, 修改过的 (user, goods) 由 WriteBehindCounter 记下, 后台线程按 redis 中的最新状态批量写入 mysql
+    redis 中没有某个用户的购物车时(比如 redis 数据丢失), 先从 mysql 加载
+    """
+    transactional = False   # 不随数据库事务回滚, 下单时要在事务提交之后才能 remove
+
+    def __init__(self, redis_client, flush_interval=5, buffer_size=10000):
+        self.redis = redis_client
+        self.dirty = WriteBehindCounter(self.persist, interval=flush_interval, max_size=buffer_size)
+
+    def _key(self, user_id):
+        return f"order_srv:cart:{user_id}"
+
+    def _ensure_loaded(self, user_id):
+        key = self._key(user_id)
+        if self.redis.exists(key):
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for item in ShoppingCart.select().where(ShoppingCart.user == user_id):
+            # HSETNX: 加载期间其他请求已经写入的字段不覆盖
+            pipe.hsetnx(key, f"n:{item.goods}", item.nums)
+            pipe.hsetnx(key, f"c:{item.goods}", int(item.checked))
+        pipe.hsetnx(key, "_loaded", 1)
+        pipe.execute()
+
+    def items(self, user_id):
+        self._ensure_loaded(user_id)
+        fields = {field.decode(): value for field, value in self.redis.hgetall(self._key(user_id)).items()}
+        items = []
+        for field, nums in fields.items():
+            if field.startswith("n:"):
+                goods_id = int(field[2:])
+                items.append(CartItem(goods_id, user_id, goods_id, int(nums), fields.get(f"c:{goods_id}", b"1") == b"1"))
+        return sorted(items, key=lambda item: item.goods)
+
+    def checked_items(self, user_id):
+        return [item for item in self.items(user_id) if item.checked]
+
+    def add(self, user_id, goods_id, nums):
+        self._ensure_loaded(user_id)
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self._key(user_id), f"n:{goods_id}", nums)
+        pipe.hsetnx(self._key(user_id), f"c:{goods_id}", 1)    # 新加入的商品默认选中
+        pipe.execute()
+        self.dirty.incr((user_id, goods_id))
+        return goods_id
+
+    def update(self, user_id, goods_id, nums, checked):
+        self._ensure_loaded(user_id)
+        key = self._key(user_id)
+        if not self.redis.hexists(key, f"n:{goods_id}"):
+            return False
+        mapping = {f"c:{goods_id}": int(checked)}
+        if nums:
+            mapping[f"n:{goods_id}"] = nums
+        self.redis.hset(key, mapping=mapping)
+        self.dirty.incr((user_id, goods_id))
+        return True
+
+    def delete(self, user_id, goods_id):
+        self._ensure_loaded(user_id)
+        if not self.redis.hdel(self._key(user_id), f"n:{goods_id}", f"c:{goods_id}"):
+            return False
+        self.dirty.incr((user_id, goods_id))
+        return True
+
+    def remove(self, user_id, goods_ids):
+        if not goods_ids:
+            return
+        fields = [field for goods_id in goods_ids for field in (f"n:{goods_id}", f"c:{goods_id}")]
+        self.redis.hdel(self._key(user_id), *fields)
+        for goods_id in goods_ids:
+            self.dirty.incr((user_id, goods_id))
+
+    def persist(self, deltas):
+        """
+        把修改过的 (user, goods) 按 redis 中的最新状态写入 mysql: 不存在的逻辑删除, 新的批量插入, 变化的更新
+        同一个商品在两次写入之间修改多次也只写一次
+        用户的 hash 已经不在 redis 中时(被淘汰 / redis 重启或清空)跳过, 不能当成商品被删除:
+        这时 mysql 中的记录是唯一的副本, 下次访问会从 mysql 重新加载
+        """
+        dirty_keys = list(deltas)
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, goods_id in dirty_keys:
+            # _loaded 和商品的字段在同一个命令中读取, 判断 hash 是否还在
+            pipe.hmget(self._key(user_id), "_loaded", f"n:{goods_id}", f"c:{goods_id}")
+        keys, states = [], []
+        for key, (loaded, nums, checked) in zip(dirty_keys, pipe.execute()):
+            if loaded is not None:
+                keys.append(key)
+                states.append((nums, checked))
+        lost = len(dirty_keys) - len(keys)
+        if lost:
+            logger.warning(f"购物车写入mysql: {lost} 个商品所在的购物车已经不在redis中, 保留mysql中的记录")
+        if not keys:
+            return
+
+        rows = {}
+        for row in ShoppingCart.select().where(ShoppingCart.user.in_({user_id for user_id, _ in keys})):
+            rows[(row.user, row.goods)] = row
+
+        inserts, deleted_ids = [], []
+        with settings.DB.atomic():
+            for (user_id, goods_id), (nums, checked) in zip(keys, states):
+                row = rows.get((user_id, goods_id))
+                if nums is None:
+                    if row is not None:
+                        deleted_ids.append(row.id)
+                    continue
+                nums, checked = int(nums), checked != b"0"
+                if row is None:
+                    inserts.append({"user": user_id, "goods": goods_id, "nums": nums, "checked": checked})
+                elif row.nums != nums or row.checked != checked:
+                    ShoppingCart.update(nums=nums, checked=checked, update_time=datetime.now()).where(
+                        ShoppingCart.id == row.id).execute()
+            if deleted_ids:
+                ShoppingCart.delete().where(ShoppingCart.id.in_(deleted_ids)).execute()
+            if inserts:
+                # 没有查到的记录也可能是逻辑删除的, 和唯一索引冲突时恢复
+                ShoppingCart.insert_many(inserts).on_conflict(
+                    preserve=[ShoppingCart.nums, ShoppingCart.checked],
+                    update={ShoppingCart.is_deleted: False, ShoppingCart.update_time: datetime.now()},
+                ).execute()
+        logger.info(f"购物车写入mysql: 新增 {len(inserts)}, 删除 {len(deleted_ids)}, 共 {len(keys)} 个商品")
+
+    def start(self):
+        self.dirty.start()
+
+    def stop(self):
+        self.dirty.stop()
+
+
+def create_cart_store():
+    if settings.CART_BACKEND == "redis":
+        if settings.REDIS_CLIENT is None:
+            raise ValueError("购物车使用redis存储时需要配置redis")
+        return RedisCartStore(settings.REDIS_CLIENT, flush_interval=settings.CART_FLUSH_INTERVAL,
+                              buffer_size=settings.CART_BUFFER_SIZE)
+    return MysqlCartStore()
+
+
+cart_store = create_cart_store()
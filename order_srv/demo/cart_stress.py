@@ -0,0 +1,61 @@
+import argparse
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import consul
+import grpc
+
+from order_srv.proto import order_pb2, order_pb2_grpc
+from order_srv.settings import settings
+
+"""
+    并发加入购物车的压测: 同一个用户的同一个商品 并发调用 --parallel 次 CreateCartItem(nums=1), 检查结果
+        python demo/cart_stress.py --parallel 200
+        python demo/cart_stress.py --target 127.0.0.1:50051     # 不通过consul查找订单服务
+    以前先查询再 save 的实现, 并发时会丢失数量或者产生重复的记录;
+    insert ... on duplicate key update 之后 购物车中应该只有一条记录 并且数量等于并发的次数
+"""
+
+
+def find_target():
+    c = consul.Consul(settings.CONSUL_HOST, port=settings.CONSUL_PORT)
+    for value in c.agent.services().values():
+        if value["Service"] == settings.SERVICE_NAME:
+            return f"{value['Address']}:{value['Port']}"
+    raise Exception("没有找到订单服务")
+
+
+def main(args):
+    stub = order_pb2_grpc.OrderStub(grpc.insecure_channel(args.target or find_target()))
+    user_id = args.user or random.randint(10 ** 8, 10 ** 9)     # 默认使用一个新用户, 购物车是空的
+    before = {item.goodsId: item.nums for item in stub.CarItemList(order_pb2.UserInfo(id=user_id)).data}
+
+    barrier = threading.Barrier(args.parallel)
+
+    def add(_):
+        barrier.wait()      # 所有请求同时发出
+        return stub.CreateCartItem(order_pb2.CartItemRequest(userId=user_id, goodsId=args.goods, nums=1)).id
+
+    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+        ids = set(executor.map(add, range(args.parallel)))
+
+    rsp = stub.CarItemList(order_pb2.UserInfo(id=user_id))
+    items = [item for item in rsp.data if item.goodsId == args.goods]
+    expected = before.get(args.goods, 0) + args.parallel
+    nums = sum(item.nums for item in items)
+    print(f"用户: {user_id}, 商品: {args.goods}, 并发: {args.parallel}, 返回的记录id: {sorted(ids)}")
+    print(f"购物车记录数: {len(items)}, 数量: {nums}, 期望: {expected}")
+    if len(items) == 1 and nums == expected:
+        print("通过: 没有丢失数量, 也没有重复的记录")
+    else:
+        print(f"失败: 丢失数量 {expected - nums}, 重复的记录 {max(len(items) - 1, 0)} 条")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", default="", help="订单服务的地址, 为空时从consul查找")
+    parser.add_argument("--parallel", type=int, default=200, help="并发加入购物车的次数")
+    parser.add_argument("--user", type=int, default=0, help="用户id, 默认随机")
+    parser.add_argument("--goods", type=int, default=421, help="商品id")
+    main(parser.parse_args())
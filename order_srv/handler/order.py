@@ -1,13 +1,15 @@
 import json
+import threading
 import time
+from concurrent.futures import Future, TimeoutError
 from datetime import datetime
 
 import grpc
 from loguru import logger
 from peewee import DoesNotExist
-from google.protobuf import empty_pb2
-from rocketmq.client import TransactionMQProducer, TransactionStatus, Message, SendStatus, Producer
-from rocketmq.client import Producer, ConsumeStatus
+from google.protobuf import empty_pb2, field_mask_pb2
+from rocketmq.client import TransactionStatus, Message, SendStatus
+from rocketmq.client import ConsumeStatus
 from opentelemetry import trace
 
 from order_srv.proto import order_pb2, order_pb2_grpc
@@ -16,9 +18,67 @@ from inventory_srv.proto import inventory_pb2, inventory_pb2_grpc
 from order_srv.model.models import *
 from order_srv.settings import settings
 from common.register import consul
+from common.register.channels import ServiceChannels, ServiceUnavailable
+from common.db.keyset import keyset_paginate, InvalidCursor
+from common.mq.producer import ProducerManager
+from order_srv.cart.store import cart_store
+
+
+local_execute_dict = {}     # local_execute 执行过程中记录的下单结果, 执行结束后交给 order_results 并删除
+count_cache = settings.COUNT_CACHE
+# 订单服务的 rocketmq 生产者, 由服务启动时创建, 退出时关闭
+#   mxshop: 新建订单的事务消息(库存归还)  cancel: 订单超时的延时消息
+#   order_sender: 超时订单的库存归还消息   order_paid_sender: 订单支付成功的消息
+producers = ProducerManager(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
+PRODUCER_GROUPS = ("mxshop", "cancel", "order_sender", "order_paid_sender")
+# 到商品服务和库存服务的长连接, 实例列表由后台线程定期从consul刷新, 下单时不再访问consul
+register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)
+goods_channels = ServiceChannels(register, settings.GOODS_SRV_NAME,
+                                 refresh_interval=settings.CHANNEL_REFRESH_INTERVAL, balance=settings.CHANNEL_BALANCE)
+inventory_channels = ServiceChannels(register, settings.INVENTORY_SRV_NAME,
+                                     refresh_interval=settings.CHANNEL_REFRESH_INTERVAL, balance=settings.CHANNEL_BALANCE)
+
+
+class OrderResults:
+    """
+    在 local_execute(事务消息的本地事务回调) 和 等待下单结果的 CreateOrder 之间传递结果, 每个订单号一个 Future
+        1. CreateOrder 发送事务消息之前 register(order_sn)
+        2. local_execute 执行结束后 deliver(order_sn, 结果), 立即唤醒等待的 CreateOrder
+        3. CreateOrder 通过 wait(order_sn, timeout) 获取结果, 拿到结果或者超时后都会删除这个订单号
+    超时之后才到的结果直接丢弃
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def register(self, order_sn):
+        with self._lock:
+            self._futures[order_sn] = Future()
+
+    def deliver(self, order_sn, result):
+        with self._lock:
+            future = self._futures.get(order_sn)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def wait(self, order_sn, timeout=None):
+        # 返回 local_execute 的结果, 超时返回 None
+        with self._lock:
+            future = self._futures[order_sn]
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            return None
+        finally:
+            self.discard(order_sn)
 
+    def discard(self, order_sn):
+        with self._lock:
+            self._futures.pop(order_sn, None)
 
-local_execute_dict = {}
+
+order_results = OrderResults()
 
 
 def generate_order_sn(user_id):
@@ -50,14 +110,9 @@ def order_timeout(msg):
                 msg.set_tags("reback")
                 msg.set_body(json.dumps({"orderSn": order_sn}))
 
-                sync_producer = Producer("order_sender")    # 此处的groupid 不能和之前的重复
-                sync_producer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
-                sync_producer.start()  # 启动producer
-
-                ret = sync_producer.send_sync(msg)
+                ret = producers.send_sync("order_sender", msg)    # 此处的groupid 不能和之前的重复
                 if ret.status != SendStatus.OK: # 如果发送失败了
                     raise Exception("发送回滚消息失败")
-                sync_producer.shutdown()
         except Exception as e:
             print(e)
             txn.rollback()
@@ -65,12 +120,37 @@ def order_timeout(msg):
     return ConsumeStatus.CONSUME_SUCCESS
 
 
+def send_order_paid(order_sn):
+    """
+    发送订单支付成功的消息, 商品服务据此累加销量
+    销量只是统计数据, 发送失败只记录日志, 不影响订单状态的更新
+    """
+    try:
+        order = OrderInfo.get(OrderInfo.order_sn == order_sn)
+        order_goods = OrderGoods.select(OrderGoods.goods, OrderGoods.nums).where(OrderGoods.order == order.id)
+        msg = Message("order_paid")
+        msg.set_keys(order_sn)
+        msg.set_tags("paid")
+        msg.set_body(json.dumps({"orderSn": order_sn,
+                                 "goods": [{"goodsId": item.goods, "nums": item.nums} for item in order_goods]}))
+
+        ret = producers.send_sync("order_paid_sender", msg)
+        if ret.status != SendStatus.OK:
+            logger.warning(f"发送订单支付消息失败: {order_sn}")
+    except Exception as e:
+        logger.warning(f"发送订单支付消息失败: {order_sn}, {e}")
+
+
 class OrderServicer(order_pb2_grpc.OrderServicer):
+    def __init__(self):
+        # 新建订单的事务消息使用共享的事务生产者, 回查时调用 check_callback
+        producers.register_transactional("mxshop", self.check_callback)
+
     @logger.catch
     def CarItemList(self, request: order_pb2.UserInfo, context):
         # 获取用户的购物车信息
-        items = ShoppingCart.select().where(ShoppingCart.user == request.id)
-        rsp = order_pb2.CartItemListResponse(total=items.count())
+        items = cart_store.items(request.id)
+        rsp = order_pb2.CartItemListResponse(total=len(items))
         for item in items:
             item_rsp = order_pb2.ShopCartInfoResponse()
             item_rsp.id = item.id
@@ -84,47 +164,25 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
 
     @logger.catch
     def CreateCartItem(self, request: order_pb2.CartItemRequest, context):
-        # 添加商品到购物车
-        existed_items = ShoppingCart.select().where(ShoppingCart.goods==request.goodsId, ShoppingCart.user==request.userId)
-
-        # 如果记录已经存在则合并购物车
-        if existed_items:
-            item = existed_items[0]
-            item.nums += request.nums
-        else:
-            item = ShoppingCart()
-            item.user = request.userId
-            item.goods = request.goodsId
-            item.nums = request.nums
-        item.save()
-        return order_pb2.ShopCartInfoResponse(id=item.id)
+        # 添加商品到购物车, 如果记录已经存在则合并购物车
+        item_id = cart_store.add(request.userId, request.goodsId, request.nums)
+        return order_pb2.ShopCartInfoResponse(id=item_id)
 
     @logger.catch
     def UpdateCartItem(self, request: order_pb2.CartItemRequest, context):
         # 更新购物车条目-数量和选中状态
-        try:
-            item = ShoppingCart.get(ShoppingCart.user == request.userId, ShoppingCart.goods == request.goodsId)
-            item.checked = request.checked
-            if request.nums:
-                item.nums = request.nums
-            item.save()
-            return empty_pb2.Empty()
-        except DoesNotExist as e:
+        if not cart_store.update(request.userId, request.goodsId, request.nums, request.checked):
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details("购物车记录不存在")
-            return empty_pb2.Empty()
+        return empty_pb2.Empty()
 
     @logger.catch
     def DeleteCartItem(self, request: order_pb2.CartItemRequest, context):
         # 删除购物车的条目
-        try:
-            item = ShoppingCart.get(ShoppingCart.user == request.userId, ShoppingCart.goods == request.goodsId)
-            item.delete_instance()
-            return empty_pb2.Empty()
-        except DoesNotExist as e:
+        if not cart_store.delete(request.userId, request.goodsId):
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details("购物车记录不存在")
-            return empty_pb2.Empty()
+        return empty_pb2.Empty()
 
     @logger.catch
     def check_callback(self, msg):
@@ -140,6 +198,14 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
 
     @logger.catch
     def local_execute(self, msg, user_args):
+        # 无论本地事务的结果如何(包括出现异常), 都把结果交给等待的 CreateOrder
+        order_sn = json.loads(msg.body.decode("utf-8"))["orderSn"]
+        try:
+            return self.execute_order(msg)
+        finally:
+            order_results.deliver(order_sn, local_execute_dict.pop(order_sn, {}))
+
+    def execute_order(self, msg):
         msg_body = json.loads(msg.body.decode("utf-8"))
         order_sn = msg_body["orderSn"]
         local_execute_dict[order_sn] = {}
@@ -153,7 +219,7 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
             order_amount = 0
             # 查找用户购物车选中的商品
             with tracer.start_as_current_span("select_shopcart") as select_shopcart_span:
-                for cart_item in ShoppingCart.select().where(ShoppingCart.user == msg_body["userId"], ShoppingCart.checked == True):
+                for cart_item in cart_store.checked_items(msg_body["userId"]):
                     goods_ids.append(cart_item.goods)
                     goods_nums[cart_item.goods] = cart_item.nums
 
@@ -170,28 +236,30 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
 
             # 查询商品的信息
             with tracer.start_as_current_span("query_goods") as quert_goods_span:
-                register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)  # 创建 实例(调度中心)
-                goods_srv_host, goods_srv_port = register.get_host_port(f'Service=="{settings.GOODS_SRV_NAME}"')
-                if not goods_srv_host:
-                    local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
-                    local_execute_dict[order_sn]["detail"] = "商品服务不可用"
-                    return TransactionStatus.ROLLBACK
-
-                goods_channel = grpc.insecure_channel(f"{goods_srv_host}:{goods_srv_port}")
-                goods_stub = goods_pb2_grpc.GoodsStub(goods_channel)
-
                 # 批量获取商品的信息
                 try:
-                    goods_info_rsp = goods_stub.BatchGetGoods(  # 获取 多个商品的详细信息
-                        goods_pb2.BatchGoodsIdInfo(
-                            id=goods_ids
+                    with goods_channels.channel() as goods_channel:
+                        goods_stub = goods_pb2_grpc.GoodsStub(goods_channel)
+                        goods_info_rsp = goods_stub.BatchGetGoods(  # 获取 多个商品的详细信息
+                            goods_pb2.BatchGoodsIdInfo(
+                                id=goods_ids,
+                                fields=field_mask_pb2.FieldMask(paths=["id", "name", "goodsFrontImage", "shopPrice"])
+                            )
                         )
-                    )
+                except ServiceUnavailable:
+                    local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
+                    local_execute_dict[order_sn]["detail"] = "商品服务不可用"
+                    return TransactionStatus.ROLLBACK
                 except grpc.RpcError as e:
                     local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
                     local_execute_dict[order_sn]["detail"] = f"商品服务不可用:{str(e)}"
                     return TransactionStatus.ROLLBACK
 
+                if goods_info_rsp.notFound:
+                    local_execute_dict[order_sn]["code"] = grpc.StatusCode.NOT_FOUND
+                    local_execute_dict[order_sn]["detail"] = f"商品不存在: {', '.join(map(str, goods_info_rsp.notFound))}"
+                    return TransactionStatus.ROLLBACK
+
                 for goods_info in goods_info_rsp.data:  # 遍历 多个商品的详细信息
                     order_amount += goods_info.shopPrice * goods_nums[goods_info.id]
                     # 实例化 订单商品详情
@@ -206,25 +274,22 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
                     goods_sell_info.append(inventory_pb2.GoodsInvInfo(goodsId=goods_info.id, num=goods_nums[goods_info.id]))
 
             # 扣减库存
-            # 这里需要负载均衡吗? - dns的resolver - 还没有做到维护连接
+            # 负载均衡: inventory_channels 在库存服务的多个实例之间轮询(或者选择负载最低的实例)
             with tracer.start_as_current_span("query_inv") as query_inv_span:
-                inv_srv_host, inv_srv_port = register.get_host_port(f'Service=="{settings.INVENTORY_SRV_NAME}"')
-                if not inv_srv_host:
-                    local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
-                    local_execute_dict[order_sn]["detail"] = f"库存服务不可用"
-                    return TransactionStatus.ROLLBACK
-
-                inv_channel = grpc.insecure_channel(f"{inv_srv_host}:{inv_srv_port}")
-                inv_stub = inventory_pb2_grpc.InventoryStub(inv_channel)
-
                 try:
                     # 调用失败问题比较复杂
-                    inv_stub.Sell(
-                        inventory_pb2.SellInfo(
-                            goodsInfo=goods_sell_info,
-                            orderSn=order_sn,
+                    with inventory_channels.channel() as inv_channel:
+                        inv_stub = inventory_pb2_grpc.InventoryStub(inv_channel)
+                        inv_stub.Sell(
+                            inventory_pb2.SellInfo(
+                                goodsInfo=goods_sell_info,
+                                orderSn=order_sn,
+                            )
                         )
-                    )
+                except ServiceUnavailable:
+                    local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
+                    local_execute_dict[order_sn]["detail"] = f"库存服务不可用"
+                    return TransactionStatus.ROLLBACK
                 except grpc.RpcError as e:
                     local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
                     local_execute_dict[order_sn]["detail"] = f"扣减库存失败:{str(e)}"
@@ -259,8 +324,6 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
                     #     order_goods.save()
                     OrderGoods.bulk_create(order_goods_list)  # 批量插入
 
-                    # 删除购物车的记录
-                    ShoppingCart.delete().where(ShoppingCart.user == msg_body["userId"], ShoppingCart.checked == True).execute()
                     local_execute_dict[order_sn] = {
                         "code": grpc.StatusCode.OK,
                         "detail": "下单成功",
@@ -279,16 +342,14 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
                     msg.set_body(json.dumps({
                         "orderSn": order_sn,
                     }))
-                    # 生产者组
-                    sync_producer = Producer("cancel")
-                    sync_producer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
-                    sync_producer.start()  # 启动producer
                     # 发送 消息体
-                    ret = sync_producer.send_sync(msg)
+                    ret = producers.send_sync("cancel", msg)
                     if ret.status != SendStatus.OK:
                         raise Exception("发送延时消息失败")
+                    # 删除购物车中已经下单的商品, mysql 存储的购物车在事务中删除, 随订单一起回滚
+                    if cart_store.transactional:
+                        cart_store.remove(msg_body["userId"], goods_ids)
                     print(f"发送时间: {datetime.now()}")
-                    sync_producer.shutdown()
                 except Exception as e:
                     # 调用库存服务的归还库存的接口就行了
                     """
@@ -318,6 +379,9 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
                     local_execute_dict[order_sn]["code"] = grpc.StatusCode.INTERNAL
                     local_execute_dict[order_sn]["detail"] = f"订单创建失败:{str(e)}"
                     return TransactionStatus.COMMIT
+        # redis 存储的购物车不随数据库事务回滚, 订单提交成功之后才删除
+        if not cart_store.transactional:
+            cart_store.remove(msg_body["userId"], goods_ids)
         return TransactionStatus.ROLLBACK
 
     @logger.catch
@@ -331,9 +395,6 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
             5. 从购物车中删除已购买的商品
         """
         # 要先准备好一个half消息
-        producer = TransactionMQProducer("mxshop", self.check_callback)
-        producer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
-        producer.start()  # 启动producer
         msg = Message("order_reback")
         msg.set_keys("mxshop")
         msg.set_tags("order")
@@ -349,31 +410,40 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
         }
         msg.set_body(json.dumps(msg_body))
 
-        ret = producer.send_message_in_transaction(msg, self.local_execute, user_args=None)
+        order_results.register(order_sn)
+        try:
+            ret = producers.send_message_in_transaction("mxshop", msg, self.local_execute)
+        except Exception:
+            order_results.discard(order_sn)
+            raise
         logger.info(f"发送状态: {ret.status}, 消息id: {ret.msg_id}")
         if ret.status != SendStatus.OK:
+            order_results.discard(order_sn)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details("新建订单失败")
             return order_pb2.OrderInfoResponse()
 
-        while True:
-            """
-            循环 等待 local_execute_dict出现数据
-            如果出现数据 说明 购买的商品已经获取到想要得到的结果 可能成功 也可能失败 
-            """
-            if order_sn in local_execute_dict:
-                context.set_code(local_execute_dict[order_sn]["code"])          # 写入 状态码
-                context.set_details(local_execute_dict[order_sn]["detail"])     # 写入 详细信息
-                producer.shutdown()
-                if local_execute_dict[order_sn]["code"] == grpc.StatusCode.OK:
-                    return order_pb2.OrderInfoResponse(
-                        id=local_execute_dict[order_sn]["order"]["id"],
-                        orderSn=local_execute_dict[order_sn]["order"]["orderSn"],
-                        total=local_execute_dict[order_sn]["order"]["total"],
-                    )
-                else:
-                    return order_pb2.OrderInfoResponse()
-            time.sleep(0.1)
+        # 等待 local_execute 的结果(可能成功 也可能失败), 最多等到配置的超时时间 或者 客户端的deadline
+        timeout = settings.ORDER_CREATE_TIMEOUT
+        remaining = context.time_remaining()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        result = order_results.wait(order_sn, timeout)
+
+        if result is None:
+            context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
+            context.set_details("新建订单超时")
+            return order_pb2.OrderInfoResponse()
+
+        context.set_code(result.get("code", grpc.StatusCode.INTERNAL))           # 写入 状态码
+        context.set_details(result.get("detail", "新建订单失败"))                 # 写入 详细信息
+        if result.get("code") == grpc.StatusCode.OK:
+            return order_pb2.OrderInfoResponse(
+                id=result["order"]["id"],
+                orderSn=result["order"]["orderSn"],
+                total=result["order"]["total"],
+            )
+        return order_pb2.OrderInfoResponse()
 
     @logger.catch
     def OrderList(self, request: order_pb2.OrderFilterRequest, context):
@@ -383,12 +453,23 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
         orders = OrderInfo.select()
         if request.userId:
             orders = orders.where(OrderInfo.user==request.userId)
-        rsp.total = orders.count()
+        if not request.skipTotal:
+            rsp.total = count_cache.count(orders)
 
         # 分页
         per_page_nums = request.pagePerNums if request.pagePerNums else 10
         start = per_page_nums * (request.pages - 1) if request.pages else 0
-        orders = orders.limit(per_page_nums).offset(start)
+        if request.HasField("cursor"):
+            # 游标分页  按 id 定位到下一页, 不受页数深度影响
+            try:
+                orders, next_cursor = keyset_paginate(orders, OrderInfo.id, request.cursor, per_page_nums)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return order_pb2.OrderListResponse()
+            rsp.nextCursor = next_cursor
+        else:
+            orders = orders.limit(per_page_nums).offset(start)
 
         for order in orders:
             info_rsp = order_pb2.OrderInfoResponse()
@@ -449,5 +530,10 @@ class OrderServicer(order_pb2_grpc.OrderServicer):
     @logger.catch
     def UpdateOrderStatus(self, request: order_pb2.OrderStatus, context):
         # 更新订单的支付状态
-        OrderInfo.update(status=request.status, pay_time=datetime.fromtimestamp(request.payTime)).where(OrderInfo.order_sn==request.OrderSn).execute()
+        query = OrderInfo.update(status=request.status, pay_time=datetime.fromtimestamp(request.payTime)).where(OrderInfo.order_sn==request.OrderSn)
+        if request.status == "TRADE_SUCCESS":
+            # 只有第一次变成支付成功时才通知商品服务累加销量, 重复的支付回调不会重复计算
+            query = query.where(OrderInfo.status != "TRADE_SUCCESS")
+        if query.execute() and request.status == "TRADE_SUCCESS":
+            send_order_paid(request.OrderSn)
         return empty_pb2.Empty()
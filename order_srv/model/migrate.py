@@ -0,0 +1,79 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from loguru import logger
+from peewee import fn
+
+from order_srv.model.models import *
+
+"""
+    数据库迁移: 补建缺少的表和 Meta.indexes 中声明的索引, 可以重复执行
+        python order_srv/model/migrate.py          # 执行迁移
+        python order_srv/model/migrate.py --dry    # 只打印需要执行的sql
+    购物车的 (user, goods) 唯一索引建立之前, 先合并已有的重复记录
+"""
+
+MODELS = [ShoppingCart, OrderInfo, OrderGoods]
+
+
+def missing_indexes(model):
+    # mysql 不支持 create index if not exists, 先查出表上已有的索引名
+    database = model._meta.database
+    existing = {index.name for index in database.get_indexes(model._meta.table_name)}
+    return [index for index in model._meta.fields_to_index() if index._name not in existing]
+
+
+def merge_cart_duplicates(dry=False):
+    """
+    以前并发加入购物车会产生重复的 (user, goods) 记录, 每组只保留一条:
+        保留未删除的记录中id最小的一条(都已删除时保留id最小的), 数量为所有未删除记录之和, 其余记录物理删除
+    """
+    # BaseModel.select 会过滤掉逻辑删除的记录, 这里需要全部的记录
+    rows = super(BaseModel, ShoppingCart).select
+    duplicates = rows(ShoppingCart.user, ShoppingCart.goods).group_by(
+        ShoppingCart.user, ShoppingCart.goods).having(fn.COUNT(ShoppingCart.id) > 1).tuples()
+
+    merged = removed = 0
+    with ShoppingCart._meta.database.atomic():
+        for user, goods in list(duplicates):
+            items = list(rows().where(ShoppingCart.user == user, ShoppingCart.goods == goods).order_by(
+                ShoppingCart.is_deleted, ShoppingCart.id))
+            keep, others = items[0], items[1:]
+            merged += 1
+            removed += len(others)
+            if dry:
+                continue
+            if not keep.is_deleted:
+                nums = sum(item.nums for item in items if not item.is_deleted)
+                ShoppingCart.update(nums=nums).where(ShoppingCart.id == keep.id).execute()
+            ShoppingCart.delete(permanently=True).where(ShoppingCart.id.in_([item.id for item in others])).execute()
+    if merged:
+        logger.info(f"合并重复的购物车记录: {merged} 组, 删除 {removed} 条")
+
+
+def migrate(models=MODELS, dry=False):
+    database = models[0]._meta.database
+    missing_tables = [model for model in models if not model.table_exists()]
+    for model in missing_tables:
+        logger.info(f"新建表: {model._meta.table_name}")
+    if not dry:
+        database.create_tables(missing_tables)
+
+    for model in models:
+        if model in missing_tables:     # 新建的表已经带上了索引
+            continue
+        indexes = missing_indexes(model)
+        if model is ShoppingCart and any(index._unique for index in indexes):
+            merge_cart_duplicates(dry)
+        for index in indexes:
+            query = model._schema._create_index(index, safe=False)
+            logger.info(f"新建索引: {database.get_sql_context().sql(query).query()[0]}")
+            if not dry:
+                database.execute(query)
+
+
+if __name__ == '__main__':
+    migrate(dry="--dry" in sys.argv)
@@ -50,6 +50,13 @@ class ShoppingCart(BaseModel):
     nums = IntegerField(verbose_name="购买数量")
     checked = BooleanField(default=True, verbose_name="是否选中")
 
+    class Meta:
+        # 每个用户的每个商品只有一条记录(包括逻辑删除的), 加入购物车通过 insert ... on duplicate key update 合并
+        # 已有的数据库通过 model/migrate.py 合并重复记录后补建
+        indexes = (
+            (("user", "goods"), True),
+        )
+
 
 class OrderInfo(BaseModel):
     """
@@ -66,7 +73,7 @@ class OrderInfo(BaseModel):
         ("alipay", "支付宝"),
     )
 
-    user = IntegerField(verbose_name="用户id")
+    user = IntegerField(index=True, verbose_name="用户id")     # 按用户查询订单 (user, id) 游标分页
     order_sn = CharField(max_length=30, null=True, unique=True, verbose_name="订单号")
     pay_type = CharField(choices=PAY_TYPE, default="alipay", max_length=30, verbose_name="支付方式")
     status = CharField(choices=ORDER_STATUS, default="paying", max_length=30, verbose_name="订单状态")
@@ -16,7 +16,9 @@ from loguru import logger
 from rocketmq.client import PushConsumer
 
 from order_srv.proto import order_pb2_grpc
-from order_srv.handler.order import OrderServicer, order_timeout
+from order_srv.handler.order import OrderServicer, order_timeout, producers, PRODUCER_GROUPS
+from order_srv.handler.order import goods_channels, inventory_channels
+from order_srv.cart.store import cart_store
 from common.grpc_health.v1 import health_pb2_grpc
 from common.grpc_health.v1 import health
 from common.register import consul
@@ -37,6 +39,10 @@ def on_exit(signo, frame, service_id, consumer):
     register.deregister(service_id)
     logger.info(f"注销rocketmq")
     consumer.shutdown()
+    producers.shutdown()
+    goods_channels.stop()
+    inventory_channels.stop()
+    cart_store.stop()       # 把购物车剩余的修改写入mysql
     logger.info(f"注销成功")
     sys.exit(0)
 
@@ -112,6 +118,13 @@ def server():
     consumer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
     consumer.subscribe("order_timeout", order_timeout)
     consumer.start()
+    # 5. 启动共享的rocketmq生产者, 所有请求复用, 退出时关闭
+    producers.start(*PRODUCER_GROUPS)
+    # 6. 到商品服务和库存服务的长连接, 后台定期从consul刷新实例
+    goods_channels.start()
+    inventory_channels.start()
+    # 7. 购物车使用 redis 存储时, 启动后台批量写入mysql的线程
+    cart_store.start()
 
     service_id = str(uuid.uuid1())  # 使用主机ID, 序列号, 和当前时间来生成UUID
 
@@ -13,9 +13,10 @@ _sym_db = _symbol_database.Default()
 
 
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bgoods.proto\x1a\x1bgoogle/protobuf/empty.proto\"0\n\x13\x43\x61tegoryListRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05level\x18\x02 \x01(\x05\"e\n\x13\x43\x61tegoryInfoRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x16\n\x0eparentCategory\x18\x03 \x01(\x05\x12\r\n\x05level\x18\x04 \x01(\x05\x12\r\n\x05isTab\x18\x05 \x01(\x08\"#\n\x15\x44\x65leteCategoryRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"0\n\x14QueryCategoryRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"f\n\x14\x43\x61tegoryInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x16\n\x0eparentCategory\x18\x03 \x01(\x05\x12\r\n\x05level\x18\x04 \x01(\x05\x12\r\n\x05isTab\x18\x05 \x01(\x08\"\\\n\x14\x43\x61tegoryListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12#\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x15.CategoryInfoResponse\x12\x10\n\x08jsonData\x18\x03 \x01(\t\"z\n\x17SubCategoryListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12#\n\x04info\x18\x02 \x01(\x0b\x32\x15.CategoryInfoResponse\x12+\n\x0csubCategorys\x18\x03 \x03(\x0b\x32\x15.CategoryInfoResponse\"@\n\x1a\x43\x61tegoryBrandFilterRequest\x12\r\n\x05pages\x18\x01 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x02 \x01(\x05\"G\n\x14\x43\x61tegoryBrandRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\ncategoryId\x18\x02 \x01(\x05\x12\x0f\n\x07\x62randId\x18\x03 \x01(\x05\"o\n\x15\x43\x61tegoryBrandResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12!\n\x05\x62rand\x18\x02 \x01(\x0b\x32\x12.BrandInfoResponse\x12\'\n\x08\x63\x61tegory\x18\x03 \x01(\x0b\x32\x15.CategoryInfoResponse\"F\n\rBannerRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05index\x18\x02 \x01(\x05\x12\r\n\x05image\x18\x03 \x01(\t\x12\x0b\n\x03url\x18\x04 \x01(\t\"G\n\x0e\x42\x61nnerResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05index\x18\x02 \x01(\x05\x12\r\n\x05image\x18\x03 \x01(\t\x12\x0b\n\x03url\x18\x04 \x01(\t\"8\n\x12\x42randFilterRequest\x12\r\n\x05pages\x18\x01 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x02 \x01(\x05\"6\n\x0c\x42randRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04logo\x18\x03 \x01(\t\";\n\x11\x42randInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04logo\x18\x03 \x01(\t\"D\n\x11\x42randListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12 \n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x12.BrandInfoResponse\"B\n\x12\x42\x61nnerListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x1d\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x0f.BannerResponse\"P\n\x19\x43\x61tegoryBrandListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12$\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x16.CategoryBrandResponse\"\x1e\n\x10\x42\x61tchGoodsIdInfo\x12\n\n\x02id\x18\x01 \x03(\x05\"\x1d\n\x0f\x44\x65leteGoodsInfo\x12\n\n\x02id\x18\x01 \x01(\x05\"5\n\x19\x43\x61tegoryBriefInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"2\n\x15\x43\x61tegoryFilterRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05isTab\x18\x02 \x01(\x08\"\x1d\n\x0fGoodInfoRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"\xbd\x02\n\x0f\x43reateGoodsInfo\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07goodsSn\x18\x03 \x01(\t\x12\x0e\n\x06stocks\x18\x07 \x01(\x05\x12\x13\n\x0bmarketPrice\x18\x08 \x01(\x02\x12\x11\n\tshopPrice\x18\t \x01(\x02\x12\x12\n\ngoodsBrief\x18\n \x01(\t\x12\x11\n\tgoodsDesc\x18\x0b \x01(\t\x12\x10\n\x08shipFree\x18\x0c \x01(\x08\x12\x0e\n\x06images\x18\r \x03(\t\x12\x12\n\ndescImages\x18\x0e \x03(\t\x12\x17\n\x0fgoodsFrontImage\x18\x0f \x01(\t\x12\r\n\x05isNew\x18\x10 \x01(\x08\x12\r\n\x05isHot\x18\x11 \x01(\x08\x12\x0e\n\x06onSale\x18\x12 \x01(\x08\x12\x12\n\ncategoryId\x18\x13 \x01(\x05\x12\x0f\n\x07\x62randId\x18\x14 \x01(\x05\"3\n\x12GoodsReduceRequest\x12\x0f\n\x07goodsId\x18\x01 \x01(\x05\x12\x0c\n\x04nums\x18\x02 \x01(\x05\"L\n\x18\x42\x61tchCategoryInfoRequest\x12\n\n\x02id\x18\x01 \x03(\x05\x12\x11\n\tgoodsNums\x18\x02 \x01(\x05\x12\x11\n\tbrandNums\x18\x03 \x01(\x05\"\xbf\x01\n\x12GoodsFilterRequest\x12\x10\n\x08priceMin\x18\x01 \x01(\x05\x12\x10\n\x08priceMax\x18\x02 \x01(\x05\x12\r\n\x05isHot\x18\x03 \x01(\x08\x12\r\n\x05isNew\x18\x04 \x01(\x08\x12\r\n\x05isTab\x18\x05 \x01(\x08\x12\x13\n\x0btopCategory\x18\x06 \x01(\x05\x12\r\n\x05pages\x18\x07 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x08 \x01(\x05\x12\x10\n\x08keyWords\x18\t \x01(\t\x12\r\n\x05\x62rand\x18\n \x01(\x05\"\xc3\x03\n\x11GoodsInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\ncategoryId\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0f\n\x07goodsSn\x18\x04 \x01(\t\x12\x10\n\x08\x63lickNum\x18\x05 \x01(\x05\x12\x0f\n\x07soldNum\x18\x06 \x01(\x05\x12\x0e\n\x06\x66\x61vNum\x18\x07 \x01(\x05\x12\x0e\n\x06stocks\x18\x08 \x01(\x05\x12\x13\n\x0bmarketPrice\x18\t \x01(\x02\x12\x11\n\tshopPrice\x18\n \x01(\x02\x12\x12\n\ngoodsBrief\x18\x0b \x01(\t\x12\x11\n\tgoodsDesc\x18\x0c \x01(\t\x12\x10\n\x08shipFree\x18\r \x01(\x08\x12\x0e\n\x06images\x18\x0e \x03(\t\x12\x12\n\ndescImages\x18\x0f \x03(\t\x12\x17\n\x0fgoodsFrontImage\x18\x10 \x01(\t\x12\r\n\x05isNew\x18\x11 \x01(\x08\x12\r\n\x05isHot\x18\x12 \x01(\x08\x12\x0e\n\x06onSale\x18\x13 \x01(\x08\x12\x0f\n\x07\x61\x64\x64Time\x18\x14 \x01(\x03\x12,\n\x08\x63\x61tegory\x18\x15 \x01(\x0b\x32\x1a.CategoryBriefInfoResponse\x12!\n\x05\x62rand\x18\x16 \x01(\x0b\x32\x12.BrandInfoResponse\"D\n\x11GoodsListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12 \n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x12.GoodsInfoResponse2\xaf\x0b\n\x05Goods\x12\x34\n\tGoodsList\x12\x13.GoodsFilterRequest\x1a\x12.GoodsListResponse\x12\x36\n\rBatchGetGoods\x12\x11.BatchGoodsIdInfo\x1a\x12.GoodsListResponse\x12\x33\n\x0b\x43reateGoods\x12\x10.CreateGoodsInfo\x1a\x12.GoodsInfoResponse\x12\x37\n\x0b\x44\x65leteGoods\x12\x10.DeleteGoodsInfo\x1a\x16.google.protobuf.Empty\x12\x37\n\x0bUpdateGoods\x12\x10.CreateGoodsInfo\x1a\x16.google.protobuf.Empty\x12\x36\n\x0eGetGoodsDetail\x12\x10.GoodInfoRequest\x1a\x12.GoodsInfoResponse\x12\x44\n\x13GetAllCategorysList\x12\x16.google.protobuf.Empty\x1a\x15.CategoryListResponse\x12@\n\x0eGetSubCategory\x12\x14.CategoryListRequest\x1a\x18.SubCategoryListResponse\x12=\n\x0e\x43reateCategory\x12\x14.CategoryInfoRequest\x1a\x15.CategoryInfoResponse\x12@\n\x0e\x44\x65leteCategory\x12\x16.DeleteCategoryRequest\x1a\x16.google.protobuf.Empty\x12>\n\x0eUpdateCategory\x12\x14.CategoryInfoRequest\x1a\x16.google.protobuf.Empty\x12\x34\n\tBrandList\x12\x13.BrandFilterRequest\x1a\x12.BrandListResponse\x12\x30\n\x0b\x43reateBrand\x12\r.BrandRequest\x1a\x12.BrandInfoResponse\x12\x34\n\x0b\x44\x65leteBrand\x12\r.BrandRequest\x1a\x16.google.protobuf.Empty\x12\x34\n\x0bUpdateBrand\x12\r.BrandRequest\x1a\x16.google.protobuf.Empty\x12\x39\n\nBannerList\x12\x16.google.protobuf.Empty\x1a\x13.BannerListResponse\x12/\n\x0c\x43reateBanner\x12\x0e.BannerRequest\x1a\x0f.BannerResponse\x12\x36\n\x0c\x44\x65leteBanner\x12\x0e.BannerRequest\x1a\x16.google.protobuf.Empty\x12\x36\n\x0cUpdateBanner\x12\x0e.BannerRequest\x1a\x16.google.protobuf.Empty\x12L\n\x11\x43\x61tegoryBrandList\x12\x1b.CategoryBrandFilterRequest\x1a\x1a.CategoryBrandListResponse\x12@\n\x14GetCategoryBrandList\x12\x14.CategoryInfoRequest\x1a\x12.BrandListResponse\x12\x44\n\x13\x43reateCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.CategoryBrandResponse\x12\x44\n\x13\x44\x65leteCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.google.protobuf.Empty\x12\x44\n\x13UpdateCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.google.protobuf.EmptyB\tZ\x07.;protob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bgoods.proto\x1a\x1bgoogle/protobuf/empty.proto\x1a google/protobuf/field_mask.proto\"0\n\x13\x43\x61tegoryListRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05level\x18\x02 \x01(\x05\"e\n\x13\x43\x61tegoryInfoRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x16\n\x0eparentCategory\x18\x03 \x01(\x05\x12\r\n\x05level\x18\x04 \x01(\x05\x12\r\n\x05isTab\x18\x05 \x01(\x08\"#\n\x15\x44\x65leteCategoryRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"0\n\x14QueryCategoryRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"f\n\x14\x43\x61tegoryInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x16\n\x0eparentCategory\x18\x03 \x01(\x05\x12\r\n\x05level\x18\x04 \x01(\x05\x12\r\n\x05isTab\x18\x05 \x01(\x08\"\\\n\x14\x43\x61tegoryListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12#\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x15.CategoryInfoResponse\x12\x10\n\x08jsonData\x18\x03 \x01(\t\"z\n\x17SubCategoryListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12#\n\x04info\x18\x02 \x01(\x0b\x32\x15.CategoryInfoResponse\x12+\n\x0csubCategorys\x18\x03 \x03(\x0b\x32\x15.CategoryInfoResponse\"\x93\x01\n\x17\x43\x61tegorySubInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x16\n\x0eparentCategory\x18\x03 \x01(\x05\x12\r\n\x05level\x18\x04 \x01(\x05\x12\r\n\x05isTab\x18\x05 \x01(\x08\x12(\n\x06subCat\x18\x06 \x03(\x0b\x32\x18.CategorySubInfoResponse\"I\n\x10\x43\x61tegoryResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12&\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x18.CategorySubInfoResponse\"`\n\x1a\x43\x61tegoryBrandFilterRequest\x12\r\n\x05pages\x18\x01 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x02 \x01(\x05\x12\x13\n\x06\x63ursor\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\t\n\x07_cursor\"G\n\x14\x43\x61tegoryBrandRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\ncategoryId\x18\x02 \x01(\x05\x12\x0f\n\x07\x62randId\x18\x03 \x01(\x05\"o\n\x15\x43\x61tegoryBrandResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12!\n\x05\x62rand\x18\x02 \x01(\x0b\x32\x12.BrandInfoResponse\x12\'\n\x08\x63\x61tegory\x18\x03 \x01(\x0b\x32\x15.CategoryInfoResponse\"F\n\rBannerRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05index\x18\x02 \x01(\x05\x12\r\n\x05image\x18\x03 \x01(\t\x12\x0b\n\x03url\x18\x04 \x01(\t\"G\n\x0e\x42\x61nnerResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05index\x18\x02 \x01(\x05\x12\r\n\x05image\x18\x03 \x01(\t\x12\x0b\n\x03url\x18\x04 \x01(\t\"k\n\x12\x42randFilterRequest\x12\r\n\x05pages\x18\x01 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x02 \x01(\x05\x12\x13\n\x06\x63ursor\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x11\n\tskipTotal\x18\x04 \x01(\x08\x42\t\n\x07_cursor\"6\n\x0c\x42randRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04logo\x18\x03 \x01(\t\";\n\x11\x42randInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04logo\x18\x03 \x01(\t\"X\n\x11\x42randListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12 \n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x12.BrandInfoResponse\x12\x12\n\nnextCursor\x18\x03 \x01(\t\"B\n\x12\x42\x61nnerListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x1d\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x0f.BannerResponse\"d\n\x19\x43\x61tegoryBrandListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12$\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x16.CategoryBrandResponse\x12\x12\n\nnextCursor\x18\x03 \x01(\t\"J\n\x10\x42\x61tchGoodsIdInfo\x12\n\n\x02id\x18\x01 \x03(\x05\x12*\n\x06\x66ields\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"\x1d\n\x0f\x44\x65leteGoodsInfo\x12\n\n\x02id\x18\x01 \x01(\x05\"5\n\x19\x43\x61tegoryBriefInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\"2\n\x15\x43\x61tegoryFilterRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05isTab\x18\x02 \x01(\x08\"\x1d\n\x0fGoodInfoRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"\xd5\x02\n\x0f\x43reateGoodsInfo\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07goodsSn\x18\x03 \x01(\t\x12\x0e\n\x06stocks\x18\x07 \x01(\x05\x12\x13\n\x0bmarketPrice\x18\x08 \x01(\x02\x12\x11\n\tshopPrice\x18\t \x01(\x02\x12\x12\n\ngoodsBrief\x18\n \x01(\t\x12\x11\n\tgoodsDesc\x18\x0b \x01(\t\x12\x10\n\x08shipFree\x18\x0c \x01(\x08\x12\x0e\n\x06images\x18\r \x03(\t\x12\x12\n\ndescImages\x18\x0e \x03(\t\x12\x17\n\x0fgoodsFrontImage\x18\x0f \x01(\t\x12\r\n\x05isNew\x18\x10 \x01(\x08\x12\r\n\x05isHot\x18\x11 \x01(\x08\x12\x0e\n\x06onSale\x18\x12 \x01(\x08\x12\x12\n\ncategoryId\x18\x13 \x01(\x05\x12\x0f\n\x07\x62randId\x18\x14 \x01(\x05\x12\x16\n\x0erestoreDeleted\x18\x15 \x01(\x08\"3\n\x12GoodsReduceRequest\x12\x0f\n\x07goodsId\x18\x01 \x01(\x05\x12\x0c\n\x04nums\x18\x02 \x01(\x05\"L\n\x18\x42\x61tchCategoryInfoRequest\x12\n\n\x02id\x18\x01 \x03(\x05\x12\x11\n\tgoodsNums\x18\x02 \x01(\x05\x12\x11\n\tbrandNums\x18\x03 \x01(\x05\"\x84\x02\n\x12GoodsFilterRequest\x12\x10\n\x08priceMin\x18\x01 \x01(\x05\x12\x10\n\x08priceMax\x18\x02 \x01(\x05\x12\r\n\x05isHot\x18\x03 \x01(\x08\x12\r\n\x05isNew\x18\x04 \x01(\x08\x12\r\n\x05isTab\x18\x05 \x01(\x08\x12\x13\n\x0btopCategory\x18\x06 \x01(\x05\x12\r\n\x05pages\x18\x07 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x08 \x01(\x05\x12\x10\n\x08keyWords\x18\t \x01(\t\x12\r\n\x05\x62rand\x18\n \x01(\x05\x12\x10\n\x08ordering\x18\x0b \x01(\t\x12\x13\n\x06\x63ursor\x18\x0c \x01(\tH\x00\x88\x01\x01\x12\x11\n\tskipTotal\x18\r \x01(\x08\x42\t\n\x07_cursor\"\xd6\x03\n\x11GoodsInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\ncategoryId\x18\x02 \x01(\x05\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0f\n\x07goodsSn\x18\x04 \x01(\t\x12\x10\n\x08\x63lickNum\x18\x05 \x01(\x05\x12\x0f\n\x07soldNum\x18\x06 \x01(\x05\x12\x0e\n\x06\x66\x61vNum\x18\x07 \x01(\x05\x12\x0e\n\x06stocks\x18\x08 \x01(\x05\x12\x13\n\x0bmarketPrice\x18\t \x01(\x02\x12\x11\n\tshopPrice\x18\n \x01(\x02\x12\x12\n\ngoodsBrief\x18\x0b \x01(\t\x12\x11\n\tgoodsDesc\x18\x0c \x01(\t\x12\x10\n\x08shipFree\x18\r \x01(\x08\x12\x0e\n\x06images\x18\x0e \x03(\t\x12\x12\n\ndescImages\x18\x0f \x03(\t\x12\x17\n\x0fgoodsFrontImage\x18\x10 \x01(\t\x12\r\n\x05isNew\x18\x11 \x01(\x08\x12\r\n\x05isHot\x18\x12 \x01(\x08\x12\x0e\n\x06onSale\x18\x13 \x01(\x08\x12\x0f\n\x07\x61\x64\x64Time\x18\x14 \x01(\x03\x12,\n\x08\x63\x61tegory\x18\x15 \x01(\x0b\x32\x1a.CategoryBriefInfoResponse\x12!\n\x05\x62rand\x18\x16 \x01(\x0b\x32\x12.BrandInfoResponse\x12\x11\n\tisDeleted\x18\x17 \x01(\x08\"L\n\x12GoodsExportRequest\x12\r\n\x05since\x18\x01 \x01(\x03\x12\x0f\n\x07startId\x18\x02 \x01(\x05\x12\x16\n\x0eincludeDeleted\x18\x03 \x01(\x08\"T\n\x17\x42ulkUpsertGoodsResponse\x12\r\n\x05index\x18\x01 \x01(\x05\x12\n\n\x02id\x18\x02 \x01(\x05\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x12\x0f\n\x07\x64\x65leted\x18\x04 \x01(\x08\"j\n\x11GoodsListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12 \n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x12.GoodsInfoResponse\x12\x12\n\nnextCursor\x18\x03 \x01(\t\x12\x10\n\x08notFound\x18\x04 \x03(\x05\"\x1c\n\x0eIndexAdRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"X\n\x0fIndexAdResponse\x12!\n\x05goods\x18\x01 \x03(\x0b\x32\x12.GoodsInfoResponse\x12\"\n\x06\x62rands\x18\x02 \x03(\x0b\x32\x12.BrandInfoResponse\"Y\n\x0bHomePageTab\x12\'\n\x08\x63\x61tegory\x18\x01 \x01(\x0b\x32\x15.CategoryInfoResponse\x12!\n\x07indexAd\x18\x02 \x01(\x0b\x32\x10.IndexAdResponse\"\xdd\x01\n\x10HomePageResponse\x12$\n\x07\x62\x61nners\x18\x01 \x01(\x0b\x32\x13.BannerListResponse\x12(\n\tcategorys\x18\x02 \x01(\x0b\x32\x15.CategoryListResponse\x12\x1a\n\x04tabs\x18\x03 \x03(\x0b\x32\x0c.HomePageTab\x12$\n\x08hotGoods\x18\x04 \x01(\x0b\x32\x12.GoodsListResponse\x12$\n\x08newGoods\x18\x05 \x01(\x0b\x32\x12.GoodsListResponse\x12\x11\n\tbuildTime\x18\x06 \x01(\x03\x32\x89\x0e\n\x05Goods\x12\x34\n\tGoodsList\x12\x13.GoodsFilterRequest\x1a\x12.GoodsListResponse\x12\x36\n\rBatchGetGoods\x12\x11.BatchGoodsIdInfo\x1a\x12.GoodsListResponse\x12\x33\n\x0b\x43reateGoods\x12\x10.CreateGoodsInfo\x1a\x12.GoodsInfoResponse\x12\x37\n\x0b\x44\x65leteGoods\x12\x10.DeleteGoodsInfo\x1a\x16.google.protobuf.Empty\x12\x37\n\x0bUpdateGoods\x12\x10.CreateGoodsInfo\x1a\x16.google.protobuf.Empty\x12\x36\n\x0eGetGoodsDetail\x12\x10.GoodInfoRequest\x1a\x12.GoodsInfoResponse\x12\x41\n\x0f\x42ulkUpsertGoods\x12\x10.CreateGoodsInfo\x1a\x18.BulkUpsertGoodsResponse(\x01\x30\x01\x12\x38\n\x0bGoodsExport\x12\x13.GoodsExportRequest\x1a\x12.GoodsInfoResponse0\x01\x12\x44\n\x13GetAllCategorysList\x12\x16.google.protobuf.Empty\x1a\x15.CategoryListResponse\x12;\n\x10GetCategorysList\x12\x14.CategoryListRequest\x1a\x11.CategoryResponse\x12@\n\x0eGetSubCategory\x12\x14.CategoryListRequest\x1a\x18.SubCategoryListResponse\x12=\n\x0e\x43reateCategory\x12\x14.CategoryInfoRequest\x1a\x15.CategoryInfoResponse\x12@\n\x0e\x44\x65leteCategory\x12\x16.DeleteCategoryRequest\x1a\x16.google.protobuf.Empty\x12>\n\x0eUpdateCategory\x12\x14.CategoryInfoRequest\x1a\x16.google.protobuf.Empty\x12\x34\n\tBrandList\x12\x13.BrandFilterRequest\x1a\x12.BrandListResponse\x12-\n\x08GetBrand\x12\r.BrandRequest\x1a\x12.BrandInfoResponse\x12\x30\n\x0b\x43reateBrand\x12\r.BrandRequest\x1a\x12.BrandInfoResponse\x12\x34\n\x0b\x44\x65leteBrand\x12\r.BrandRequest\x1a\x16.google.protobuf.Empty\x12\x34\n\x0bUpdateBrand\x12\r.BrandRequest\x1a\x16.google.protobuf.Empty\x12\x39\n\nBannerList\x12\x16.google.protobuf.Empty\x1a\x13.BannerListResponse\x12/\n\x0c\x43reateBanner\x12\x0e.BannerRequest\x1a\x0f.BannerResponse\x12\x36\n\x0c\x44\x65leteBanner\x12\x0e.BannerRequest\x1a\x16.google.protobuf.Empty\x12\x36\n\x0cUpdateBanner\x12\x0e.BannerRequest\x1a\x16.google.protobuf.Empty\x12L\n\x11\x43\x61tegoryBrandList\x12\x1b.CategoryBrandFilterRequest\x1a\x1a.CategoryBrandListResponse\x12@\n\x14GetCategoryBrandList\x12\x14.CategoryInfoRequest\x1a\x12.BrandListResponse\x12\x44\n\x13\x43reateCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.CategoryBrandResponse\x12\x44\n\x13\x44\x65leteCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.google.protobuf.Empty\x12\x44\n\x13UpdateCategoryBrand\x12\x15.CategoryBrandRequest\x1a\x16.google.protobuf.Empty\x12\x30\n\x0bIndexAdList\x12\x0f.IndexAdRequest\x1a\x10.IndexAdResponse\x12=\n\x10HomePageSnapshot\x12\x16.google.protobuf.Empty\x1a\x11.HomePageResponseB\tZ\x07.;protob\x06proto3')
 
 
 
@@ -26,6 +27,8 @@ _QUERYCATEGORYREQUEST = DESCRIPTOR.message_types_by_name['QueryCategoryRequest']
 _CATEGORYINFORESPONSE = DESCRIPTOR.message_types_by_name['CategoryInfoResponse']
 _CATEGORYLISTRESPONSE = DESCRIPTOR.message_types_by_name['CategoryListResponse']
 _SUBCATEGORYLISTRESPONSE = DESCRIPTOR.message_types_by_name['SubCategoryListResponse']
+_CATEGORYSUBINFORESPONSE = DESCRIPTOR.message_types_by_name['CategorySubInfoResponse']
+_CATEGORYRESPONSE = DESCRIPTOR.message_types_by_name['CategoryResponse']
 _CATEGORYBRANDFILTERREQUEST = DESCRIPTOR.message_types_by_name['CategoryBrandFilterRequest']
 _CATEGORYBRANDREQUEST = DESCRIPTOR.message_types_by_name['CategoryBrandRequest']
 _CATEGORYBRANDRESPONSE = DESCRIPTOR.message_types_by_name['CategoryBrandResponse']
@@ -47,7 +50,13 @@ _GOODSREDUCEREQUEST = DESCRIPTOR.message_types_by_name['GoodsReduceRequest']
 _BATCHCATEGORYINFOREQUEST = DESCRIPTOR.message_types_by_name['BatchCategoryInfoRequest']
 _GOODSFILTERREQUEST = DESCRIPTOR.message_types_by_name['GoodsFilterRequest']
 _GOODSINFORESPONSE = DESCRIPTOR.message_types_by_name['GoodsInfoResponse']
+_GOODSEXPORTREQUEST = DESCRIPTOR.message_types_by_name['GoodsExportRequest']
+_BULKUPSERTGOODSRESPONSE = DESCRIPTOR.message_types_by_name['BulkUpsertGoodsResponse']
 _GOODSLISTRESPONSE = DESCRIPTOR.message_types_by_name['GoodsListResponse']
+_INDEXADREQUEST = DESCRIPTOR.message_types_by_name['IndexAdRequest']
+_INDEXADRESPONSE = DESCRIPTOR.message_types_by_name['IndexAdResponse']
+_HOMEPAGETAB = DESCRIPTOR.message_types_by_name['HomePageTab']
+_HOMEPAGERESPONSE = DESCRIPTOR.message_types_by_name['HomePageResponse']
 CategoryListRequest = _reflection.GeneratedProtocolMessageType('CategoryListRequest', (_message.Message,), {
   'DESCRIPTOR' : _CATEGORYLISTREQUEST,
   '__module__' : 'goods_pb2'
@@ -97,6 +106,20 @@ SubCategoryListResponse = _reflection.GeneratedProtocolMessageType('SubCategoryL
   })
 _sym_db.RegisterMessage(SubCategoryListResponse)
 
+CategorySubInfoResponse = _reflection.GeneratedProtocolMessageType('CategorySubInfoResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CATEGORYSUBINFORESPONSE,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:CategorySubInfoResponse)
+  })
+_sym_db.RegisterMessage(CategorySubInfoResponse)
+
+CategoryResponse = _reflection.GeneratedProtocolMessageType('CategoryResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CATEGORYRESPONSE,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:CategoryResponse)
+  })
+_sym_db.RegisterMessage(CategoryResponse)
+
 CategoryBrandFilterRequest = _reflection.GeneratedProtocolMessageType('CategoryBrandFilterRequest', (_message.Message,), {
   'DESCRIPTOR' : _CATEGORYBRANDFILTERREQUEST,
   '__module__' : 'goods_pb2'
@@ -244,6 +267,20 @@ GoodsInfoResponse = _reflection.GeneratedProtocolMessageType('GoodsInfoResponse'
   })
 _sym_db.RegisterMessage(GoodsInfoResponse)
 
+GoodsExportRequest = _reflection.GeneratedProtocolMessageType('GoodsExportRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GOODSEXPORTREQUEST,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:GoodsExportRequest)
+  })
+_sym_db.RegisterMessage(GoodsExportRequest)
+
+BulkUpsertGoodsResponse = _reflection.GeneratedProtocolMessageType('BulkUpsertGoodsResponse', (_message.Message,), {
+  'DESCRIPTOR' : _BULKUPSERTGOODSRESPONSE,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:BulkUpsertGoodsResponse)
+  })
+_sym_db.RegisterMessage(BulkUpsertGoodsResponse)
+
 GoodsListResponse = _reflection.GeneratedProtocolMessageType('GoodsListResponse', (_message.Message,), {
   'DESCRIPTOR' : _GOODSLISTRESPONSE,
   '__module__' : 'goods_pb2'
@@ -251,69 +288,113 @@ GoodsListResponse = _reflection.GeneratedProtocolMessageType('GoodsListResponse'
   })
 _sym_db.RegisterMessage(GoodsListResponse)
 
+IndexAdRequest = _reflection.GeneratedProtocolMessageType('IndexAdRequest', (_message.Message,), {
+  'DESCRIPTOR' : _INDEXADREQUEST,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:IndexAdRequest)
+  })
+_sym_db.RegisterMessage(IndexAdRequest)
+
+IndexAdResponse = _reflection.GeneratedProtocolMessageType('IndexAdResponse', (_message.Message,), {
+  'DESCRIPTOR' : _INDEXADRESPONSE,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:IndexAdResponse)
+  })
+_sym_db.RegisterMessage(IndexAdResponse)
+
+HomePageTab = _reflection.GeneratedProtocolMessageType('HomePageTab', (_message.Message,), {
+  'DESCRIPTOR' : _HOMEPAGETAB,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:HomePageTab)
+  })
+_sym_db.RegisterMessage(HomePageTab)
+
+HomePageResponse = _reflection.GeneratedProtocolMessageType('HomePageResponse', (_message.Message,), {
+  'DESCRIPTOR' : _HOMEPAGERESPONSE,
+  '__module__' : 'goods_pb2'
+  # @@protoc_insertion_point(class_scope:HomePageResponse)
+  })
+_sym_db.RegisterMessage(HomePageResponse)
+
 _GOODS = DESCRIPTOR.services_by_name['Goods']
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
   DESCRIPTOR._serialized_options = b'Z\007.;proto'
-  _CATEGORYLISTREQUEST._serialized_start=44
-  _CATEGORYLISTREQUEST._serialized_end=92
-  _CATEGORYINFOREQUEST._serialized_start=94
-  _CATEGORYINFOREQUEST._serialized_end=195
-  _DELETECATEGORYREQUEST._serialized_start=197
-  _DELETECATEGORYREQUEST._serialized_end=232
-  _QUERYCATEGORYREQUEST._serialized_start=234
-  _QUERYCATEGORYREQUEST._serialized_end=282
-  _CATEGORYINFORESPONSE._serialized_start=284
-  _CATEGORYINFORESPONSE._serialized_end=386
-  _CATEGORYLISTRESPONSE._serialized_start=388
-  _CATEGORYLISTRESPONSE._serialized_end=480
-  _SUBCATEGORYLISTRESPONSE._serialized_start=482
-  _SUBCATEGORYLISTRESPONSE._serialized_end=604
-  _CATEGORYBRANDFILTERREQUEST._serialized_start=606
-  _CATEGORYBRANDFILTERREQUEST._serialized_end=670
-  _CATEGORYBRANDREQUEST._serialized_start=672
-  _CATEGORYBRANDREQUEST._serialized_end=743
-  _CATEGORYBRANDRESPONSE._serialized_start=745
-  _CATEGORYBRANDRESPONSE._serialized_end=856
-  _BANNERREQUEST._serialized_start=858
-  _BANNERREQUEST._serialized_end=928
-  _BANNERRESPONSE._serialized_start=930
-  _BANNERRESPONSE._serialized_end=1001
-  _BRANDFILTERREQUEST._serialized_start=1003
-  _BRANDFILTERREQUEST._serialized_end=1059
-  _BRANDREQUEST._serialized_start=1061
-  _BRANDREQUEST._serialized_end=1115
-  _BRANDINFORESPONSE._serialized_start=1117
-  _BRANDINFORESPONSE._serialized_end=1176
-  _BRANDLISTRESPONSE._serialized_start=1178
-  _BRANDLISTRESPONSE._serialized_end=1246
-  _BANNERLISTRESPONSE._serialized_start=1248
-  _BANNERLISTRESPONSE._serialized_end=1314
-  _CATEGORYBRANDLISTRESPONSE._serialized_start=1316
-  _CATEGORYBRANDLISTRESPONSE._serialized_end=1396
-  _BATCHGOODSIDINFO._serialized_start=1398
-  _BATCHGOODSIDINFO._serialized_end=1428
-  _DELETEGOODSINFO._serialized_start=1430
-  _DELETEGOODSINFO._serialized_end=1459
-  _CATEGORYBRIEFINFORESPONSE._serialized_start=1461
-  _CATEGORYBRIEFINFORESPONSE._serialized_end=1514
-  _CATEGORYFILTERREQUEST._serialized_start=1516
-  _CATEGORYFILTERREQUEST._serialized_end=1566
-  _GOODINFOREQUEST._serialized_start=1568
-  _GOODINFOREQUEST._serialized_end=1597
-  _CREATEGOODSINFO._serialized_start=1600
-  _CREATEGOODSINFO._serialized_end=1917
-  _GOODSREDUCEREQUEST._serialized_start=1919
-  _GOODSREDUCEREQUEST._serialized_end=1970
-  _BATCHCATEGORYINFOREQUEST._serialized_start=1972
-  _BATCHCATEGORYINFOREQUEST._serialized_end=2048
-  _GOODSFILTERREQUEST._serialized_start=2051
-  _GOODSFILTERREQUEST._serialized_end=2242
-  _GOODSINFORESPONSE._serialized_start=2245
-  _GOODSINFORESPONSE._serialized_end=2696
-  _GOODSLISTRESPONSE._serialized_start=2698
-  _GOODSLISTRESPONSE._serialized_end=2766
-  _GOODS._serialized_start=2769
-  _GOODS._serialized_end=4224
+  _CATEGORYLISTREQUEST._serialized_start=78
+  _CATEGORYLISTREQUEST._serialized_end=126
+  _CATEGORYINFOREQUEST._serialized_start=128
+  _CATEGORYINFOREQUEST._serialized_end=229
+  _DELETECATEGORYREQUEST._serialized_start=231
+  _DELETECATEGORYREQUEST._serialized_end=266
+  _QUERYCATEGORYREQUEST._serialized_start=268
+  _QUERYCATEGORYREQUEST._serialized_end=316
+  _CATEGORYINFORESPONSE._serialized_start=318
+  _CATEGORYINFORESPONSE._serialized_end=420
+  _CATEGORYLISTRESPONSE._serialized_start=422
+  _CATEGORYLISTRESPONSE._serialized_end=514
+  _SUBCATEGORYLISTRESPONSE._serialized_start=516
+  _SUBCATEGORYLISTRESPONSE._serialized_end=638
+  _CATEGORYSUBINFORESPONSE._serialized_start=641
+  _CATEGORYSUBINFORESPONSE._serialized_end=788
+  _CATEGORYRESPONSE._serialized_start=790
+  _CATEGORYRESPONSE._serialized_end=863
+  _CATEGORYBRANDFILTERREQUEST._serialized_start=865
+  _CATEGORYBRANDFILTERREQUEST._serialized_end=961
+  _CATEGORYBRANDREQUEST._serialized_start=963
+  _CATEGORYBRANDREQUEST._serialized_end=1034
+  _CATEGORYBRANDRESPONSE._serialized_start=1036
+  _CATEGORYBRANDRESPONSE._serialized_end=1147
+  _BANNERREQUEST._serialized_start=1149
+  _BANNERREQUEST._serialized_end=1219
+  _BANNERRESPONSE._serialized_start=1221
+  _BANNERRESPONSE._serialized_end=1292
+  _BRANDFILTERREQUEST._serialized_start=1294
+  _BRANDFILTERREQUEST._serialized_end=1401
+  _BRANDREQUEST._serialized_start=1403
+  _BRANDREQUEST._serialized_end=1457
+  _BRANDINFORESPONSE._serialized_start=1459
+  _BRANDINFORESPONSE._serialized_end=1518
+  _BRANDLISTRESPONSE._serialized_start=1520
+  _BRANDLISTRESPONSE._serialized_end=1608
+  _BANNERLISTRESPONSE._serialized_start=1610
+  _BANNERLISTRESPONSE._serialized_end=1676
+  _CATEGORYBRANDLISTRESPONSE._serialized_start=1678
+  _CATEGORYBRANDLISTRESPONSE._serialized_end=1778
+  _BATCHGOODSIDINFO._serialized_start=1780
+  _BATCHGOODSIDINFO._serialized_end=1854
+  _DELETEGOODSINFO._serialized_start=1856
+  _DELETEGOODSINFO._serialized_end=1885
+  _CATEGORYBRIEFINFORESPONSE._serialized_start=1887
+  _CATEGORYBRIEFINFORESPONSE._serialized_end=1940
+  _CATEGORYFILTERREQUEST._serialized_start=1942
+  _CATEGORYFILTERREQUEST._serialized_end=1992
+  _GOODINFOREQUEST._serialized_start=1994
+  _GOODINFOREQUEST._serialized_end=2023
+  _CREATEGOODSINFO._serialized_start=2026
+  _CREATEGOODSINFO._serialized_end=2367
+  _GOODSREDUCEREQUEST._serialized_start=2369
+  _GOODSREDUCEREQUEST._serialized_end=2420
+  _BATCHCATEGORYINFOREQUEST._serialized_start=2422
+  _BATCHCATEGORYINFOREQUEST._serialized_end=2498
+  _GOODSFILTERREQUEST._serialized_start=2501
+  _GOODSFILTERREQUEST._serialized_end=2761
+  _GOODSINFORESPONSE._serialized_start=2764
+  _GOODSINFORESPONSE._serialized_end=3234
+  _GOODSEXPORTREQUEST._serialized_start=3236
+  _GOODSEXPORTREQUEST._serialized_end=3312
+  _BULKUPSERTGOODSRESPONSE._serialized_start=3314
+  _BULKUPSERTGOODSRESPONSE._serialized_end=3398
+  _GOODSLISTRESPONSE._serialized_start=3400
+  _GOODSLISTRESPONSE._serialized_end=3506
+  _INDEXADREQUEST._serialized_start=3508
+  _INDEXADREQUEST._serialized_end=3536
+  _INDEXADRESPONSE._serialized_start=3538
+  _INDEXADRESPONSE._serialized_end=3626
+  _HOMEPAGETAB._serialized_start=3628
+  _HOMEPAGETAB._serialized_end=3717
+  _HOMEPAGERESPONSE._serialized_start=3720
+  _HOMEPAGERESPONSE._serialized_end=3941
+  _GOODS._serialized_start=3944
+  _GOODS._serialized_end=5745
 # @@protoc_insertion_point(module_scope)
@@ -45,11 +45,26 @@ class GoodsStub(object):
                 request_serializer=goods__pb2.GoodInfoRequest.SerializeToString,
                 response_deserializer=goods__pb2.GoodsInfoResponse.FromString,
                 )
+        self.BulkUpsertGoods = channel.stream_stream(
+                '/Goods/BulkUpsertGoods',
+                request_serializer=goods__pb2.CreateGoodsInfo.SerializeToString,
+                response_deserializer=goods__pb2.BulkUpsertGoodsResponse.FromString,
+                )
+        self.GoodsExport = channel.unary_stream(
+                '/Goods/GoodsExport',
+                request_serializer=goods__pb2.GoodsExportRequest.SerializeToString,
+                response_deserializer=goods__pb2.GoodsInfoResponse.FromString,
+                )
         self.GetAllCategorysList = channel.unary_unary(
                 '/Goods/GetAllCategorysList',
                 request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
                 response_deserializer=goods__pb2.CategoryListResponse.FromString,
                 )
+        self.GetCategorysList = channel.unary_unary(
+                '/Goods/GetCategorysList',
+                request_serializer=goods__pb2.CategoryListRequest.SerializeToString,
+                response_deserializer=goods__pb2.CategoryResponse.FromString,
+                )
         self.GetSubCategory = channel.unary_unary(
                 '/Goods/GetSubCategory',
                 request_serializer=goods__pb2.CategoryListRequest.SerializeToString,
@@ -75,6 +90,11 @@ class GoodsStub(object):
                 request_serializer=goods__pb2.BrandFilterRequest.SerializeToString,
                 response_deserializer=goods__pb2.BrandListResponse.FromString,
                 )
+        self.GetBrand = channel.unary_unary(
+                '/Goods/GetBrand',
+                request_serializer=goods__pb2.BrandRequest.SerializeToString,
+                response_deserializer=goods__pb2.BrandInfoResponse.FromString,
+                )
         self.CreateBrand = channel.unary_unary(
                 '/Goods/CreateBrand',
                 request_serializer=goods__pb2.BrandRequest.SerializeToString,
@@ -135,6 +155,16 @@ class GoodsStub(object):
                 request_serializer=goods__pb2.CategoryBrandRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 )
+        self.IndexAdList = channel.unary_unary(
+                '/Goods/IndexAdList',
+                request_serializer=goods__pb2.IndexAdRequest.SerializeToString,
+                response_deserializer=goods__pb2.IndexAdResponse.FromString,
+                )
+        self.HomePageSnapshot = channel.unary_unary(
+                '/Goods/HomePageSnapshot',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=goods__pb2.HomePageResponse.FromString,
+                )
 
 
 class GoodsServicer(object):
@@ -183,6 +213,20 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BulkUpsertGoods(self, request_iterator, context):
+        """批量导入 商品, 有id的更新 没有id的新增
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GoodsExport(self, request, context):
+        """按id顺序导出全部(或者增量的)商品
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetAllCategorysList(self, request, context):
         """商品分类
         获取所有分类列表
@@ -191,6 +235,13 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetCategorysList(self, request, context):
+        """获取指定 分类列表
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetSubCategory(self, request, context):
         """获取子分类
         """
@@ -227,6 +278,13 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetBrand(self, request, context):
+        """获取品牌信息
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CreateBrand(self, request, context):
         """新建品牌信息
         """
@@ -313,6 +371,20 @@ class GoodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def IndexAdList(self, request, context):
+        """商品类别广告
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def HomePageSnapshot(self, request, context):
+        """首页: 轮播图 + 全部分类 + 每个首页分类的广告 + 热销/新品商品, 由后台预先构建好
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GoodsServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -346,11 +418,26 @@ def add_GoodsServicer_to_server(servicer, server):
                     request_deserializer=goods__pb2.GoodInfoRequest.FromString,
                     response_serializer=goods__pb2.GoodsInfoResponse.SerializeToString,
             ),
+            'BulkUpsertGoods': grpc.stream_stream_rpc_method_handler(
+                    servicer.BulkUpsertGoods,
+                    request_deserializer=goods__pb2.CreateGoodsInfo.FromString,
+                    response_serializer=goods__pb2.BulkUpsertGoodsResponse.SerializeToString,
+            ),
+            'GoodsExport': grpc.unary_stream_rpc_method_handler(
+                    servicer.GoodsExport,
+                    request_deserializer=goods__pb2.GoodsExportRequest.FromString,
+                    response_serializer=goods__pb2.GoodsInfoResponse.SerializeToString,
+            ),
             'GetAllCategorysList': grpc.unary_unary_rpc_method_handler(
                     servicer.GetAllCategorysList,
                     request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                     response_serializer=goods__pb2.CategoryListResponse.SerializeToString,
             ),
+            'GetCategorysList': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCategorysList,
+                    request_deserializer=goods__pb2.CategoryListRequest.FromString,
+                    response_serializer=goods__pb2.CategoryResponse.SerializeToString,
+            ),
             'GetSubCategory': grpc.unary_unary_rpc_method_handler(
                     servicer.GetSubCategory,
                     request_deserializer=goods__pb2.CategoryListRequest.FromString,
@@ -376,6 +463,11 @@ def add_GoodsServicer_to_server(servicer, server):
                     request_deserializer=goods__pb2.BrandFilterRequest.FromString,
                     response_serializer=goods__pb2.BrandListResponse.SerializeToString,
             ),
+            'GetBrand': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBrand,
+                    request_deserializer=goods__pb2.BrandRequest.FromString,
+                    response_serializer=goods__pb2.BrandInfoResponse.SerializeToString,
+            ),
             'CreateBrand': grpc.unary_unary_rpc_method_handler(
                     servicer.CreateBrand,
                     request_deserializer=goods__pb2.BrandRequest.FromString,
@@ -436,6 +528,16 @@ def add_GoodsServicer_to_server(servicer, server):
                     request_deserializer=goods__pb2.CategoryBrandRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'IndexAdList': grpc.unary_unary_rpc_method_handler(
+                    servicer.IndexAdList,
+                    request_deserializer=goods__pb2.IndexAdRequest.FromString,
+                    response_serializer=goods__pb2.IndexAdResponse.SerializeToString,
+            ),
+            'HomePageSnapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.HomePageSnapshot,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=goods__pb2.HomePageResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'Goods', rpc_method_handlers)
@@ -548,6 +650,40 @@ class Goods(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def BulkUpsertGoods(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/Goods/BulkUpsertGoods',
+            goods__pb2.CreateGoodsInfo.SerializeToString,
+            goods__pb2.BulkUpsertGoodsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GoodsExport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/Goods/GoodsExport',
+            goods__pb2.GoodsExportRequest.SerializeToString,
+            goods__pb2.GoodsInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetAllCategorysList(request,
             target,
@@ -565,6 +701,23 @@ class Goods(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetCategorysList(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/Goods/GetCategorysList',
+            goods__pb2.CategoryListRequest.SerializeToString,
+            goods__pb2.CategoryResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetSubCategory(request,
             target,
@@ -650,6 +803,23 @@ class Goods(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetBrand(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/Goods/GetBrand',
+            goods__pb2.BrandRequest.SerializeToString,
+            goods__pb2.BrandInfoResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def CreateBrand(request,
             target,
@@ -853,3 +1023,37 @@ class Goods(object):
             google_dot_protobuf_dot_empty__pb2.Empty.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def IndexAdList(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/Goods/IndexAdList',
+            goods__pb2.IndexAdRequest.SerializeToString,
+            goods__pb2.IndexAdResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def HomePageSnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/Goods/HomePageSnapshot',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            goods__pb2.HomePageResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -15,7 +15,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0border.proto\x12\x05proto\x1a\x1bgoogle/protobuf/empty.proto\"\x16\n\x08UserInfo\x12\n\n\x02id\x18\x01 \x01(\x05\"b\n\x14ShopCartInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07goodsId\x18\x03 \x01(\x05\x12\x0c\n\x04nums\x18\x04 \x01(\x05\x12\x0f\n\x07\x63hecked\x18\x05 \x01(\x08\"P\n\x14\x43\x61rtItemListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12)\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x1b.proto.ShopCartInfoResponse\"Q\n\x0f\x43\x61rtItemRequest\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x0f\n\x07goodsId\x18\x02 \x01(\x05\x12\x0c\n\x04nums\x18\x03 \x01(\x05\x12\x0f\n\x07\x63hecked\x18\x04 \x01(\x08\"g\n\x0cOrderRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x0e\n\x06mobile\x18\x04 \x01(\t\x12\x0c\n\x04name\x18\x05 \x01(\t\x12\x0c\n\x04post\x18\x06 \x01(\t\"\xbe\x01\n\x11OrderInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07orderSn\x18\x03 \x01(\t\x12\x0f\n\x07payType\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x0c\n\x04post\x18\x06 \x01(\t\x12\r\n\x05total\x18\x07 \x01(\x02\x12\x0f\n\x07\x61\x64\x64ress\x18\x08 \x01(\t\x12\x0c\n\x04name\x18\t \x01(\t\x12\x0e\n\x06mobile\x18\n \x01(\t\x12\x0f\n\x07\x61\x64\x64Time\x18\x0b \x01(\t\"J\n\x11OrderListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12&\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x18.proto.OrderInfoResponse\"H\n\x12OrderFilterRequest\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\r\n\x05pages\x18\x02 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x03 \x01(\x05\"\x8a\x01\n\x11OrderItemResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07orderId\x18\x02 \x01(\x05\x12\x0f\n\x07goodsId\x18\x03 \x01(\x05\x12\x11\n\tgoodsName\x18\x04 \x01(\t\x12\x12\n\ngoodsImage\x18\x05 \x01(\t\x12\x12\n\ngoodsPrice\x18\x06 \x01(\x02\x12\x0c\n\x04nums\x18\x07 \x01(\x05\"n\n\x17OrderInfoDetailResponse\x12+\n\torderInfo\x18\x01 \x01(\x0b\x32\x18.proto.OrderInfoResponse\x12&\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x18.proto.OrderItemResponse\"?\n\x0bOrderStatus\x12\x0f\n\x07OrderSn\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07payTime\x18\x03 \x01(\x03\x32\x94\x04\n\x05Order\x12;\n\x0b\x43\x61rItemList\x12\x0f.proto.UserInfo\x1a\x1b.proto.CartItemListResponse\x12\x45\n\x0e\x43reateCartItem\x12\x16.proto.CartItemRequest\x1a\x1b.proto.ShopCartInfoResponse\x12@\n\x0eUpdateCartItem\x12\x16.proto.CartItemRequest\x1a\x16.google.protobuf.Empty\x12@\n\x0e\x44\x65leteCartItem\x12\x16.proto.CartItemRequest\x1a\x16.google.protobuf.Empty\x12<\n\x0b\x43reateOrder\x12\x13.proto.OrderRequest\x1a\x18.proto.OrderInfoResponse\x12@\n\tOrderList\x12\x19.proto.OrderFilterRequest\x1a\x18.proto.OrderListResponse\x12\x42\n\x0bOrderDetail\x12\x13.proto.OrderRequest\x1a\x1e.proto.OrderInfoDetailResponse\x12?\n\x11UpdateOrderStatus\x12\x12.proto.OrderStatus\x1a\x16.google.protobuf.EmptyB\tZ\x07.;protob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0border.proto\x12\x05proto\x1a\x1bgoogle/protobuf/empty.proto\"\x16\n\x08UserInfo\x12\n\n\x02id\x18\x01 \x01(\x05\"b\n\x14ShopCartInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07goodsId\x18\x03 \x01(\x05\x12\x0c\n\x04nums\x18\x04 \x01(\x05\x12\x0f\n\x07\x63hecked\x18\x05 \x01(\x08\"P\n\x14\x43\x61rtItemListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12)\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x1b.proto.ShopCartInfoResponse\"Q\n\x0f\x43\x61rtItemRequest\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x0f\n\x07goodsId\x18\x02 \x01(\x05\x12\x0c\n\x04nums\x18\x03 \x01(\x05\x12\x0f\n\x07\x63hecked\x18\x04 \x01(\x08\"g\n\x0cOrderRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x0e\n\x06mobile\x18\x04 \x01(\t\x12\x0c\n\x04name\x18\x05 \x01(\t\x12\x0c\n\x04post\x18\x06 \x01(\t\"\xbe\x01\n\x11OrderInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x0f\n\x07orderSn\x18\x03 \x01(\t\x12\x0f\n\x07payType\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x0c\n\x04post\x18\x06 \x01(\t\x12\r\n\x05total\x18\x07 \x01(\x02\x12\x0f\n\x07\x61\x64\x64ress\x18\x08 \x01(\t\x12\x0c\n\x04name\x18\t \x01(\t\x12\x0e\n\x06mobile\x18\n \x01(\t\x12\x0f\n\x07\x61\x64\x64Time\x18\x0b \x01(\t\"^\n\x11OrderListResponse\x12\r\n\x05total\x18\x01 \x01(\x05\x12&\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x18.proto.OrderInfoResponse\x12\x12\n\nnextCursor\x18\x03 \x01(\t\"{\n\x12OrderFilterRequest\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\r\n\x05pages\x18\x02 \x01(\x05\x12\x13\n\x0bpagePerNums\x18\x03 \x01(\x05\x12\x13\n\x06\x63ursor\x18\x04 \x01(\tH\x00\x88\x01\x01\x12\x11\n\tskipTotal\x18\x05 \x01(\x08\x42\t\n\x07_cursor\"\x8a\x01\n\x11OrderItemResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07orderId\x18\x02 \x01(\x05\x12\x0f\n\x07goodsId\x18\x03 \x01(\x05\x12\x11\n\tgoodsName\x18\x04 \x01(\t\x12\x12\n\ngoodsImage\x18\x05 \x01(\t\x12\x12\n\ngoodsPrice\x18\x06 \x01(\x02\x12\x0c\n\x04nums\x18\x07 \x01(\x05\"n\n\x17OrderInfoDetailResponse\x12+\n\torderInfo\x18\x01 \x01(\x0b\x32\x18.proto.OrderInfoResponse\x12&\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x18.proto.OrderItemResponse\"?\n\x0bOrderStatus\x12\x0f\n\x07OrderSn\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07payTime\x18\x03 \x01(\x03\x32\x94\x04\n\x05Order\x12;\n\x0b\x43\x61rItemList\x12\x0f.proto.UserInfo\x1a\x1b.proto.CartItemListResponse\x12\x45\n\x0e\x43reateCartItem\x12\x16.proto.CartItemRequest\x1a\x1b.proto.ShopCartInfoResponse\x12@\n\x0eUpdateCartItem\x12\x16.proto.CartItemRequest\x1a\x16.google.protobuf.Empty\x12@\n\x0e\x44\x65leteCartItem\x12\x16.proto.CartItemRequest\x1a\x16.google.protobuf.Empty\x12<\n\x0b\x43reateOrder\x12\x13.proto.OrderRequest\x1a\x18.proto.OrderInfoResponse\x12@\n\tOrderList\x12\x19.proto.OrderFilterRequest\x1a\x18.proto.OrderListResponse\x12\x42\n\x0bOrderDetail\x12\x13.proto.OrderRequest\x1a\x1e.proto.OrderInfoDetailResponse\x12?\n\x11UpdateOrderStatus\x12\x12.proto.OrderStatus\x1a\x16.google.protobuf.EmptyB\tZ\x07.;protob\x06proto3')
 
 
 
@@ -125,15 +125,15 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _ORDERINFORESPONSE._serialized_start=446
   _ORDERINFORESPONSE._serialized_end=636
   _ORDERLISTRESPONSE._serialized_start=638
-  _ORDERLISTRESPONSE._serialized_end=712
-  _ORDERFILTERREQUEST._serialized_start=714
-  _ORDERFILTERREQUEST._serialized_end=786
-  _ORDERITEMRESPONSE._serialized_start=789
-  _ORDERITEMRESPONSE._serialized_end=927
-  _ORDERINFODETAILRESPONSE._serialized_start=929
-  _ORDERINFODETAILRESPONSE._serialized_end=1039
-  _ORDERSTATUS._serialized_start=1041
-  _ORDERSTATUS._serialized_end=1104
-  _ORDER._serialized_start=1107
-  _ORDER._serialized_end=1639
+  _ORDERLISTRESPONSE._serialized_end=732
+  _ORDERFILTERREQUEST._serialized_start=734
+  _ORDERFILTERREQUEST._serialized_end=857
+  _ORDERITEMRESPONSE._serialized_start=860
+  _ORDERITEMRESPONSE._serialized_end=998
+  _ORDERINFODETAILRESPONSE._serialized_start=1000
+  _ORDERINFODETAILRESPONSE._serialized_end=1110
+  _ORDERSTATUS._serialized_start=1112
+  _ORDERSTATUS._serialized_end=1175
+  _ORDER._serialized_start=1178
+  _ORDER._serialized_end=1710
 # @@protoc_insertion_point(module_scope)
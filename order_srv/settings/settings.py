@@ -6,6 +6,8 @@ from playhouse.pool import PooledMySQLDatabase
 from playhouse.shortcuts import ReconnectMixin
 from loguru import logger
 
+from common.db.count import CountCache
+
 
 # 使用peewee的连接池, 使用ReconnectMixin来防止出现连接断开查询失败
 class ReconnectMysqlDatabase(PooledMySQLDatabase, ReconnectMixin):
@@ -51,6 +53,29 @@ SERVICE_TAGS = data["tags"]
 GOODS_SRV_NAME = data["goods_srv"]["name"]
 INVENTORY_SRV_NAME = data["inventory_srv"]["name"]
 
+# 列表接口总数的缓存, 配置项见 CountCache.from_config
+COUNT_CACHE = CountCache.from_config(data)
+
+# 到商品服务和库存服务的连接: 多久(秒)从consul刷新一次实例列表, 负载均衡方式 round_robin / least_loaded
+CHANNELS = data.get("channels", {})
+CHANNEL_REFRESH_INTERVAL = CHANNELS.get("refresh_interval", 10)
+CHANNEL_BALANCE = CHANNELS.get("balance", "round_robin")
+
+# 新建订单时最多等待多久(秒)本地事务的结果, 超时返回 DEADLINE_EXCEEDED (客户端的deadline更短时以客户端为准)
+ORDER_CREATE_TIMEOUT = data.get("order", {}).get("create_timeout", 10)
+
+# redis的配置(可选), 购物车使用 redis 存储时需要
+REDIS_CLIENT = None
+if data.get("redis"):
+    pool = redis.ConnectionPool(host=data["redis"]["host"], port=data["redis"]["port"], db=data["redis"].get("db", 0))
+    REDIS_CLIENT = redis.StrictRedis(connection_pool=pool)
+
+# 购物车的存储: mysql 直接读写数据库 / redis 读写 redis hash, 后台每隔 flush_interval 秒(或者修改过的商品超过 buffer_size 个时)批量写入mysql
+CART = data.get("cart", {})
+CART_BACKEND = CART.get("backend", "mysql")
+CART_FLUSH_INTERVAL = CART.get("flush_interval", 5)
+CART_BUFFER_SIZE = CART.get("buffer_size", 10000)
+
 DB = ReconnectMysqlDatabase(data["mysql"]["db"],
                             host=data["mysql"]["host"],
                             port=data["mysql"]["port"],
@@ -9,6 +9,11 @@ from google.protobuf import empty_pb2
 
 from user_srv.model.models import User
 from user_srv.proto import user_pb2, user_pb2_grpc
+from user_srv.settings import settings
+from common.db.keyset import keyset_paginate, InvalidCursor
+
+
+count_cache = settings.COUNT_CACHE
 
 
 class UserServicer(user_pb2_grpc.UserServicer):
@@ -36,7 +41,8 @@ class UserServicer(user_pb2_grpc.UserServicer):
         # 获取用户的列表
         rsp = user_pb2.UserListResonse()
         users = User.select()
-        rsp.total = users.count()
+        if not request.skipTotal:
+            rsp.total = count_cache.count(users)
         # print("用户列表")
         start = 0
         per_page_nums = 10
@@ -45,7 +51,17 @@ class UserServicer(user_pb2_grpc.UserServicer):
         if request.pn:
             start = per_page_nums * (request.pn - 1)
 
-        users = users.limit(per_page_nums).offset(start)    # limit 显示指定数量的数据  offset 偏移量
+        if request.HasField("cursor"):
+            # 游标分页  按 id 定位到下一页, 不受页数深度影响
+            try:
+                users, next_cursor = keyset_paginate(users, User.id, request.cursor, per_page_nums)
+            except InvalidCursor as e:
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                context.set_details(str(e))
+                return user_pb2.UserListResonse()
+            rsp.nextCursor = next_cursor
+        else:
+            users = users.limit(per_page_nums).offset(start)    # limit 显示指定数量的数据  offset 偏移量
 
         for user in users:
             rsp.data.append(self.convert_user_to_rsp(user))
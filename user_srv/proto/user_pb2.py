@@ -15,7 +15,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nuser.proto\x1a\x1bgoogle/protobuf/empty.proto\"%\n\x08PageInfo\x12\n\n\x02pn\x18\x01 \x01(\r\x12\r\n\x05pSize\x18\x02 \x01(\r\"\x1f\n\rMobileRequest\x12\x0e\n\x06mobile\x18\x01 \x01(\t\"\x17\n\tIdRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"D\n\x0e\x43reateUserInfo\x12\x10\n\x08nickName\x18\x01 \x01(\t\x12\x10\n\x08passWord\x18\x02 \x01(\t\x12\x0e\n\x06mobile\x18\x03 \x01(\t\"P\n\x0eUpdateUserInfo\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x10\n\x08nickName\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x10\n\x08\x62irthDay\x18\x04 \x01(\x04\"@\n\x11PasswordCheckInfo\x12\x10\n\x08password\x18\x01 \x01(\t\x12\x19\n\x11\x65ncryptedPassword\x18\x02 \x01(\t\"!\n\x0e\x43henckResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x82\x01\n\x10UserInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06mobile\x18\x02 \x01(\t\x12\x10\n\x08passWord\x18\x03 \x01(\t\x12\x10\n\x08nickName\x18\x04 \x01(\t\x12\x10\n\x08\x62irthDay\x18\x05 \x01(\x04\x12\x0e\n\x06gender\x18\x06 \x01(\t\x12\x0c\n\x04role\x18\x07 \x01(\x05\"A\n\x0fUserListResonse\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x1f\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x11.UserInfoResponse2\xb5\x02\n\x04User\x12*\n\x0bGetUserList\x12\t.PageInfo\x1a\x10.UserListResonse\x12\x34\n\x0fGetUserByMobile\x12\x0e.MobileRequest\x1a\x11.UserInfoResponse\x12,\n\x0bGetUserById\x12\n.IdRequest\x1a\x11.UserInfoResponse\x12\x30\n\nCreateUser\x12\x0f.CreateUserInfo\x1a\x11.UserInfoResponse\x12\x35\n\nUpdateUser\x12\x0f.UpdateUserInfo\x1a\x16.google.protobuf.Empty\x12\x34\n\rCheckPassWord\x12\x12.PasswordCheckInfo\x1a\x0f.ChenckResponseB\tZ\x07.;protob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nuser.proto\x1a\x1bgoogle/protobuf/empty.proto\"X\n\x08PageInfo\x12\n\n\x02pn\x18\x01 \x01(\r\x12\r\n\x05pSize\x18\x02 \x01(\r\x12\x13\n\x06\x63ursor\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x11\n\tskipTotal\x18\x04 \x01(\x08\x42\t\n\x07_cursor\"\x1f\n\rMobileRequest\x12\x0e\n\x06mobile\x18\x01 \x01(\t\"\x17\n\tIdRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"D\n\x0e\x43reateUserInfo\x12\x10\n\x08nickName\x18\x01 \x01(\t\x12\x10\n\x08passWord\x18\x02 \x01(\t\x12\x0e\n\x06mobile\x18\x03 \x01(\t\"P\n\x0eUpdateUserInfo\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x10\n\x08nickName\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x10\n\x08\x62irthDay\x18\x04 \x01(\x04\"@\n\x11PasswordCheckInfo\x12\x10\n\x08password\x18\x01 \x01(\t\x12\x19\n\x11\x65ncryptedPassword\x18\x02 \x01(\t\"!\n\x0e\x43henckResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x82\x01\n\x10UserInfoResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06mobile\x18\x02 \x01(\t\x12\x10\n\x08passWord\x18\x03 \x01(\t\x12\x10\n\x08nickName\x18\x04 \x01(\t\x12\x10\n\x08\x62irthDay\x18\x05 \x01(\x04\x12\x0e\n\x06gender\x18\x06 \x01(\t\x12\x0c\n\x04role\x18\x07 \x01(\x05\"U\n\x0fUserListResonse\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x1f\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x11.UserInfoResponse\x12\x12\n\nnextCursor\x18\x03 \x01(\t2\xb5\x02\n\x04User\x12*\n\x0bGetUserList\x12\t.PageInfo\x1a\x10.UserListResonse\x12\x34\n\x0fGetUserByMobile\x12\x0e.MobileRequest\x1a\x11.UserInfoResponse\x12,\n\x0bGetUserById\x12\n.IdRequest\x1a\x11.UserInfoResponse\x12\x30\n\nCreateUser\x12\x0f.CreateUserInfo\x1a\x11.UserInfoResponse\x12\x35\n\nUpdateUser\x12\x0f.UpdateUserInfo\x1a\x16.google.protobuf.Empty\x12\x34\n\rCheckPassWord\x12\x12.PasswordCheckInfo\x1a\x0f.ChenckResponseB\tZ\x07.;protob\x06proto3')
 
 
 
@@ -97,23 +97,23 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
   DESCRIPTOR._serialized_options = b'Z\007.;proto'
   _PAGEINFO._serialized_start=43
-  _PAGEINFO._serialized_end=80
-  _MOBILEREQUEST._serialized_start=82
-  _MOBILEREQUEST._serialized_end=113
-  _IDREQUEST._serialized_start=115
-  _IDREQUEST._serialized_end=138
-  _CREATEUSERINFO._serialized_start=140
-  _CREATEUSERINFO._serialized_end=208
-  _UPDATEUSERINFO._serialized_start=210
-  _UPDATEUSERINFO._serialized_end=290
-  _PASSWORDCHECKINFO._serialized_start=292
-  _PASSWORDCHECKINFO._serialized_end=356
-  _CHENCKRESPONSE._serialized_start=358
-  _CHENCKRESPONSE._serialized_end=391
-  _USERINFORESPONSE._serialized_start=394
-  _USERINFORESPONSE._serialized_end=524
-  _USERLISTRESONSE._serialized_start=526
-  _USERLISTRESONSE._serialized_end=591
-  _USER._serialized_start=594
-  _USER._serialized_end=903
+  _PAGEINFO._serialized_end=131
+  _MOBILEREQUEST._serialized_start=133
+  _MOBILEREQUEST._serialized_end=164
+  _IDREQUEST._serialized_start=166
+  _IDREQUEST._serialized_end=189
+  _CREATEUSERINFO._serialized_start=191
+  _CREATEUSERINFO._serialized_end=259
+  _UPDATEUSERINFO._serialized_start=261
+  _UPDATEUSERINFO._serialized_end=341
+  _PASSWORDCHECKINFO._serialized_start=343
+  _PASSWORDCHECKINFO._serialized_end=407
+  _CHENCKRESPONSE._serialized_start=409
+  _CHENCKRESPONSE._serialized_end=442
+  _USERINFORESPONSE._serialized_start=445
+  _USERINFORESPONSE._serialized_end=575
+  _USERLISTRESONSE._serialized_start=577
+  _USERLISTRESONSE._serialized_end=662
+  _USER._serialized_start=665
+  _USER._serialized_end=974
 # @@protoc_insertion_point(module_scope)
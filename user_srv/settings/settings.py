@@ -5,6 +5,8 @@ from playhouse.pool import PooledMySQLDatabase
 from playhouse.shortcuts import ReconnectMixin
 from loguru import logger
 
+from common.db.count import CountCache
+
 
 # 使用peewee的连接池, 使用ReconnectMixin来防止出现连接断开查询失败
 class ReconnectMysqlDatabase(PooledMySQLDatabase, ReconnectMixin):
@@ -42,6 +44,9 @@ CONSUL_PORT = data["consul"]["port"]
 SERVICE_NAME = data["name"]
 SERVICE_TAGS = data["tags"]
 
+# 列表接口总数的缓存, 配置项见 CountCache.from_config
+COUNT_CACHE = CountCache.from_config(data)
+
 DB = ReconnectMysqlDatabase(data["mysql"]["db"],
                             host=data["mysql"]["host"],
                             port=data["mysql"]["port"],
@@ -13,7 +13,8 @@ class MessageServicer(message_pb2_grpc.MessageServicer):
         if request.userId:                          # 前端有传递 userId
             messages = messages.filter(LeavingMessages.user==request.userId)    # 返回普通用户的留言数据
 
-        rsp.total = messages.count()                    # 留言数
+        messages = list(messages)                       # 不分页, 总数就是查询到的条数, 不需要再count一次
+        rsp.total = len(messages)                       # 留言数
         for message in messages:                        # 遍历 用户留言表
             brand_rsp = message_pb2.MessageResponse()   # 创建 grpc结构体
             # 进行一系列赋值操作
@@ -1,4 +1,5 @@
 import datetime
+import json
 
 import grpc
 from loguru import logger
@@ -10,6 +11,30 @@ from userop_srv.model.models import UserFav
 
 
 class UserFavServicer(userfav_pb2_grpc.UserFavServicer):
+    def __init__(self, producer=None):
+        # producer 由服务启动时创建, 为空时不发送收藏消息
+        self.producer = producer
+
+    def send_fav_event(self, goods_id, delta):
+        """
+        通知商品服务累加收藏数, 收藏数只是统计数据, 发送失败只记录日志
+        """
+        if self.producer is None:
+            return
+        # producer 只在配置了 rocketmq 时才会创建, 所以在这里才导入
+        from rocketmq.client import Message, SendStatus
+
+        msg = Message("goods_fav")
+        msg.set_keys(str(goods_id))
+        msg.set_tags("fav")
+        msg.set_body(json.dumps({"goodsId": goods_id, "delta": delta}))
+        try:
+            ret = self.producer.send_sync(msg)
+            if ret.status != SendStatus.OK:
+                logger.warning(f"发送收藏消息失败: {goods_id}")
+        except Exception as e:
+            logger.warning(f"发送收藏消息失败: {goods_id}, {e}")
+
     @logger.catch
     def GetFavList(self, request: userfav_pb2.UserFavRequest, context):
         rsp = userfav_pb2.UserFavListResponse()
@@ -19,7 +44,8 @@ class UserFavServicer(userfav_pb2_grpc.UserFavServicer):
         if request.goodsId:
             user_favs = user_favs.where(UserFav.goods==request.goodsId)
 
-        rsp.total = user_favs.count()
+        user_favs = list(user_favs)    # 不分页, 总数就是查询到的条数, 不需要再count一次
+        rsp.total = len(user_favs)
         for user_fav in user_favs:
             user_fav_rsp = userfav_pb2.UserFavResponse()
             user_fav_rsp.userId = user_fav.user
@@ -36,6 +62,7 @@ class UserFavServicer(userfav_pb2_grpc.UserFavServicer):
         user_fav.user = request.userId
         user_fav.goods = request.goodsId
         user_fav.save(force_insert=True)
+        self.send_fav_event(request.goodsId, 1)
 
         return empty_pb2.Empty()
 
@@ -45,6 +72,7 @@ class UserFavServicer(userfav_pb2_grpc.UserFavServicer):
             user_fav = UserFav.get(UserFav.user == request.userId, UserFav.goods == request.goodsId)
             # 物理删除
             user_fav.delete_instance(permanently=True)
+            self.send_fav_event(request.goodsId, -1)
             return empty_pb2.Empty()
         except DoesNotExist:
             context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -42,6 +42,10 @@ CONSUL_PORT = data["consul"]["port"]
 SERVICE_NAME = data["name"]
 SERVICE_TAGS = data["tags"]
 
+# rocketmq的配置(可选), 配置了才会发送收藏/取消收藏的消息给商品服务统计收藏数
+ROCKETMQ_HOST = data.get("rocketmq", {}).get("host")
+ROCKETMQ_PORT = data.get("rocketmq", {}).get("port")
+
 DB = ReconnectMysqlDatabase(data["mysql"]["db"],
                             host=data["mysql"]["host"],
                             port=data["mysql"]["port"],
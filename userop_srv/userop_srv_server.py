@@ -25,11 +25,13 @@ from common.register import consul
 from userop_srv.settings import settings
 
 
-def on_exit(signo, frame, service_id):
+def on_exit(signo, frame, service_id, producer=None):
     register = consul.ConsulRegister(settings.CONSUL_HOST, settings.CONSUL_PORT)
     logger.info(f"注销 {service_id} 用户操作服务")
     register.deregister(service_id)
     logger.info(f"注销成功")
+    if producer is not None:
+        producer.shutdown()
     sys.exit(0)
 
 
@@ -72,8 +74,15 @@ def server():
     message_pb2_grpc.add_MessageServicer_to_server(MessageServicer(), server)
     # 2.1. 注册用户地址服务
     address_pb2_grpc.add_AddressServicer_to_server(AddressServicer(), server)
-    # 2.1. 注册用户收藏服务
-    userfav_pb2_grpc.add_UserFavServicer_to_server(UserFavServicer(), server)
+    # 2.1. 注册用户收藏服务  收藏/取消收藏时通过rocketmq通知商品服务统计收藏数
+    producer = None
+    if settings.ROCKETMQ_HOST:
+        from rocketmq.client import Producer     # 没有配置 rocketmq 时不需要安装它的客户端
+
+        producer = Producer("userop_fav_sender")
+        producer.set_name_server_address(f"{settings.ROCKETMQ_HOST}:{settings.ROCKETMQ_PORT}")
+        producer.start()
+    userfav_pb2_grpc.add_UserFavServicer_to_server(UserFavServicer(producer), server)
     # 2.4 注册健康检查  别人封装的  给 consul 调用的  检查你是否健康
     health_pb2_grpc.add_HealthServicer_to_server(health.HealthServicer(), server)
     # 3. 启动server
@@ -87,8 +96,8 @@ def server():
             SIGINT  ctrl+C 中断命令
             SIGTERM kill 发出的软件终止
     """
-    signal.signal(signal.SIGINT, partial(on_exit, service_id=service_id))
-    signal.signal(signal.SIGTERM, partial(on_exit, service_id=service_id))
+    signal.signal(signal.SIGINT, partial(on_exit, service_id=service_id, producer=producer))
+    signal.signal(signal.SIGTERM, partial(on_exit, service_id=service_id, producer=producer))
 
     logger.info(f"启动用户操作服务: {args.ip}:{port}")
     server.start()